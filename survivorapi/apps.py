@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class SurvivorapiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'survivorapi'
+
+    def ready(self):
+        # Wrap database connections for request metrics from the first one opened
+        from survivorapi import middleware  # noqa: F401
+        # Catalog writes from management commands and the shell bump the catalog generation too
+        from survivorapi.views import catalog_cache  # noqa: F401
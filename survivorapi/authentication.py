@@ -0,0 +1,169 @@
+"""Token authentication backed by an in-process cache"""
+import copy
+import threading
+import time
+from collections import OrderedDict
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+DEFAULT_TOKEN_CACHE_SETTINGS = {
+    # Most tokens kept in the in-process cache
+    'MAX_SIZE': 1024,
+    # Seconds a cached token is trusted before it is read from the database again
+    'TTL': 300,
+    # Also share tokens between processes through Django's cache framework
+    'USE_DJANGO_CACHE': False,
+}
+
+def token_cache_settings() -> dict:
+    """Merge the TOKEN_AUTH_CACHE setting over the defaults"""
+    return {**DEFAULT_TOKEN_CACHE_SETTINGS, **getattr(settings, 'TOKEN_AUTH_CACHE', {})}
+
+def django_cache_key(key) -> str:
+    return f"auth-token:{key}"
+
+class TokenCache:
+    """Thread safe LRU of tokens, with their users, that expire after a TTL"""
+
+    def __init__(self, max_size, ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """
+        Get a cached token, counting the lookup as a hit or a miss
+
+        Returns: Token -- the cached token, or None when missing or expired
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+
+            if entry is None or entry[1] < time.monotonic():
+                if entry is not None:
+                    del self.entries[key]
+                self.misses += 1
+                return None
+
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key, token):
+        with self.lock:
+            self.entries[key] = (token, time.monotonic() + self.ttl)
+            self.entries.move_to_end(key)
+
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def evict(self, key):
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def evict_user(self, user_id):
+        """Drop every cached token belonging to a user"""
+        with self.lock:
+            for key in [key for key, (token, _) in self.entries.items() if token.user_id == user_id]:
+                del self.entries[key]
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def reset_stats(self):
+        """Restart the hit and miss counters, keeping the cached tokens"""
+        with self.lock:
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        """
+        Counters for monitoring the cache
+
+        Returns: dict -- hits, misses, hit rate and current size
+        """
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'size': len(self.entries),
+                'max_size': self.max_size,
+            }
+
+token_cache = TokenCache(
+    max_size=token_cache_settings()['MAX_SIZE'],
+    ttl=token_cache_settings()['TTL']
+)
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    TokenAuthentication that skips the token and user query for recently seen tokens
+
+    Tokens are cached in process for TOKEN_AUTH_CACHE['TTL'] seconds and, when
+    USE_DJANGO_CACHE is set, in Django's cache as well. Saving or deleting a
+    token or user evicts it from both.
+    """
+
+    def authenticate_credentials(self, key):
+        token = token_cache.get(key)
+        use_django_cache = token_cache_settings()['USE_DJANGO_CACHE']
+
+        if token is None and use_django_cache:
+            token = cache.get(django_cache_key(key))
+            if token is not None:
+                token_cache.set(key, token)
+
+        if token is None:
+            model = self.get_model()
+            try:
+                token = model.objects.select_related('user').get(key=key)
+            except model.DoesNotExist:
+                raise exceptions.AuthenticationFailed(_('Invalid token.'))
+
+            token_cache.set(key, token)
+            if use_django_cache:
+                cache.set(django_cache_key(key), token, token_cache.ttl)
+
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+
+        # Hand each request its own copies so the cached instances are never mutated
+        token = copy.copy(token)
+        token.user = copy.copy(token.user)
+        return (token.user, token)
+
+def evict_token_keys(keys):
+    """Remove tokens from the in-process cache and Django's cache"""
+    for key in keys:
+        token_cache.evict(key)
+
+    if keys and token_cache_settings()['USE_DJANGO_CACHE']:
+        cache.delete_many([django_cache_key(key) for key in keys])
+
+@receiver(post_save, sender=Token)
+@receiver(post_delete, sender=Token)
+def evict_token(sender, instance, **kwargs):
+    evict_token_keys([instance.key])
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def evict_user_tokens(sender, instance, **kwargs):
+    token_cache.evict_user(instance.pk)
+
+    if token_cache_settings()['USE_DJANGO_CACHE']:
+        evict_token_keys(list(Token.objects.filter(user_id=instance.pk).values_list('key', flat=True)))
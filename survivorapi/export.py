@@ -0,0 +1,123 @@
+"""Streaming NDJSON export of everything a user has logged"""
+import json
+from asgiref.sync import sync_to_async
+from django.core.serializers.json import DjangoJSONEncoder
+from survivorapi.models import (
+    SeasonLog,
+    SurvivorLog,
+    SurvivorNote,
+    FavoriteSurvivor,
+    EpisodeLog,
+    FoundAdvantage,
+    FoundIdol,
+    PlayedIdol,
+    WonImmunity,
+    WonReward
+)
+
+def keyset_rows(queryset, chunk_size):
+    """
+    Yield `.values()` rows ordered by id, one keyset page at a time
+
+    Each page seeks past the last id seen instead of using OFFSET, and only
+    one page of rows is held in memory at once.
+
+    Args:
+        queryset (QuerySet) -- values() queryset including `id`
+        chunk_size (int) -- rows fetched per page
+
+    Yields: dict -- one row per record
+    """
+    last_id = 0
+
+    while True:
+        page = queryset.filter(id__gt=last_id).order_by('id')[:chunk_size]
+        fetched = 0
+
+        for row in page.iterator(chunk_size=chunk_size):
+            last_id = row['id']
+            fetched += 1
+            yield row
+
+        if fetched < chunk_size:
+            return
+
+def export_records(user):
+    """
+    Querysets for every record type a user owns, in export order
+
+    Args: user (User) -- the user whose history is exported
+
+    Returns: list -- (record type, values() queryset) tuples
+    """
+    action_fields = ['id', 'episode_log_id', 'survivor_log_id']
+
+    return [
+        ('season_log', SeasonLog.objects.filter(user=user).values(
+            'id', 'season_id', 'status', 'league', 'created_on', 'completed_on', 'modified_on'
+        )),
+        ('survivor_log', SurvivorLog.objects.filter(user=user).values(
+            'id', 'season_log_id', 'survivor_id', 'is_active', 'is_juror',
+            'episode_voted_out', 'is_user_winner_pick', 'is_season_winner'
+        )),
+        ('survivor_note', SurvivorNote.objects.filter(survivor_log__user=user).values(
+            'id', 'survivor_log_id', 'text'
+        )),
+        ('favorite_survivor', FavoriteSurvivor.objects.filter(survivor_log__user=user).values(
+            'id', 'survivor_log_id'
+        )),
+        ('episode_log', EpisodeLog.objects.filter(user=user).values(
+            'id', 'season_log_id', 'episode_id', 'episode__episode_number', 'created_at'
+        )),
+        ('found_advantage', FoundAdvantage.objects.filter(episode_log__user=user).values(*action_fields)),
+        ('found_idol', FoundIdol.objects.filter(episode_log__user=user).values(*action_fields)),
+        ('played_idol', PlayedIdol.objects.filter(episode_log__user=user).values(*action_fields)),
+        ('won_immunity', WonImmunity.objects.filter(episode_log__user=user).values(
+            *action_fields, 'is_individual'
+        )),
+        ('won_reward', WonReward.objects.filter(episode_log__user=user).values(*action_fields)),
+    ]
+
+def export_user_history(user, chunk_size=1000):
+    """
+    Stream a user's full fantasy history as newline delimited JSON
+
+    Args:
+        user (User) -- the user whose history is exported
+        chunk_size (int) -- rows fetched from the database per page
+
+    Yields: str -- one JSON object per line, tagged with its record `type`
+    """
+    for record_type, queryset in export_records(user):
+        for row in keyset_rows(queryset, chunk_size):
+            yield json.dumps({'type': record_type, **row}, cls=DjangoJSONEncoder) + "\n"
+
+async def aexport_user_history(user, chunk_size=1000):
+    """
+    Stream a user's full fantasy history as newline delimited JSON, for ASGI servers
+
+    Django reads a sync iterator whole in a worker thread before an ASGI
+    response sends it, so each keyset page is fetched with sync_to_async
+    instead and sent as soon as it arrives.
+
+    Args:
+        user (User) -- the user whose history is exported
+        chunk_size (int) -- rows fetched from the database per page
+
+    Yields: str -- one page of JSON lines, each tagged with its record `type`
+    """
+    for record_type, queryset in export_records(user):
+        last_id = 0
+
+        while True:
+            page = await sync_to_async(list)(queryset.filter(id__gt=last_id).order_by('id')[:chunk_size])
+            if not page:
+                break
+
+            last_id = page[-1]['id']
+            yield "".join(
+                json.dumps({'type': record_type, **row}, cls=DjangoJSONEncoder) + "\n" for row in page
+            )
+
+            if len(page) < chunk_size:
+                break
@@ -0,0 +1,298 @@
+"""
+Queued episode log ingestion
+
+With EPISODE_LOG_INGESTION['QUEUED'] on, the episode_logs POST only validates
+the payload and stores it as an EpisodeLogSubmission. Workers started with
+`manage.py process_episode_log_queue` then claim pending submissions and write
+them in large batches, one transaction per batch, so the air night burst of
+EpisodeLog and action inserts is spread over a few long transactions instead of
+one short transaction per request. The queue is an ordinary table, so nothing
+but the database is needed.
+"""
+import logging
+import os
+import socket
+import time
+from datetime import timedelta
+from django.conf import settings
+from django.db import DatabaseError, IntegrityError, connection, transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+from survivorapi.models import Episode, EpisodeLog, EpisodeLogSubmission, SeasonLog, SurvivorLog
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EPISODE_LOG_INGESTION_SETTINGS = {
+    # Queue episode_logs POSTs and answer 202 instead of writing them in the request
+    'QUEUED': False,
+    # Most submissions a worker claims and writes in one transaction
+    'BATCH_SIZE': 500,
+    # Seconds an idle worker waits before looking for new submissions
+    'POLL_INTERVAL': 1.0,
+    # Seconds after which a claimed submission is handed to another worker, for crashed workers
+    'CLAIM_TIMEOUT': 300,
+    # Seconds clients are told to wait before polling a submission's status
+    'RETRY_AFTER': 2,
+}
+
+def episode_log_ingestion_settings() -> dict:
+    """Merge the EPISODE_LOG_INGESTION setting over the defaults"""
+    return {**DEFAULT_EPISODE_LOG_INGESTION_SETTINGS, **getattr(settings, 'EPISODE_LOG_INGESTION', {})}
+
+def worker_name():
+    return f"{socket.gethostname()}:{os.getpid()}"[:100]
+
+def claim_submissions(worker, batch_size):
+    """
+    Mark the oldest pending submissions as processing by `worker`
+
+    Submissions are claimed per season log, and never for a season log another
+    worker is still processing, so one user's episodes are written in the order
+    they were posted. Claiming is a conditional UPDATE, so two workers racing
+    for the same rows cannot both get them. Where the backend can skip locked
+    rows, the candidates' season logs are also locked until the claim commits,
+    so under READ COMMITTED a worker either skips a season log another worker
+    is claiming or sees that claim once it gets the lock. SQLite's IMMEDIATE
+    transactions already let only one worker claim at a time.
+
+    Returns: list -- claimed submissions, oldest first
+    """
+    now = timezone.now()
+    claim_timeout = timedelta(seconds=episode_log_ingestion_settings()['CLAIM_TIMEOUT'])
+
+    with transaction.atomic():
+        # Give submissions held by a worker that died mid batch back to the queue
+        EpisodeLogSubmission.objects.filter(
+            status=EpisodeLogSubmission.PROCESSING,
+            claimed_at__lt=now - claim_timeout
+        ).update(status=EpisodeLogSubmission.PENDING, claimed_by='', claimed_at=None)
+
+        busy_season_logs = EpisodeLogSubmission.objects.filter(
+            status=EpisodeLogSubmission.PROCESSING
+        ).values('season_log_id')
+        candidates = list(
+            EpisodeLogSubmission.objects.filter(
+                status=EpisodeLogSubmission.PENDING
+            ).exclude(
+                season_log_id__in=busy_season_logs
+            ).order_by('id').values_list('id', 'season_log_id')[:batch_size]
+        )
+        if not candidates:
+            return []
+
+        season_log_ids = {season_log_id for _, season_log_id in candidates}
+        if connection.features.has_select_for_update_skip_locked:
+            season_log_ids = set(
+                SeasonLog.objects.select_for_update(skip_locked=True).filter(
+                    id__in=season_log_ids
+                ).values_list('id', flat=True)
+            )
+
+        # Checked again in the claiming statement, which runs after the locks are held
+        other_worker_busy = EpisodeLogSubmission.objects.filter(
+            season_log_id=OuterRef('season_log_id'),
+            status=EpisodeLogSubmission.PROCESSING
+        )
+        EpisodeLogSubmission.objects.filter(
+            status=EpisodeLogSubmission.PENDING,
+            season_log_id__in=season_log_ids,
+            id__lte=candidates[-1][0]
+        ).exclude(
+            Exists(other_worker_busy)
+        ).update(status=EpisodeLogSubmission.PROCESSING, claimed_by=worker, claimed_at=now)
+
+    return list(EpisodeLogSubmission.objects.filter(
+        status=EpisodeLogSubmission.PROCESSING,
+        claimed_by=worker
+    ).order_by('id'))
+
+def write_submissions(submissions):
+    """
+    Validate claimed submissions against the current logs and write the valid ones in one transaction
+
+    Each submission is checked like the synchronous episode_logs POST, in the
+    order it was posted, against an in-memory copy of its season log's active
+    cast, so a survivor voted out in one submission cannot act in a later one.
+    Invalid submissions are marked failed, valid ones done with their episode log.
+
+    Args: submissions (list) -- submissions claimed by this worker, oldest first
+
+    Returns: tuple -- (submissions done, submissions failed)
+    """
+    # Imported here, the views import this module for the queued POST
+    from survivorapi.views.season_logs import ACTION_NAMES, build_episode_actions, save_episode_actions
+
+    with transaction.atomic():
+        season_log_ids = {submission.season_log_id for submission in submissions}
+        season_ids = dict(SeasonLog.objects.filter(id__in=season_log_ids).values_list('id', 'season_id'))
+        episodes = {
+            (episode.season_id, episode.episode_number): episode
+            for episode in Episode.objects.filter(season_id__in=set(season_ids.values()))
+        }
+        logged_episodes = set(
+            EpisodeLog.objects.filter(season_log_id__in=season_log_ids).values_list('season_log_id', 'episode_id')
+        )
+        survivor_logs_by_id = {
+            survivor_log.id: survivor_log
+            for survivor_log in SurvivorLog.objects.filter(season_log_id__in=season_log_ids, is_active=True)
+        }
+        active_survivor_logs = dict(survivor_logs_by_id)
+
+        accepted = []
+        for submission in submissions:
+            payload = submission.payload
+            episode = episodes.get((season_ids.get(submission.season_log_id), submission.episode_number))
+            survivor_log_ids = [survivor_data['id'] for survivor_data in payload['survivor_logs']]
+
+            if episode is None:
+                error = "Episode not found"
+            elif (submission.season_log_id, episode.id) in logged_episodes:
+                error = "Episode log already exists for this episode"
+            elif len(set(survivor_log_ids)) != len(survivor_log_ids):
+                error = "Duplicate survivor log IDs"
+            elif any(
+                survivor_log_id not in active_survivor_logs
+                or active_survivor_logs[survivor_log_id].season_log_id != submission.season_log_id
+                for survivor_log_id in survivor_log_ids
+            ):
+                error = "One or more invalid or inactive survivor log IDs"
+            else:
+                error = None
+
+            submission.processed_at = timezone.now()
+            if error is not None:
+                submission.status = EpisodeLogSubmission.FAILED
+                submission.error = error
+                continue
+
+            logged_episodes.add((submission.season_log_id, episode.id))
+            for survivor_data in payload['survivor_logs']:
+                if survivor_data['episode_actions'].get("voted_out"):
+                    del active_survivor_logs[survivor_data['id']]
+
+            submission.status = EpisodeLogSubmission.DONE
+            submission.episode_log = EpisodeLog(
+                user_id=submission.user_id,
+                episode=episode,
+                season_log_id=submission.season_log_id
+            )
+            accepted.append(submission)
+
+        EpisodeLog.objects.bulk_create([submission.episode_log for submission in accepted])
+
+        actions = {model: [] for model in ACTION_NAMES}
+        voted_out_logs = []
+        for submission in accepted:
+            voted_out_logs += build_episode_actions(
+                submission.episode_log,
+                submission.episode_number,
+                submission.payload['survivor_logs'],
+                survivor_logs_by_id,
+                actions
+            )
+        save_episode_actions(actions)
+
+        if voted_out_logs:
+            SurvivorLog.objects.bulk_update(voted_out_logs, ['is_active', 'episode_voted_out'])
+
+        EpisodeLogSubmission.objects.bulk_update(
+            submissions,
+            ['status', 'error', 'episode_log', 'processed_at']
+        )
+
+    return len(accepted), len(submissions) - len(accepted)
+
+def process_submissions(submissions):
+    """
+    Write claimed submissions as one batch, falling back to one transaction per submission
+
+    An integrity error, such as a synchronous POST logging the same episode
+    meanwhile, rolls back the whole batch, so each submission is then retried
+    alone and only the ones that still fail are marked failed. Other database
+    errors, such as lock timeouts, are raised for drain_queue to retry later.
+
+    Returns: tuple -- (submissions done, submissions failed)
+    """
+    try:
+        return write_submissions(submissions)
+    except IntegrityError as ex:
+        if len(submissions) == 1:
+            EpisodeLogSubmission.objects.filter(pk=submissions[0].pk).update(
+                status=EpisodeLogSubmission.FAILED,
+                error=str(ex),
+                episode_log=None,
+                processed_at=timezone.now()
+            )
+            return 0, 1
+
+        logger.warning("Episode log batch of %s failed, retrying one by one: %s", len(submissions), ex)
+
+    done = failed = 0
+    for submission in submissions:
+        submission.refresh_from_db()
+        submission_done, submission_failed = process_submissions([submission])
+        done += submission_done
+        failed += submission_failed
+    return done, failed
+
+def release_submissions(worker):
+    """Put the submissions `worker` has claimed but not written back in the queue"""
+    return EpisodeLogSubmission.objects.filter(
+        status=EpisodeLogSubmission.PROCESSING,
+        claimed_by=worker
+    ).update(status=EpisodeLogSubmission.PENDING, claimed_by='', claimed_at=None)
+
+def drain_queue(batch_size=None, poll_interval=None, once=False, should_stop=lambda: False, on_batch=None):
+    """
+    Claim and write batches until the queue is empty, with `once`, or until `should_stop()`
+
+    Args:
+        batch_size (int) -- most submissions per transaction, BATCH_SIZE by default
+        poll_interval (float) -- seconds to wait when the queue is empty, POLL_INTERVAL by default
+        once (bool) -- return as soon as no submission is left to claim
+        should_stop (callable) -- checked between batches to shut down cleanly
+        on_batch (callable) -- called with (claimed, done, failed, seconds) after each batch
+
+    Returns: dict -- totals of `batches`, `done` and `failed` submissions
+    """
+    ingestion_settings = episode_log_ingestion_settings()
+    batch_size = batch_size or ingestion_settings['BATCH_SIZE']
+    poll_interval = ingestion_settings['POLL_INTERVAL'] if poll_interval is None else poll_interval
+    worker = worker_name()
+    totals = {'batches': 0, 'done': 0, 'failed': 0}
+
+    try:
+        while not should_stop():
+            started = time.perf_counter()
+            try:
+                submissions = claim_submissions(worker, batch_size)
+                if submissions:
+                    done, failed = process_submissions(submissions)
+            except DatabaseError as ex:
+                # Lock timeouts and dropped connections leave the batch for the next try
+                logger.warning("Episode log batch failed, returning it to the queue: %s", ex)
+                connection.close()
+                time.sleep(poll_interval)
+                try:
+                    release_submissions(worker)
+                except DatabaseError:
+                    # CLAIM_TIMEOUT hands them to a worker later
+                    pass
+                continue
+
+            if not submissions:
+                if once:
+                    break
+                time.sleep(poll_interval)
+                continue
+
+            totals['batches'] += 1
+            totals['done'] += done
+            totals['failed'] += failed
+
+            if on_batch is not None:
+                on_batch(len(submissions), done, failed, time.perf_counter() - started)
+    finally:
+        connection.close()
+
+    return totals
@@ -0,0 +1,157 @@
+"""Management command for benchmarking concurrent episode logging"""
+import json
+import random
+import threading
+import time
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import override_settings
+from rest_framework.test import APIClient
+from survivorapi.models import Season, SurvivorLog
+from survivorapi.synthetic import generate_dataset
+
+def percentile(samples, fraction):
+    """Nearest-rank percentile of a list of samples"""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))]
+
+class Command(BaseCommand):
+    help = (
+        "Have several users log episodes at once through the episode_logs POST endpoint "
+        "and report throughput, latency and failures for the configured database"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--writers', type=int, default=8, help="Users logging episodes at the same time")
+        parser.add_argument('--episodes', type=int, default=6, help="Episodes each writer logs")
+        parser.add_argument('--survivors', type=int, default=18, help="Survivors in the cast")
+        parser.add_argument(
+            '--action-density',
+            type=float,
+            default=0.3,
+            help="Chance a survivor gets an action in a logged episode"
+        )
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', help="Also write the results to this JSON file")
+
+    def handle(self, *args, **options):
+        # Writers run on their own threads and connections, so the dataset has to be committed
+        with transaction.atomic():
+            dataset = generate_dataset(
+                seasons=1,
+                survivors_per_season=options['survivors'],
+                episodes_per_season=options['episodes'],
+                users=options['writers'],
+                season_logs_per_user=1,
+                logged_episodes=0,
+                action_density=0,
+                seed=options['seed']
+            )
+
+        try:
+            results = self.run_writers(dataset['sessions'], options)
+        finally:
+            User.objects.filter(auth_token__key__in=[token for token, _ in dataset['sessions']]).delete()
+            Season.objects.filter(id__in=dataset['seasons']).delete()
+
+        database = settings.DATABASES['default']
+        results = {
+            'database': connection.vendor,
+            'conn_max_age': database.get('CONN_MAX_AGE', 0),
+            'options': {key: value for key, value in database.get('OPTIONS', {}).items() if key != 'password'},
+            **results,
+        }
+
+        self.stdout.write(
+            f"{results['database']}: {results['writers']} writers logged {results['episodes_logged']} episodes "
+            f"in {results['wall_s']:.2f}s ({results['episodes_per_s']:.1f} episodes/s), "
+            f"p50 {results['p50_ms']:.1f} ms, p95 {results['p95_ms']:.1f} ms, "
+            f"{results['failures']} failed"
+        )
+        for error, count in results['errors'].items():
+            self.stdout.write(f"  {count} x {error}")
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as output:
+                json.dump(results, output, indent=2, default=str)
+
+    def run_writers(self, sessions, options):
+        survivor_log_ids = {}
+        for survivor_log_id, season_log_id in SurvivorLog.objects.filter(
+            season_log_id__in=[ids[0] for _, ids in sessions]
+        ).order_by('id').values_list('id', 'season_log_id'):
+            survivor_log_ids.setdefault(season_log_id, []).append(survivor_log_id)
+
+        latencies = []
+        errors = {}
+        lock = threading.Lock()
+        start = threading.Barrier(len(sessions))
+
+        def write(index, token, season_log_id):
+            rng = random.Random(options['seed'] + index)
+            client = APIClient()
+            client.credentials(HTTP_AUTHORIZATION=f"Token {token}", HTTP_ACCEPT='application/json')
+            remaining = list(survivor_log_ids[season_log_id])
+
+            start.wait()
+            try:
+                for episode_number in range(1, options['episodes'] + 1):
+                    voted_out = remaining.pop(rng.randrange(len(remaining))) if len(remaining) > 1 else None
+                    payload = {
+                        'episode_number': episode_number,
+                        'survivor_logs': [
+                            {
+                                'id': survivor_log_id,
+                                'episode_actions': {
+                                    'found_idol': rng.random() < options['action_density'],
+                                    'won_immunity': rng.random() < options['action_density'],
+                                    'won_reward': rng.random() < options['action_density'],
+                                    'voted_out': survivor_log_id == voted_out,
+                                }
+                            }
+                            for survivor_log_id in remaining + ([voted_out] if voted_out else [])
+                        ]
+                    }
+
+                    started = time.perf_counter()
+                    try:
+                        response = client.post(f"/season-logs/{season_log_id}/episodes", payload, format='json')
+                        error = None if response.status_code == 201 else f"HTTP {response.status_code}"
+                    except Exception as ex:
+                        error = f"{type(ex).__name__}: {ex}"
+                    elapsed = (time.perf_counter() - started) * 1000
+
+                    with lock:
+                        if error is None:
+                            latencies.append(elapsed)
+                        else:
+                            errors[error] = errors.get(error, 0) + 1
+            finally:
+                connection.close()
+
+        threads = [
+            threading.Thread(target=write, args=(index, token, season_log_ids[0]))
+            for index, (token, season_log_ids) in enumerate(sessions)
+        ]
+
+        # The test client sends requests to the "testserver" host
+        with override_settings(ALLOWED_HOSTS=['testserver']):
+            started = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            wall = time.perf_counter() - started
+
+        return {
+            'writers': len(sessions),
+            'episodes_logged': len(latencies),
+            'failures': sum(errors.values()),
+            'wall_s': round(wall, 3),
+            'episodes_per_s': round(len(latencies) / wall, 1) if wall else 0,
+            'p50_ms': round(percentile(latencies, 0.5), 1) if latencies else 0,
+            'p95_ms': round(percentile(latencies, 0.95), 1) if latencies else 0,
+            'errors': errors,
+        }
@@ -0,0 +1,203 @@
+"""Management command for benchmarking the API endpoints over a synthetic dataset"""
+import json
+import platform
+import random
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+from rest_framework.test import APIClient
+from survivorapi.models import SeasonLog
+from survivorapi.synthetic import generate_dataset
+from survivorapi.views.catalog_cache import bump_catalog_generation
+
+def percentile(samples, fraction):
+    """Nearest-rank percentile of a list of samples"""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))]
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+class Command(BaseCommand):
+    help = (
+        "Generate a synthetic dataset, drive the season log, season and survivor endpoints "
+        "through the DRF test client and write latency, query and memory figures to JSON"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seasons', type=int, default=5)
+        parser.add_argument('--survivors', type=int, default=18, help="Survivors per season")
+        parser.add_argument('--episodes', type=int, default=14, help="Episodes per season")
+        parser.add_argument('--users', type=int, default=20)
+        parser.add_argument('--season-logs', type=int, default=3, help="Season logs per user")
+        parser.add_argument('--logged-episodes', type=int, default=10, help="Episodes logged per season log")
+        parser.add_argument(
+            '--action-density',
+            type=float,
+            default=0.2,
+            help="Chance a survivor log gets an action in a logged episode"
+        )
+        parser.add_argument('--requests', type=int, default=50, help="Timed requests per endpoint")
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument(
+            '--output',
+            default='benchmark-results.json',
+            help="File the results are written to"
+        )
+        parser.add_argument(
+            '--compare',
+            help="Earlier results file to print p50/p95 and query changes against"
+        )
+        parser.add_argument(
+            '--keep',
+            action='store_true',
+            help="Commit the synthetic dataset instead of rolling it back"
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            started = time.perf_counter()
+            dataset = generate_dataset(
+                seasons=options['seasons'],
+                survivors_per_season=options['survivors'],
+                episodes_per_season=options['episodes'],
+                users=options['users'],
+                season_logs_per_user=options['season_logs'],
+                logged_episodes=options['logged_episodes'],
+                action_density=options['action_density'],
+                seed=options['seed']
+            )
+            self.stdout.write(f"Generated dataset in {time.perf_counter() - started:.2f}s: {dataset['counts']}")
+
+            if not dataset['sessions'] or not dataset['sessions'][0][1]:
+                raise CommandError("The dataset needs at least one user with a season log")
+
+            # The test client sends requests to the "testserver" host
+            with override_settings(ALLOWED_HOSTS=['testserver']):
+                endpoints = self.run_endpoints(dataset['sessions'], options)
+
+            if not options['keep']:
+                transaction.set_rollback(True)
+
+        if not options['keep']:
+            # Catalog responses cached during the run describe rolled back rows
+            bump_catalog_generation()
+
+        results = {
+            'revision': git_revision(),
+            'recorded_at': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'database': connection.vendor,
+            'options': {
+                key: options[key] for key in (
+                    'seasons', 'survivors', 'episodes', 'users', 'season_logs',
+                    'logged_episodes', 'action_density', 'requests', 'seed'
+                )
+            },
+            'dataset': dataset['counts'],
+            'endpoints': endpoints,
+        }
+
+        with open(options['output'], 'w', encoding='utf-8') as output:
+            json.dump(results, output, indent=2)
+
+        self.report(endpoints, options['compare'])
+        self.stdout.write(f"Wrote {options['output']}")
+
+    def run_endpoints(self, sessions, options):
+        """Time every endpoint against random users and season logs from the dataset"""
+        rng = random.Random(options['seed'])
+        season_id = self.season_ids(sessions)
+
+        endpoints = {
+            'season-log-list': lambda log: "/season-logs",
+            'season-log-episode-logs': lambda log: f"/season-logs/{log}/episodes",
+            'season-log-survivor-logs': lambda log: f"/season-logs/{log}/survivors/",
+            'season-log-favorite-to-win': lambda log: f"/season-logs/{log}/survivors/winner-pick",
+            'season-list': lambda log: "/seasons",
+            'season-detail': lambda log: f"/seasons/{season_id[log]}",
+            'survivor-list': lambda log: f"/survivors?season_number={season_id[log]}",
+        }
+        results = {}
+
+        for name, build_path in endpoints.items():
+            latencies = []
+            queries = []
+            sizes = []
+            statuses = {}
+
+            for _ in range(options['requests']):
+                client, season_log_id = self.session(rng, sessions)
+                path = build_path(season_log_id)
+
+                with CaptureQueriesContext(connection) as captured:
+                    started = time.perf_counter()
+                    response = client.get(path)
+                    latencies.append((time.perf_counter() - started) * 1000)
+
+                queries.append(len(captured.captured_queries))
+                sizes.append(len(response.content))
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+            # Measure memory on separate requests so tracing does not skew the latencies
+            client, season_log_id = self.session(rng, sessions)
+            tracemalloc.start()
+            client.get(build_path(season_log_id))
+            peak_memory = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+            results[name] = {
+                'requests': len(latencies),
+                'p50_ms': round(percentile(latencies, 0.5), 3),
+                'p95_ms': round(percentile(latencies, 0.95), 3),
+                'mean_ms': round(sum(latencies) / len(latencies), 3),
+                'queries_min': min(queries),
+                'queries_max': max(queries),
+                'bytes_mean': sum(sizes) // len(sizes),
+                'peak_memory_kb': round(peak_memory / 1024, 1),
+                'status_codes': {str(code): count for code, count in statuses.items()},
+            }
+
+        return results
+
+    def session(self, rng, sessions):
+        """Authenticated client for a random user and one of their season logs"""
+        token, season_log_ids = rng.choice(sessions)
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Token {token}", HTTP_ACCEPT='application/json')
+        return client, rng.choice(season_log_ids)
+
+    def season_ids(self, sessions):
+        season_log_ids = [season_log_id for _, ids in sessions for season_log_id in ids]
+        return dict(SeasonLog.objects.filter(id__in=season_log_ids).values_list('id', 'season_id'))
+
+    def report(self, endpoints, compare_path):
+        previous = {}
+        if compare_path:
+            with open(compare_path, encoding='utf-8') as compare_file:
+                previous = json.load(compare_file)['endpoints']
+
+        for name, result in endpoints.items():
+            line = (
+                f"{name:<28} p50 {result['p50_ms']:>8.2f} ms  p95 {result['p95_ms']:>8.2f} ms  "
+                f"queries {result['queries_min']}-{result['queries_max']}  "
+                f"peak {result['peak_memory_kb']:>8.1f} KiB"
+            )
+            if name in previous:
+                before = previous[name]
+                line += (
+                    f"  (p50 {result['p50_ms'] - before['p50_ms']:+.2f} ms, "
+                    f"p95 {result['p95_ms'] - before['p95_ms']:+.2f} ms, "
+                    f"queries {result['queries_max'] - before['queries_max']:+d})"
+                )
+            self.stdout.write(line)
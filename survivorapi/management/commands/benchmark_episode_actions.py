@@ -0,0 +1,64 @@
+"""Management command for benchmarking the episode log write path"""
+import timeit
+from django.core.management.base import BaseCommand
+from survivorapi.models import EpisodeLog, SurvivorLog
+from survivorapi.views.season_logs import ACTION_NAMES, build_episode_actions
+
+class Command(BaseCommand):
+    help = "Time building episode action records for casts of different sizes"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes',
+            type=int,
+            nargs='+',
+            default=[20, 100, 1000],
+            help="Survivor counts to benchmark"
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=20,
+            help="Number of timed runs per size"
+        )
+
+    def handle(self, *args, **options):
+        for size in options['sizes']:
+            survivor_logs = [SurvivorLog(id=survivor_log_id) for survivor_log_id in range(1, size + 1)]
+            survivor_entries = [
+                {
+                    'id': survivor_log.id,
+                    'episode_actions': {
+                        'found_idol': survivor_log.id % 3 == 0,
+                        'won_immunity': survivor_log.id % 2 == 0,
+                        'won_reward': survivor_log.id % 5 == 0,
+                        'voted_out': survivor_log.id == size,
+                    }
+                }
+                for survivor_log in survivor_logs
+            ]
+            episode_log = EpisodeLog(id=1)
+
+            def linear_lookup():
+                for survivor_data in survivor_entries:
+                    next(sl for sl in survivor_logs if sl.id == survivor_data['id'])
+
+            def keyed_lookup():
+                survivor_logs_by_id = {survivor_log.id: survivor_log for survivor_log in survivor_logs}
+                for survivor_data in survivor_entries:
+                    survivor_logs_by_id[survivor_data['id']]
+
+            def build_actions():
+                survivor_logs_by_id = {survivor_log.id: survivor_log for survivor_log in survivor_logs}
+                actions = {model: [] for model in ACTION_NAMES}
+                build_episode_actions(episode_log, 1, survivor_entries, survivor_logs_by_id, actions)
+
+            linear = min(timeit.repeat(linear_lookup, number=1, repeat=options['repeat']))
+            keyed = min(timeit.repeat(keyed_lookup, number=1, repeat=options['repeat']))
+            build = min(timeit.repeat(build_actions, number=1, repeat=options['repeat']))
+
+            self.stdout.write(
+                f"{size:>6} survivors: linear lookup {linear * 1000:.3f} ms, "
+                f"keyed lookup {keyed * 1000:.3f} ms, "
+                f"build_episode_actions {build * 1000:.3f} ms"
+            )
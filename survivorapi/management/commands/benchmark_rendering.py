@@ -0,0 +1,63 @@
+"""Management command for benchmarking JSON rendering of API payloads"""
+import timeit
+from pathlib import Path
+from django.core import serializers
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+from survivorapi.renderers import FastJSONRenderer, orjson
+
+FIXTURE_DIR = Path(__file__).resolve().parents[2] / 'fixtures'
+
+class Command(BaseCommand):
+    help = "Compare JSONRenderer with FastJSONRenderer on payloads built from the fixtures"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scale',
+            type=int,
+            nargs='+',
+            default=[1, 10, 100],
+            help="How many copies of each fixture's records to render at once"
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=10,
+            help="Number of timed runs per payload"
+        )
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            self.stdout.write("orjson is not installed, FastJSONRenderer falls back to JSONRenderer")
+
+        for fixture in sorted(FIXTURE_DIR.glob('*.json')):
+            # Deserialize into model instances so dates, datetimes and decimals keep their Python types
+            with fixture.open() as fixture_file:
+                records = [
+                    {
+                        field.attname: field.value_from_object(deserialized.object)
+                        for field in deserialized.object._meta.concrete_fields
+                    }
+                    for deserialized in serializers.deserialize('json', fixture_file)
+                ]
+
+            for scale in options['scale']:
+                payload = records * scale
+
+                stdlib_body = JSONRenderer().render(payload)
+                fast_body = FastJSONRenderer().render(payload)
+                if stdlib_body != fast_body:
+                    raise CommandError(f"FastJSONRenderer output differs for {fixture.name}")
+
+                stdlib = min(timeit.repeat(
+                    lambda: JSONRenderer().render(payload), number=1, repeat=options['repeat']
+                ))
+                fast = min(timeit.repeat(
+                    lambda: FastJSONRenderer().render(payload), number=1, repeat=options['repeat']
+                ))
+
+                self.stdout.write(
+                    f"{fixture.stem:>16} x{scale:<4} ({len(stdlib_body):>9,} bytes): "
+                    f"JSONRenderer {stdlib * 1000:.3f} ms, "
+                    f"FastJSONRenderer {fast * 1000:.3f} ms ({stdlib / fast:.1f}x)"
+                )
@@ -0,0 +1,124 @@
+"""Management command for benchmarking the episode history serializers"""
+import timeit
+from datetime import datetime, timezone
+from django.core.management.base import BaseCommand, CommandError
+from survivorapi.models import (
+    Episode,
+    EpisodeLog,
+    FoundAdvantage,
+    FoundIdol,
+    PlayedIdol,
+    Survivor,
+    SurvivorLog,
+    WonImmunity,
+    WonReward
+)
+from survivorapi.views import fast_serializers
+from survivorapi.views.season_logs import EpisodeLogSerializer
+
+class Command(BaseCommand):
+    help = "Compare EpisodeLogSerializer with the fast path for in-memory episode histories"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--survivors',
+            type=int,
+            default=18,
+            help="Survivors in the cast"
+        )
+        parser.add_argument(
+            '--episodes',
+            type=int,
+            nargs='+',
+            default=[1, 6, 14],
+            help="Episode counts to benchmark"
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=10,
+            help="Number of timed runs per episode count"
+        )
+
+    def handle(self, *args, **options):
+        survivor_logs = [
+            SurvivorLog(
+                id=survivor_id,
+                survivor=Survivor(
+                    id=survivor_id,
+                    first_name=f"Survivor {survivor_id}",
+                    last_name="Benchmark",
+                    age=30,
+                    img_url=f"media/survivor{survivor_id}.jpg"
+                ),
+                is_active=True
+            )
+            for survivor_id in range(1, options['survivors'] + 1)
+        ]
+
+        for episode_count in options['episodes']:
+            episode_logs = [
+                self.episode_log(episode_number, survivor_logs)
+                for episode_number in range(1, episode_count + 1)
+            ]
+            # Every action row nests a survivor log, so count those as serialized objects too
+            object_count = sum(
+                1 + sum(len(actions) for actions in episode_log._prefetched_objects_cache.values())
+                for episode_log in episode_logs
+            )
+
+            def drf():
+                EpisodeLogSerializer(
+                    episode_logs,
+                    many=True,
+                    context={'total_episodes': episode_count}
+                ).data
+
+            def fast():
+                fast_serializers.episode_logs_data(episode_logs, episode_count)
+
+            drf_data = EpisodeLogSerializer(
+                episode_logs,
+                many=True,
+                context={'total_episodes': episode_count}
+            ).data
+            if fast_serializers.episode_logs_data(episode_logs, episode_count) != drf_data:
+                raise CommandError("Fast path output differs from EpisodeLogSerializer")
+
+            drf_time = min(timeit.repeat(drf, number=1, repeat=options['repeat']))
+            fast_time = min(timeit.repeat(fast, number=1, repeat=options['repeat']))
+
+            self.stdout.write(
+                f"{episode_count:>4} episodes ({object_count} objects): "
+                f"serializer {object_count / drf_time:,.0f} objects/s, "
+                f"fast path {object_count / fast_time:,.0f} objects/s "
+                f"({drf_time / fast_time:.1f}x)"
+            )
+
+    def episode_log(self, episode_number, survivor_logs):
+        """Build an episode log with its actions in the prefetch cache, as the GET path loads it"""
+        episode_log = EpisodeLog(
+            id=episode_number,
+            episode=Episode(
+                id=episode_number,
+                episode_number=episode_number,
+                air_date_time=datetime(2024, 9, 18, tzinfo=timezone.utc),
+                title=f"Episode {episode_number}"
+            ),
+            created_at=datetime(2024, 9, 19, tzinfo=timezone.utc)
+        )
+
+        def actions(model, every, **fields):
+            return [
+                model(id=survivor_log.id, survivor_log=survivor_log, **fields)
+                for survivor_log in survivor_logs[::every]
+            ]
+
+        episode_log._prefetched_objects_cache = {
+            'found_idols': actions(FoundIdol, 6),
+            'found_advantages': actions(FoundAdvantage, 5),
+            'played_idols': actions(PlayedIdol, 9),
+            'won_immunities': actions(WonImmunity, 2, is_individual=False),
+            'won_rewards': actions(WonReward, 3),
+        }
+        return episode_log
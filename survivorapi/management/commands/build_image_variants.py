@@ -0,0 +1,64 @@
+"""Management command for building downsized survivor image variants"""
+import time
+from django.core.management.base import BaseCommand, CommandError
+from survivorapi.media import VARIANT_DIR, VARIANT_FORMATS, VARIANT_SIZES, generate_variants, media_root
+from survivorapi.views.catalog_cache import bump_catalog_generation
+
+IMAGE_SUFFIXES = {'.jpg', '.jpeg', '.png', '.webp'}
+
+class Command(BaseCommand):
+    help = "Build content-hashed WebP and JPEG variants of the images in MEDIA_ROOT at list, card and detail sizes"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'images',
+            nargs='*',
+            help="Image paths relative to MEDIA_ROOT, every image by default"
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=None,
+            help="Worker processes, one per CPU by default"
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help="Rewrite variants that already exist"
+        )
+
+    def handle(self, *args, **options):
+        root = media_root()
+        names = options['images'] or sorted(
+            path.relative_to(root).as_posix()
+            for path in root.rglob('*')
+            if path.suffix.lower() in IMAGE_SUFFIXES
+            and path.is_file()
+            and VARIANT_DIR not in path.relative_to(root).parts
+        )
+        if not names:
+            raise CommandError(f"No images found in {root}")
+
+        original_bytes = sum((root / name).stat().st_size for name in names)
+        started = time.perf_counter()
+
+        try:
+            built = generate_variants(names, workers=options['workers'], force=options['force'])
+        except RuntimeError as ex:
+            raise CommandError(str(ex))
+
+        # Cached catalog responses were rendered without the new srcsets
+        bump_catalog_generation()
+
+        variant_dir = root / VARIANT_DIR
+        self.stdout.write(
+            f"Built variants for {len(built)} images in {time.perf_counter() - started:.2f}s "
+            f"(originals {original_bytes / 1024:,.0f} KiB)"
+        )
+        for extension in VARIANT_FORMATS:
+            for size_name in VARIANT_SIZES:
+                size = sum(
+                    (variant_dir / entry['formats'][extension][size_name].rsplit('/', 1)[-1]).stat().st_size
+                    for entry in built.values()
+                )
+                self.stdout.write(f"  {size_name:>6} {extension:<4} {size / 1024:>8,.0f} KiB")
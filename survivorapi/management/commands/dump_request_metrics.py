@@ -0,0 +1,128 @@
+"""Management command for dumping per-route request metrics"""
+import json
+from pathlib import Path
+from django.core.management.base import BaseCommand
+from survivorapi.authentication import token_cache as process_token_cache
+from survivorapi.middleware import LATENCY_BUCKETS, RESET_MARKER, request_metrics_settings, route_metrics
+
+def merge_dumps(dump_dir) -> dict:
+    """Combine the histograms every server process wrote to `dump_dir`"""
+    routes = {}
+
+    for dump in sorted(Path(dump_dir).glob('*.json')):
+        for route, stats in json.loads(dump.read_text())['routes'].items():
+            merged = routes.get(route)
+            if merged is None:
+                routes[route] = {'serialize_ms': 0.0, **stats, 'buckets': list(stats['buckets'])}
+                continue
+
+            for key in ('requests', 'total_ms', 'queries', 'db_ms', 'serialize_ms', 'render_ms', 'bytes'):
+                merged[key] += stats.get(key, 0)
+            for key in ('max_ms', 'max_queries', 'max_bytes'):
+                merged[key] = max(merged[key], stats[key])
+            merged['buckets'] = [a + b for a, b in zip(merged['buckets'], stats['buckets'])]
+
+    return routes
+
+def merge_token_cache_stats(dump_dir) -> dict:
+    """Combine the token cache counters every server process wrote to `dump_dir`"""
+    merged = {'processes': 0, 'hits': 0, 'misses': 0, 'size': 0}
+
+    for dump in sorted(Path(dump_dir).glob('*.json')):
+        stats = json.loads(dump.read_text()).get('token_cache')
+        if stats is None:
+            continue
+
+        merged['processes'] += 1
+        for key in ('hits', 'misses', 'size'):
+            merged[key] += stats[key]
+
+    lookups = merged['hits'] + merged['misses']
+    merged['hit_rate'] = merged['hits'] / lookups if lookups else 0.0
+    return merged
+
+def percentile(buckets, fraction):
+    """
+    Estimate a latency percentile from histogram buckets
+
+    Returns: str -- upper bound of the bucket holding the percentile, in ms
+    """
+    target = sum(buckets) * fraction
+    seen = 0
+    for bound, count in zip(LATENCY_BUCKETS + (None,), buckets):
+        seen += count
+        if seen >= target:
+            return f"<={bound}" if bound is not None else f">{LATENCY_BUCKETS[-1]}"
+    return '-'
+
+class Command(BaseCommand):
+    help = (
+        "Print the per-route query, latency and size histogram recorded by RequestMetricsMiddleware, "
+        "and the token cache hit rate"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--json',
+            action='store_true',
+            help="Print the merged histogram as JSON"
+        )
+        parser.add_argument(
+            '--reset',
+            action='store_true',
+            help="Delete the recorded histograms after printing them, and have every process restart its own"
+        )
+
+    def handle(self, *args, **options):
+        dump_dir = request_metrics_settings()['DUMP_DIR']
+        recorded = dump_dir and Path(dump_dir).is_dir()
+        routes = merge_dumps(dump_dir) if recorded else {}
+        token_cache = merge_token_cache_stats(dump_dir) if recorded else None
+
+        if options['json']:
+            self.stdout.write(json.dumps(
+                {'buckets': LATENCY_BUCKETS, 'routes': routes, 'token_cache': token_cache},
+                indent=2
+            ))
+        elif not routes:
+            self.stdout.write(f"No request metrics recorded in {dump_dir}")
+        else:
+            self.stdout.write(
+                f"{'route':<44} {'requests':>8} {'avg ms':>8} {'p50 ms':>8} {'p95 ms':>8} "
+                f"{'avg q':>6} {'max q':>6} {'db ms':>8} {'ser ms':>8} {'render ms':>9} {'avg bytes':>10}"
+            )
+            for route, stats in sorted(routes.items(), key=lambda item: -item[1]['total_ms']):
+                requests = stats['requests']
+                self.stdout.write(
+                    f"{route:<44} {requests:>8} {stats['total_ms'] / requests:>8.2f} "
+                    f"{percentile(stats['buckets'], 0.5):>8} {percentile(stats['buckets'], 0.95):>8} "
+                    f"{stats['queries'] / requests:>6.1f} {stats['max_queries']:>6} "
+                    f"{stats['db_ms'] / requests:>8.2f} {stats['serialize_ms'] / requests:>8.2f} "
+                    f"{stats['render_ms'] / requests:>9.2f} "
+                    f"{stats['bytes'] // requests:>10}"
+                )
+
+            if token_cache and token_cache['processes']:
+                self.stdout.write(
+                    f"\ntoken cache: {token_cache['hits']} hits, {token_cache['misses']} misses "
+                    f"({token_cache['hit_rate']:.1%} hit rate), {token_cache['size']} tokens cached "
+                    f"across {token_cache['processes']} processes"
+                )
+
+        if options['reset']:
+            self.reset(dump_dir)
+
+    def reset(self, dump_dir):
+        """Delete the dumps, and clear the live histograms of this and every server process"""
+        route_metrics.clear()
+        process_token_cache.reset_stats()
+
+        if not dump_dir:
+            return
+
+        path = Path(dump_dir)
+        path.mkdir(parents=True, exist_ok=True)
+        for dump in path.glob('*.json'):
+            dump.unlink()
+        # Server processes drop what they recorded before this on their next dump
+        (path / RESET_MARKER).touch()
@@ -0,0 +1,35 @@
+"""Management command for exporting a user's fantasy history"""
+import sys
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from survivorapi.export import export_user_history
+
+class Command(BaseCommand):
+    help = "Export a user's season logs and everything logged under them as NDJSON"
+
+    def add_arguments(self, parser):
+        parser.add_argument('username', help="Username of the user to export")
+        parser.add_argument(
+            '--output',
+            help="File to write to, defaults to stdout"
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=1000,
+            help="Rows fetched from the database per page"
+        )
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options['username'])
+        except User.DoesNotExist:
+            raise CommandError(f"User {options['username']} not found")
+
+        lines = export_user_history(user, chunk_size=options['chunk_size'])
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as output:
+                output.writelines(lines)
+        else:
+            sys.stdout.writelines(lines)
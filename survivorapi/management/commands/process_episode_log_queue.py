@@ -0,0 +1,116 @@
+"""Management command for draining the queued episode log submissions"""
+import multiprocessing
+import signal
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from survivorapi.ingestion import drain_queue, episode_log_ingestion_settings
+
+class Command(BaseCommand):
+    help = (
+        "Write queued episode log submissions in large batched transactions, "
+        "polling the queue table until stopped, see survivorapi/ingestion.py"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--processes',
+            type=int,
+            default=1,
+            help="Worker processes draining the queue at the same time"
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=None,
+            help="Most submissions written per transaction, EPISODE_LOG_INGESTION['BATCH_SIZE'] by default"
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=None,
+            help="Seconds an idle worker waits before checking the queue again"
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help="Exit once the queue is empty instead of polling"
+        )
+
+    def handle(self, *args, **options):
+        if options['processes'] < 1:
+            raise CommandError("--processes must be at least 1")
+
+        batch_size = options['batch_size'] or episode_log_ingestion_settings()['BATCH_SIZE']
+        started = time.perf_counter()
+
+        if options['processes'] == 1:
+            totals = self.run_worker(batch_size, options)
+        else:
+            totals = self.run_pool(batch_size, options)
+
+        self.stdout.write(
+            f"Wrote {totals['done']} episode logs in {totals['batches']} batches, "
+            f"{totals['failed']} failed, in {time.perf_counter() - started:.2f}s"
+        )
+
+    def run_worker(self, batch_size, options):
+        """Drain the queue in this process until it is empty with --once, or until SIGINT/SIGTERM"""
+        stopping = []
+
+        def stop(signum, frame):
+            stopping.append(signum)
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+
+        def report(claimed, done, failed, seconds):
+            self.stdout.write(
+                f"Batch of {claimed}: {done} written, {failed} failed in {seconds * 1000:.0f} ms"
+            )
+
+        return drain_queue(
+            batch_size=batch_size,
+            poll_interval=options['poll_interval'],
+            once=options['once'],
+            should_stop=lambda: bool(stopping),
+            on_batch=report if options['verbosity'] > 1 else None
+        )
+
+    def run_pool(self, batch_size, options):
+        """Fork one worker per process and add up their totals"""
+        # Forked workers must open their own connections
+        connections.close_all()
+
+        context = multiprocessing.get_context('fork')
+        results = context.Queue()
+        workers = [
+            context.Process(target=self.pool_worker, args=(results, batch_size, options))
+            for _ in range(options['processes'])
+        ]
+        for worker in workers:
+            worker.start()
+
+        def forward(signum, frame):
+            for worker in workers:
+                worker.terminate()
+
+        # Ctrl-C reaches every worker already, SIGTERM is passed on so each finishes its batch
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        signal.signal(signal.SIGTERM, forward)
+        totals = {'batches': 0, 'done': 0, 'failed': 0}
+        for _ in workers:
+            for key, value in results.get().items():
+                totals[key] += value
+        for worker in workers:
+            worker.join()
+
+        return totals
+
+    def pool_worker(self, results, batch_size, options):
+        totals = {}
+        try:
+            totals = self.run_worker(batch_size, options)
+        finally:
+            # Always report, so the parent never waits on a worker that crashed
+            results.put(totals)
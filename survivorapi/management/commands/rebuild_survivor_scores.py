@@ -0,0 +1,62 @@
+"""Management command for rebuilding the survivor score summary table"""
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from survivorapi.models import SurvivorLog, SurvivorScore
+from survivorapi.models.survivor_score import COUNT_FIELDS
+
+class Command(BaseCommand):
+    help = "Rebuild survivor scores from the raw action tables and verify they match"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--verify-only',
+            action='store_true',
+            help="Only compare the existing scores against the raw action tables"
+        )
+
+    def handle(self, *args, **options):
+        if not options['verify_only']:
+            with transaction.atomic():
+                written = SurvivorScore.objects.rebuild()
+            self.stdout.write(f"Rebuilt {written} survivor scores")
+
+        mismatches = self.find_mismatches()
+        if mismatches:
+            for survivor_log_id, reason in mismatches:
+                self.stderr.write(f"Survivor log {survivor_log_id}: {reason}")
+            raise CommandError(f"{len(mismatches)} survivor scores do not match the raw action tables")
+
+        self.stdout.write(self.style.SUCCESS("Survivor scores match the raw action tables"))
+
+    def find_mismatches(self):
+        """
+        Compare every survivor score against counts from the raw action tables
+
+        Returns: list -- (survivor_log_id, reason) tuples for each mismatch
+        """
+        expected = {
+            row['id']: row
+            for row in SurvivorLog.objects.order_by().with_achievement_stats().values('id', *COUNT_FIELDS)
+        }
+        actual = {
+            row['survivor_log_id']: row
+            for row in SurvivorScore.objects.values('survivor_log_id', 'total_points', *COUNT_FIELDS)
+        }
+        mismatches = []
+
+        for survivor_log_id, counts in expected.items():
+            score = actual.get(survivor_log_id)
+            if score is None:
+                if any(counts[field] for field in COUNT_FIELDS):
+                    mismatches.append((survivor_log_id, "missing score"))
+                continue
+
+            for field in COUNT_FIELDS:
+                if score[field] != counts[field]:
+                    mismatches.append((survivor_log_id, f"{field} is {score[field]}, expected {counts[field]}"))
+
+            expected_points = SurvivorScore(**{field: counts[field] for field in COUNT_FIELDS}).achievement_stats['total_points']
+            if score['total_points'] != expected_points:
+                mismatches.append((survivor_log_id, f"total_points is {score['total_points']}, expected {expected_points}"))
+
+        return mismatches
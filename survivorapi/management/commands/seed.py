@@ -0,0 +1,193 @@
+"""Management command for bulk loading fixtures and datasets into an empty database"""
+import csv
+import json
+import time
+from collections import defaultdict
+from pathlib import Path
+from django.apps import apps
+from django.core import serializers
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from survivorapi.models import Season, SurvivorScore
+
+FIXTURE_DIR = Path(__file__).resolve().parent.parent.parent / 'fixtures'
+
+class Command(BaseCommand):
+    help = (
+        "Bulk load survivorapi/fixtures/*.json and optional columnar CSV/JSONL datasets "
+        "in dependency order inside one transaction"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'datasets',
+            nargs='*',
+            help=(
+                "CSV or JSONL files named after their model, e.g. survivorapi.survivor.csv, "
+                "with one column or key per field"
+            )
+        )
+        parser.add_argument(
+            '--skip-fixtures',
+            action='store_true',
+            help="Only load the given datasets"
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help="Rows per INSERT statement"
+        )
+
+    def handle(self, *args, **options):
+        rows_by_model = defaultdict(list)
+        m2m_by_model = defaultdict(list)
+
+        if not options['skip_fixtures']:
+            for fixture in sorted(FIXTURE_DIR.glob('*.json')):
+                with open(fixture, encoding='utf-8') as fixture_file:
+                    for deserialized in serializers.deserialize('json', fixture_file):
+                        model = type(deserialized.object)
+                        rows_by_model[model].append(deserialized.object)
+                        if deserialized.m2m_data:
+                            m2m_by_model[model].append((deserialized.object, deserialized.m2m_data))
+
+        for dataset in options['datasets']:
+            model, rows = self.read_dataset(Path(dataset))
+            rows_by_model[model].extend(rows)
+
+        if not rows_by_model:
+            raise CommandError("Nothing to load")
+
+        started = time.perf_counter()
+        total_rows = 0
+
+        with transaction.atomic():
+            for model in self.dependency_order(rows_by_model):
+                rows = rows_by_model[model]
+                model_started = time.perf_counter()
+
+                model.objects.bulk_create(rows, batch_size=options['batch_size'])
+                self.create_m2m(model, m2m_by_model[model], options['batch_size'])
+
+                elapsed = time.perf_counter() - model_started
+                total_rows += len(rows)
+                self.stdout.write(
+                    f"{model._meta.label}: {len(rows)} rows in {elapsed:.3f}s "
+                    f"({len(rows) / elapsed if elapsed else 0:,.0f} rows/s)"
+                )
+
+            self.reset_sequences(rows_by_model)
+
+            # bulk_create skips the signals that maintain these denormalized values
+            Season.objects.refresh_episode_counts()
+            SurvivorScore.objects.rebuild()
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Loaded {total_rows} rows in {elapsed:.3f}s "
+            f"({total_rows / elapsed if elapsed else 0:,.0f} rows/s)"
+        ))
+
+    def read_dataset(self, path):
+        """
+        Read a columnar CSV or JSONL dataset into unsaved model instances
+
+        Args: path (Path) -- dataset named `<app_label>.<model>.csv` or `.jsonl`
+
+        Returns: tuple -- (model class, list of unsaved instances)
+        """
+        try:
+            model = apps.get_model(path.stem)
+        except (LookupError, ValueError):
+            raise CommandError(f"{path.name} must be named after a model, e.g. survivorapi.survivor.csv")
+
+        fields = {field.attname: field for field in model._meta.concrete_fields}
+        fields.update({field.name: field for field in model._meta.concrete_fields})
+
+        with open(path, encoding='utf-8', newline='') as dataset_file:
+            if path.suffix == '.csv':
+                records = list(csv.DictReader(dataset_file))
+            elif path.suffix == '.jsonl':
+                records = [json.loads(line) for line in dataset_file if line.strip()]
+            else:
+                raise CommandError(f"{path.name} must be a .csv or .jsonl file")
+
+        rows = []
+        for record in records:
+            values = {}
+            for column, value in record.items():
+                if column not in fields:
+                    raise CommandError(f"{path.name}: unknown field {column} for {model._meta.label}")
+                field = fields[column]
+                # CSV has no null, so an empty cell means null for nullable fields
+                if value == '' and field.null:
+                    value = None
+                values[field.attname] = field.to_python(value) if value is not None else None
+            rows.append(model(**values))
+
+        return model, rows
+
+    def dependency_order(self, rows_by_model):
+        """
+        Order models so every model is inserted after the models it references
+
+        Args: rows_by_model (dict) -- rows to load keyed by model
+
+        Returns: list -- models in insertion order
+        """
+        pending = set(rows_by_model)
+        ordered = []
+
+        while pending:
+            ready = sorted(
+                (
+                    model for model in pending
+                    if not any(
+                        field.related_model in pending and field.related_model is not model
+                        for field in model._meta.concrete_fields
+                        if field.is_relation
+                    )
+                ),
+                key=lambda model: model._meta.label
+            )
+            if not ready:
+                raise CommandError("Circular foreign keys between loaded models")
+
+            ordered += ready
+            pending -= set(ready)
+
+        return ordered
+
+    def create_m2m(self, model, m2m_rows, batch_size):
+        """
+        Bulk create through table rows for many-to-many values from fixtures
+
+        Args:
+            model (Model) -- model the values belong to
+            m2m_rows (list) -- (instance, {field name: [related pks]}) tuples
+            batch_size (int) -- rows per INSERT statement
+        """
+        through_rows = defaultdict(list)
+
+        for instance, m2m_data in m2m_rows:
+            for field_name, related_pks in m2m_data.items():
+                field = model._meta.get_field(field_name)
+                through = field.remote_field.through
+                for related_pk in related_pks:
+                    through_rows[through].append(through(**{
+                        f"{field.m2m_field_name()}_id": instance.pk,
+                        f"{field.m2m_reverse_field_name()}_id": related_pk
+                    }))
+
+        for through, rows in through_rows.items():
+            through.objects.bulk_create(rows, batch_size=batch_size)
+
+    def reset_sequences(self, rows_by_model):
+        """Move primary key sequences past the explicitly inserted ids, as loaddata does"""
+        sequence_sql = connection.ops.sequence_reset_sql(no_style(), list(rows_by_model))
+        if sequence_sql:
+            with connection.cursor() as cursor:
+                for sql in sequence_sql:
+                    cursor.execute(sql)
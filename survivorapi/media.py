@@ -0,0 +1,255 @@
+"""Downsized, content-hashed variants of survivor images"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+from pathlib import Path
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Widths, in pixels, of the roster list, survivor card and detail page images
+VARIANT_SIZES = {
+    'list': 96,
+    'card': 320,
+    'detail': 800,
+}
+VARIANT_FORMATS = {
+    'webp': {'format': 'WEBP', 'quality': 80, 'method': 6},
+    'jpeg': {'format': 'JPEG', 'quality': 80, 'optimize': True, 'progressive': True},
+}
+VARIANT_DIR = 'variants'
+MANIFEST_NAME = 'manifest.json'
+# Seconds a process trusts its copy of the manifest before checking the file again
+MANIFEST_TTL = 5
+
+def media_root() -> Path:
+    return Path(settings.MEDIA_ROOT)
+
+def manifest_path() -> Path:
+    return media_root() / VARIANT_DIR / MANIFEST_NAME
+
+def source_name(img_url):
+    """
+    Name of the original image under MEDIA_ROOT for an `img_url`
+
+    Returns: str -- e.g. "AndyRueda.jpg" for "media/AndyRueda.jpg", or None for external URLs
+    """
+    if not img_url or '://' in img_url:
+        return None
+
+    media_prefix = settings.MEDIA_URL.strip('/') + '/'
+    name = img_url.lstrip('/')
+    if name.startswith(media_prefix):
+        name = name[len(media_prefix):]
+    return name or None
+
+def build_variants(name, force=False):
+    """
+    Write every size and format of one image, named after a hash of its content
+
+    Runs in pool worker processes, so it only touches the filesystem.
+
+    Args:
+        name (str) -- image path relative to MEDIA_ROOT
+        force (bool) -- rewrite variants that already exist
+
+    Returns: tuple -- (name, manifest entry) where the entry maps format to size to media URL
+    """
+    source = media_root() / name
+    content = source.read_bytes()
+    digest = hashlib.sha256(content).hexdigest()[:12]
+    stem = Path(name).with_suffix('').as_posix().replace('/', '-')
+    target_dir = media_root() / VARIANT_DIR
+    target_dir.mkdir(parents=True, exist_ok=True)
+
+    entry = {'hash': digest, 'widths': {}, 'formats': {}}
+
+    with Image.open(source) as original:
+        original = original.convert('RGB')
+
+        for size_name, width in VARIANT_SIZES.items():
+            # Never upscale, small originals keep their own width
+            scaled_width = min(width, original.width)
+            scaled_height = max(1, round(original.height * scaled_width / original.width))
+            scaled = None
+            entry['widths'][size_name] = scaled_width
+
+            for extension, options in VARIANT_FORMATS.items():
+                variant = f"{stem}.{size_name}.{digest}.{extension}"
+                target = target_dir / variant
+
+                if force or not target.exists():
+                    if scaled is None:
+                        scaled = original.resize((scaled_width, scaled_height), Image.LANCZOS)
+                    scaled.save(target, **options)
+
+                url = f"{settings.MEDIA_URL.strip('/')}/{VARIANT_DIR}/{variant}"
+                entry['formats'].setdefault(extension, {})[size_name] = url
+
+    return name, entry
+
+def generate_variants(names, workers=None, force=False):
+    """
+    Build variants for many images in a local process pool and record them in the manifest
+
+    Args:
+        names (list) -- image paths relative to MEDIA_ROOT
+        workers (int) -- pool size, one per CPU by default
+        force (bool) -- rewrite variants that already exist
+
+    Returns: dict -- manifest entries written, keyed by image name
+    """
+    if Image is None:
+        raise RuntimeError("Pillow is required to build image variants")
+
+    if len(names) == 1 or workers == 1:
+        built = dict(build_variants(name, force) for name in names)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            built = dict(pool.map(build_variants, names, [force] * len(names)))
+
+    manifest.update(built)
+    return built
+
+@contextmanager
+def manifest_file_lock():
+    """Hold an exclusive lock shared by every process writing the manifest, where flock is available"""
+    path = manifest_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    with open(path.with_name(f"{MANIFEST_NAME}.lock"), 'a') as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+class Manifest:
+    """Process-local copy of the variant manifest, reloaded when the file changes"""
+
+    def __init__(self):
+        self.entries = {}
+        self.loaded_mtime = None
+        self.checked_at = 0.0
+        self.lock = threading.Lock()
+
+    def get(self, name):
+        now = time.monotonic()
+        if now - self.checked_at > MANIFEST_TTL:
+            self.reload()
+            self.checked_at = now
+        return self.entries.get(name)
+
+    def reload(self):
+        try:
+            mtime = manifest_path().stat().st_mtime
+        except FileNotFoundError:
+            self.entries = {}
+            self.loaded_mtime = None
+            return
+
+        if mtime != self.loaded_mtime:
+            self.entries = json.loads(manifest_path().read_text())
+            self.loaded_mtime = mtime
+
+    def update(self, entries):
+        """
+        Merge entries into the manifest file, written atomically
+
+        The read, merge and rename happen under an exclusive lock on a sidecar
+        file, so processes building variants at the same time, like the
+        `build_image_variants` command and a server's background builder, never
+        drop each other's entries.
+        """
+        with self.lock, manifest_file_lock():
+            path = manifest_path()
+            current = json.loads(path.read_text()) if path.exists() else {}
+            current.update(entries)
+
+            temporary = path.with_name(f"{MANIFEST_NAME}.{os.getpid()}.tmp")
+            temporary.write_text(json.dumps(current, indent=2))
+            temporary.replace(path)
+
+            self.entries = current
+            self.loaded_mtime = path.stat().st_mtime
+            self.checked_at = time.monotonic()
+
+manifest = Manifest()
+
+def img_srcset(img_url):
+    """
+    srcset strings for an image's variants, keyed by format
+
+    Returns: dict -- e.g. {"webp": "media/variants/... 96w, ...", "jpeg": "..."}, or None
+        when no variants were built for the image
+    """
+    entry = manifest.get(source_name(img_url))
+    if entry is None:
+        return None
+
+    return {
+        extension: ', '.join(
+            f"{url} {entry['widths'][size_name]}w"
+            for size_name, url in sorted(urls.items(), key=lambda item: entry['widths'][item[0]])
+        )
+        for extension, urls in entry['formats'].items()
+    }
+
+# Builds variants for survivors saved through the API, the admin or the shell, one at a time,
+# off the request thread. Run `manage.py build_image_variants` for bulk imports instead.
+variant_builder = ThreadPoolExecutor(max_workers=1, thread_name_prefix='image-variants')
+
+def build_and_publish_variants(name):
+    """Build one image's variants and invalidate the catalog responses cached without them"""
+    from survivorapi.views.catalog_cache import bump_catalog_generation
+
+    try:
+        generate_variants([name])
+    except (OSError, ValueError) as ex:
+        logger.warning("Could not build image variants for %s: %s", name, ex)
+        return
+
+    bump_catalog_generation()
+
+def build_variants_in_background(name):
+    """Run `build_and_publish_variants` on the `variant_builder` thread, closing the connection it opens"""
+    try:
+        build_and_publish_variants(name)
+    except Exception:
+        logger.exception("Could not publish image variants for %s", name)
+    finally:
+        connections.close_all()
+
+@receiver(post_save, sender="survivorapi.Survivor")
+def build_survivor_image_variants(sender, instance, raw=False, **kwargs):
+    """Queue a variant build, once the save commits, when a survivor has a local image without any"""
+    name = source_name(instance.img_url)
+    if raw or Image is None or name is None or manifest.get(name) is not None:
+        return
+
+    source = (media_root() / name).resolve()
+    if not source.is_relative_to(media_root().resolve()) or not source.is_file():
+        return
+
+    transaction.on_commit(partial(variant_builder.submit, build_variants_in_background, name))
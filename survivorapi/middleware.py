@@ -0,0 +1,303 @@
+"""Per-route query count, latency, serialization time and response size instrumentation"""
+import atexit
+import bisect
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from survivorapi.authentication import token_cache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REQUEST_METRICS_SETTINGS = {
+    'ENABLED': True,
+    # Add a Server-Timing header with db, serialize, render and total durations to every response
+    'SERVER_TIMING': True,
+    # Most queries a route may run, keyed by method and route name, e.g. {'GET season-log-episode-logs': 8},
+    # or by route name alone for every method
+    'QUERY_BUDGETS': {},
+    # Budget for routes missing from QUERY_BUDGETS, None for no limit
+    'DEFAULT_QUERY_BUDGET': None,
+    # Raise QueryBudgetExceeded instead of logging a warning, for test settings
+    'RAISE_ON_BUDGET': False,
+    # Write each process's histogram to DUMP_DIR for `manage.py dump_request_metrics`, off so
+    # tests and one-off commands leave nothing behind
+    'DUMP': False,
+    'DUMP_DIR': os.path.join(tempfile.gettempdir(), 'survivorapi-metrics'),
+    # Write the histogram to DUMP_DIR after this many requests, and at exit
+    'DUMP_EVERY': 100,
+}
+
+# Touched by `dump_request_metrics --reset`, processes clear their histograms when it is newer
+# than their last dump
+RESET_MARKER = 'reset'
+
+
+# Upper bounds, in milliseconds, of the latency histogram buckets
+LATENCY_BUCKETS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+def request_metrics_settings() -> dict:
+    """Merge the REQUEST_METRICS setting over the defaults"""
+    return {**DEFAULT_REQUEST_METRICS_SETTINGS, **getattr(settings, 'REQUEST_METRICS', {})}
+
+class QueryBudgetExceeded(AssertionError):
+    """A route ran more queries than its configured budget"""
+
+class RouteMetrics:
+    """Thread safe per-route aggregates with a latency histogram"""
+
+    def __init__(self):
+        self.routes = {}
+        self.lock = threading.Lock()
+        self.recorded = 0
+        self.dumped_at = time.time()
+
+    def record(self, route, duration_ms, queries, db_ms, serialize_ms, render_ms, size):
+        with self.lock:
+            stats = self.routes.get(route)
+            if stats is None:
+                stats = self.routes[route] = {
+                    'requests': 0,
+                    'total_ms': 0.0,
+                    'max_ms': 0.0,
+                    'queries': 0,
+                    'max_queries': 0,
+                    'db_ms': 0.0,
+                    'serialize_ms': 0.0,
+                    'render_ms': 0.0,
+                    'bytes': 0,
+                    'max_bytes': 0,
+                    'buckets': [0] * (len(LATENCY_BUCKETS) + 1),
+                }
+
+            stats['requests'] += 1
+            stats['total_ms'] += duration_ms
+            stats['max_ms'] = max(stats['max_ms'], duration_ms)
+            stats['queries'] += queries
+            stats['max_queries'] = max(stats['max_queries'], queries)
+            stats['db_ms'] += db_ms
+            stats['serialize_ms'] += serialize_ms
+            stats['render_ms'] += render_ms
+            stats['bytes'] += size
+            stats['max_bytes'] = max(stats['max_bytes'], size)
+            stats['buckets'][bisect.bisect_left(LATENCY_BUCKETS, duration_ms)] += 1
+
+            self.recorded += 1
+            return self.recorded
+
+    def snapshot(self) -> dict:
+        """Copy of the aggregates, keyed by route"""
+        with self.lock:
+            return {
+                route: {**stats, 'buckets': list(stats['buckets'])}
+                for route, stats in self.routes.items()
+            }
+
+    def clear(self):
+        with self.lock:
+            self.routes.clear()
+            self.recorded = 0
+
+    def dump(self, dump_dir):
+        """
+        Write this process's aggregates, and its token cache counters, to `dump_dir` as JSON
+
+        Aggregates recorded before a `dump_request_metrics --reset` since the
+        last dump are dropped rather than written back.
+        """
+        if not dump_dir:
+            return
+
+        path = Path(dump_dir)
+        path.mkdir(parents=True, exist_ok=True)
+
+        try:
+            reset_at = (path / RESET_MARKER).stat().st_mtime
+        except FileNotFoundError:
+            reset_at = None
+        if reset_at is not None and reset_at > self.dumped_at:
+            self.clear()
+            token_cache.reset_stats()
+        self.dumped_at = time.time()
+
+        target = path / f"{os.getpid()}.json"
+        temporary = path / f"{os.getpid()}.json.tmp"
+        temporary.write_text(json.dumps({
+            'buckets': LATENCY_BUCKETS,
+            'routes': self.snapshot(),
+            'token_cache': token_cache.stats(),
+        }))
+        temporary.replace(target)
+
+route_metrics = RouteMetrics()
+
+@atexit.register
+def dump_route_metrics():
+    config = request_metrics_settings()
+    if config['DUMP'] and route_metrics.recorded:
+        route_metrics.dump(config['DUMP_DIR'])
+
+class RequestTimings:
+    """Queries and time spent per phase of one request"""
+
+    def __init__(self):
+        self.queries = 0
+        self.db_duration = 0.0
+        self.serialize_duration = 0.0
+        self.render_duration = 0.0
+
+# Timings of the request being handled. Context variables follow a request into
+# the threads sync_to_async runs its ORM calls in, unlike per-thread connections.
+current_timings = ContextVar('request_timings', default=None)
+
+def record_query(execute, sql, params, many, context):
+    """Database execute wrapper adding each query to the current request's timings"""
+    timings = current_timings.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.db_duration += time.perf_counter() - start
+        timings.queries += 1
+
+@receiver(connection_created)
+def install_query_recorder(sender, connection, **kwargs):
+    """Wrap every new connection, whichever thread opens it"""
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+@contextmanager
+def serialization_timer():
+    """
+    Add the time spent in the block to the current request's serialization time
+
+    Queries the block runs, such as lazy relation loads, also count as DB time.
+    """
+    timings = current_timings.get()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if timings is not None:
+            timings.serialize_duration += time.perf_counter() - start
+
+def route_name(request):
+    """Name of the resolved route, the URL pattern for unnamed routes"""
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unresolved'
+    return match.view_name if match.url_name else match.route
+
+class RequestMetricsMiddleware:
+    """
+    Record query count, DB, serialization and render time and response size per route
+
+    Works as sync and async middleware, so under ASGI Django never has to adapt
+    it, and the request chain, into a worker thread. Queries are counted by a wrapper on every connection that reads the
+    request's timings from a context variable, so queries the ORM runs in
+    sync_to_async threads count too. Serialization time covers the blocks views
+    wrap in `serialization_timer`, and render time covers template responses,
+    which includes every DRF Response, from the start of rendering to the end.
+    Results go to `route_metrics` keyed by method and route, optionally to a
+    Server-Timing header, and are checked against the configured query budget.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        config = request_metrics_settings()
+        if not config['ENABLED']:
+            return self.get_response(request)
+
+        timings = RequestTimings()
+        token = current_timings.set(timings)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            current_timings.reset(token)
+
+        return self.finish(request, response, timings, time.perf_counter() - start, config)
+
+    async def __acall__(self, request):
+        config = request_metrics_settings()
+        if not config['ENABLED']:
+            return await self.get_response(request)
+
+        timings = RequestTimings()
+        token = current_timings.set(timings)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_timings.reset(token)
+
+        return self.finish(request, response, timings, time.perf_counter() - start, config)
+
+    def finish(self, request, response, timings, duration, config):
+        name = route_name(request)
+        route = f"{request.method} {name}"
+        size = 0 if response.streaming else len(response.content)
+
+        recorded = route_metrics.record(
+            route,
+            duration * 1000,
+            timings.queries,
+            timings.db_duration * 1000,
+            timings.serialize_duration * 1000,
+            timings.render_duration * 1000,
+            size
+        )
+        if config['DUMP'] and config['DUMP_EVERY'] and recorded % config['DUMP_EVERY'] == 0:
+            route_metrics.dump(config['DUMP_DIR'])
+
+        if config['SERVER_TIMING']:
+            response['Server-Timing'] = ', '.join([
+                f'db;dur={timings.db_duration * 1000:.2f};desc="{timings.queries} queries"',
+                f'serialize;dur={timings.serialize_duration * 1000:.2f}',
+                f'render;dur={timings.render_duration * 1000:.2f}',
+                f'total;dur={duration * 1000:.2f}',
+            ])
+
+        budgets = config['QUERY_BUDGETS']
+        budget = budgets.get(route, budgets.get(name, config['DEFAULT_QUERY_BUDGET']))
+        if budget is not None and timings.queries > budget:
+            message = f"{route} ran {timings.queries} queries, over its budget of {budget}"
+            if config['RAISE_ON_BUDGET']:
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+
+        return response
+
+    def process_template_response(self, request, response):
+        timings = current_timings.get()
+        if timings is None:
+            return response
+
+        start = time.perf_counter()
+
+        def finish_render(rendered):
+            timings.render_duration += time.perf_counter() - start
+
+        response.add_post_render_callback(finish_render)
+        return response
@@ -0,0 +1,80 @@
+# Generated by Django 5.2.18 on 2026-10-17 17:21
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+# Points per achievement when the scores table was added, frozen so later
+# changes to the defaults cannot change what this migration writes
+ACHIEVEMENT_POINTS = {
+    'found_advantages': 2,
+    'found_idols': 3,
+    'played_idols': 3,
+    'won_team_immunities': 1,
+    'won_individual_immunities': 3,
+    'won_rewards': 1,
+}
+
+
+def backfill_survivor_scores(apps, schema_editor):
+    """Score every existing survivor log from the raw action tables"""
+    SurvivorLog = apps.get_model('survivorapi', 'SurvivorLog')
+    SurvivorScore = apps.get_model('survivorapi', 'SurvivorScore')
+
+    stats = SurvivorLog.objects.order_by().annotate(
+        found_advantages_count=Count('found_advantages', distinct=True),
+        found_idols_count=Count('found_idols', distinct=True),
+        played_idols_count=Count('played_idols', distinct=True),
+        won_team_immunities_count=Count(
+            'won_immunities',
+            filter=Q(won_immunities__is_individual=False),
+            distinct=True
+        ),
+        won_individual_immunities_count=Count(
+            'won_immunities',
+            filter=Q(won_immunities__is_individual=True),
+            distinct=True
+        ),
+        won_rewards_count=Count('won_rewards', distinct=True),
+    ).values('id', 'season_log_id', *[f'{achievement}_count' for achievement in ACHIEVEMENT_POINTS])
+
+    SurvivorScore.objects.bulk_create(
+        [
+            SurvivorScore(
+                survivor_log_id=row['id'],
+                season_log_id=row['season_log_id'],
+                total_points=sum(
+                    row[f'{achievement}_count'] * points for achievement, points in ACHIEVEMENT_POINTS.items()
+                ),
+                **{f'{achievement}_count': row[f'{achievement}_count'] for achievement in ACHIEVEMENT_POINTS}
+            )
+            for row in stats
+        ],
+        batch_size=500
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('survivorapi', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SurvivorScore',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('found_advantages_count', models.IntegerField(default=0)),
+                ('found_idols_count', models.IntegerField(default=0)),
+                ('played_idols_count', models.IntegerField(default=0)),
+                ('won_team_immunities_count', models.IntegerField(default=0)),
+                ('won_individual_immunities_count', models.IntegerField(default=0)),
+                ('won_rewards_count', models.IntegerField(default=0)),
+                ('total_points', models.IntegerField(default=0)),
+                ('season_log', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='survivor_scores', to='survivorapi.seasonlog')),
+                ('survivor_log', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='score', to='survivorapi.survivorlog')),
+            ],
+        ),
+        migrations.RunPython(backfill_survivor_scores, migrations.RunPython.noop),
+    ]
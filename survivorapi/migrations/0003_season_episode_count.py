@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-17 17:22
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_episode_counts(apps, schema_editor):
+    Season = apps.get_model('survivorapi', 'Season')
+    Episode = apps.get_model('survivorapi', 'Episode')
+
+    episode_counts = Episode.objects.filter(
+        season=OuterRef('pk')
+    ).order_by().values('season').annotate(count=Count('pk')).values('count')
+
+    Season.objects.update(episode_count=Coalesce(Subquery(episode_counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('survivorapi', '0002_survivorscore'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='season',
+            name='episode_count',
+            field=models.IntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_episode_counts, migrations.RunPython.noop),
+    ]
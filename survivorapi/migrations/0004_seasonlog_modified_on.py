@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 17:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('survivorapi', '0003_season_episode_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='seasonlog',
+            name='modified_on',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
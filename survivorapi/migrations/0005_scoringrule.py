@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-17 17:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('survivorapi', '0004_seasonlog_modified_on'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScoringRule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('league', models.CharField(default='default', max_length=100)),
+                ('achievement', models.CharField(choices=[('found_advantages', 'found advantages'), ('found_idols', 'found idols'), ('played_idols', 'played idols'), ('won_team_immunities', 'won team immunities'), ('won_individual_immunities', 'won individual immunities'), ('won_rewards', 'won rewards')], max_length=50)),
+                ('points', models.IntegerField()),
+            ],
+            options={
+                'unique_together': {('league', 'achievement')},
+            },
+        ),
+    ]
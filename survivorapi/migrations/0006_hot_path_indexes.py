@@ -0,0 +1,82 @@
+# Generated by Django 5.2.18 on 2026-10-17 17:28
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def remove_duplicates(apps, schema_editor):
+    """
+    Clear rows the new unique constraints would reject
+
+    Duplicate season logs for a user and season come from double submitted
+    creates, so the one with the most logged episodes is kept, the oldest on
+    a tie, and the others are deleted with their logs. Of several winner
+    picks in a season log only the first survivor log keeps the flag.
+    """
+    SeasonLog = apps.get_model('survivorapi', 'SeasonLog')
+    SurvivorLog = apps.get_model('survivorapi', 'SurvivorLog')
+
+    duplicated = SeasonLog.objects.values('user_id', 'season_id').annotate(
+        count=Count('id')
+    ).filter(count__gt=1)
+    for row in duplicated:
+        season_log_ids = list(
+            SeasonLog.objects.filter(
+                user_id=row['user_id'],
+                season_id=row['season_id']
+            ).annotate(
+                logged_episodes=Count('episodelog')
+            ).order_by('-logged_episodes', 'id').values_list('id', flat=True)
+        )
+        SeasonLog.objects.filter(id__in=season_log_ids[1:]).delete()
+
+    duplicated = SurvivorLog.objects.filter(is_user_winner_pick=True).values('season_log_id').annotate(
+        count=Count('id'),
+        first_id=Min('id')
+    ).filter(count__gt=1)
+    for row in duplicated:
+        SurvivorLog.objects.filter(
+            season_log_id=row['season_log_id'],
+            is_user_winner_pick=True
+        ).exclude(id=row['first_id']).update(is_user_winner_pick=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('survivorapi', '0005_scoringrule'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='episodelog',
+            index=models.Index(fields=['season_log', 'user'], name='episodelog_season_user_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='seasonlog',
+            index=models.Index(fields=['user', 'status', 'created_on'], name='seasonlog_user_status_crt_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='seasonlog',
+            index=models.Index(fields=['user', 'status', 'completed_on'], name='seasonlog_user_status_cmp_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='survivorlog',
+            index=models.Index(fields=['season_log', 'user'], name='survivorlog_season_user_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='survivorlog',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['season_log'], name='survivorlog_season_active_idx'),
+        ),
+        migrations.RunPython(remove_duplicates, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='seasonlog',
+            constraint=models.UniqueConstraint(fields=('user', 'season'), name='unique_season_log_per_user'),
+        ),
+        migrations.AddConstraint(
+            model_name='survivorlog',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_user_winner_pick', True)), fields=('season_log',), name='unique_winner_pick_per_season_log'),
+        ),
+    ]
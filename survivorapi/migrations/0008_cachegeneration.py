@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:02
+
+import django.utils.timezone
+import time
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('survivorapi', '0007_episodelogsubmission'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CacheGeneration',
+            fields=[
+                ('name', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('generation', models.BigIntegerField(default=time.time_ns)),
+                ('modified_on', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+    ]
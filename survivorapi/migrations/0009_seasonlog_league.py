@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('survivorapi', '0008_cachegeneration'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='seasonlog',
+            name='league',
+            field=models.CharField(default='default', max_length=100),
+        ),
+    ]
@@ -1,13 +1,17 @@
+from .cache_generation import CacheGeneration
 from .favorite_survivor import FavoriteSurvivor
+from .scoring_rule import ScoringRule
 from .season import Season
 from .survivor_log import SurvivorLog
 from .survivor_note import SurvivorNote
+from .survivor_score import SurvivorScore
 from .survivor_tribe import SurvivorTribe
 from .survivor import Survivor
 from .tribe import Tribe
 from .season_log import SeasonLog
 from .episode import Episode
 from .episode_log import EpisodeLog
+from .episode_log_submission import EpisodeLogSubmission
 from .found_advantage import FoundAdvantage
 from .found_idol import FoundIdol
 from .played_idol import PlayedIdol
@@ -18,7 +22,9 @@ __all__ = [
     'FoundAdvantage',
     'FoundIdol',
     'PlayedIdol',
+    'ScoringRule',
     'WonImmunity',
     'WonReward',
-    'SurvivorLog'
+    'SurvivorLog',
+    'SurvivorScore'
 ]
\ No newline at end of file
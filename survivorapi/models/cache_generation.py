@@ -0,0 +1,42 @@
+import time
+from django.db import IntegrityError, models, transaction
+from django.utils import timezone
+
+class CacheGenerationQuerySet(models.QuerySet):
+    def current(self, name) -> dict:
+        """
+        Get the current generation of a named cache, starting one if there is none
+
+        Returns: dict -- `generation` id and the `modified_on` time it was started at
+        """
+        state = self.filter(name=name).values('generation', 'modified_on').first()
+        if state is None:
+            try:
+                with transaction.atomic():
+                    generation = self.create(name=name)
+            except IntegrityError:
+                # Another process started it first
+                generation = self.get(name=name)
+            state = {'generation': generation.generation, 'modified_on': generation.modified_on}
+        return state
+
+    def bump(self, name):
+        """Start a new generation of a named cache, in every process that reads it"""
+        updated = self.filter(name=name).update(generation=time.time_ns(), modified_on=timezone.now())
+        if not updated:
+            self.current(name)
+
+class CacheGeneration(models.Model):
+    """
+    Generation counter of an in-process cache, shared by every server process
+
+    Processes key their cached entries by the generation they read here, so a
+    bump in one process makes the entries of every other process stale.
+    Generations are timestamps rather than a counter, so a bump that is rolled
+    back and bumped again never reuses a generation entries were cached under.
+    """
+    name = models.CharField(max_length=50, primary_key=True)
+    generation = models.BigIntegerField(default=time.time_ns)
+    modified_on = models.DateTimeField(default=timezone.now)
+
+    objects = CacheGenerationQuerySet.as_manager()
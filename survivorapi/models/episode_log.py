@@ -10,3 +10,6 @@ class EpisodeLog(models.Model):
     class Meta:
         ordering = ["episode__episode_number"]
         unique_together = ['user', 'episode']  # Prevent duplicate logs for same episode
+        indexes = [
+            models.Index(fields=['season_log', 'user'], name='episodelog_season_user_idx'),
+        ]
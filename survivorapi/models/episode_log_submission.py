@@ -0,0 +1,34 @@
+from django.db import models
+from django.contrib.auth.models import User
+
+class EpisodeLogSubmission(models.Model):
+    """An episode log POST waiting in the ingestion queue, see survivorapi/ingestion.py"""
+    PENDING = 'pending'
+    PROCESSING = 'processing'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (PROCESSING, 'Processing'),
+        (DONE, 'Done'),
+        (FAILED, 'Failed'),
+    ]
+
+    season_log = models.ForeignKey("SeasonLog", on_delete=models.CASCADE, related_name="episode_log_submissions")
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    episode_number = models.IntegerField()
+    payload = models.JSONField()
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=PENDING)
+    error = models.TextField(blank=True, default='')
+    episode_log = models.ForeignKey("EpisodeLog", on_delete=models.SET_NULL, null=True, blank=True, related_name="+")
+    claimed_by = models.CharField(max_length=100, blank=True, default='')
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["id"]
+        indexes = [
+            models.Index(fields=['status', 'id'], name='submission_status_idx'),
+            models.Index(fields=['season_log', 'status'], name='submission_season_status_idx'),
+        ]
@@ -1,4 +1,6 @@
 from django.db import models
+from .scoring_rule import get_scoring_rules
+from .survivor_log import survivor_log_league
 
 class FoundAdvantage(models.Model):
     """Model for tracking advantages found by survivors"""
@@ -10,9 +12,9 @@ class FoundAdvantage(models.Model):
         """
         Points value for finding an advantage
 
-        Returns: int -- Number of points (2) for finding an advantage
+        Returns: int -- Number of points for finding an advantage under its season log's league rules
         """
-        return 2
+        return get_scoring_rules(self.survivor_log.league)['found_advantages']
     
     @classmethod
     def get_stats_for_survivor(cls, survivor_log_id: int) -> dict:
@@ -26,7 +28,7 @@ class FoundAdvantage(models.Model):
         
         return {
             'count': count,
-            'points': count * 2
+            'points': count * get_scoring_rules(survivor_log_league(survivor_log_id))['found_advantages']
         }
     
     class Meta:
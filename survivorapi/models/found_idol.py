@@ -1,4 +1,6 @@
 from django.db import models
+from .scoring_rule import get_scoring_rules
+from .survivor_log import survivor_log_league
 
 
 class FoundIdol(models.Model):
@@ -10,9 +12,9 @@ class FoundIdol(models.Model):
         """
         Points value for finding an idol
         
-        Returns: int -- Number of points (3) for finding an idol
+        Returns: int -- Number of points for finding an idol under its season log's league rules
         """
-        return 3
+        return get_scoring_rules(self.survivor_log.league)['found_idols']
     
     @classmethod
     def get_stats_for_survivor(cls, survivor_log_id: int) -> dict:
@@ -26,7 +28,7 @@ class FoundIdol(models.Model):
         count = cls.objects.filter(survivor_log_id=survivor_log_id).count()
         return {
             'count': count,
-            'points': count * 3
+            'points': count * get_scoring_rules(survivor_log_league(survivor_log_id))['found_idols']
         }
     
     class Meta:
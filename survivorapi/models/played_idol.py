@@ -1,4 +1,6 @@
 from django.db import models
+from .scoring_rule import get_scoring_rules
+from .survivor_log import survivor_log_league
 
 class PlayedIdol(models.Model):
     episode_log = models.ForeignKey('EpisodeLog', on_delete=models.CASCADE, related_name='played_idols')
@@ -9,9 +11,9 @@ class PlayedIdol(models.Model):
         """
         Points value for playing an idol
         
-        Returns: int -- Number of points (2) for playing an idol
+        Returns: int -- Number of points for playing an idol under its season log's league rules
         """
-        return 2
+        return get_scoring_rules(self.survivor_log.league)['played_idols']
     
     @classmethod
     def get_stats_for_survivor(cls, survivor_log_id: int) -> dict:
@@ -25,5 +27,5 @@ class PlayedIdol(models.Model):
         count = cls.objects.filter(survivor_log_id=survivor_log_id).count()
         return {
             'count': count,
-            'points': count * 3
+            'points': count * get_scoring_rules(survivor_log_league(survivor_log_id))['played_idols']
         }
@@ -0,0 +1,90 @@
+import time
+from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .cache_generation import CacheGeneration
+
+DEFAULT_LEAGUE = 'default'
+
+# Points per achievement used when a league has no rule for it
+DEFAULT_POINTS = {
+    'found_advantages': 2,
+    'found_idols': 3,
+    'played_idols': 3,
+    'won_team_immunities': 1,
+    'won_individual_immunities': 3,
+    'won_rewards': 1,
+}
+
+GENERATION_NAME = 'scoring_rules'
+
+# Seconds a process trusts its cached rules before checking whether another process changed them
+RECHECK_INTERVAL = 5
+
+# Scoring rules per league, loaded on first use and cleared whenever a rule changes
+_scoring_rules_cache = {}
+_scoring_rules_state = {'generation': None, 'checked_at': None}
+
+def check_scoring_rules(force=False):
+    """
+    Drop the cached rules if a rule was changed since they were loaded, in any process
+
+    The shared generation is read at most once per RECHECK_INTERVAL, or on
+    every call with `force`, for writes that store totals.
+
+    Args: force (bool) -- check the generation even if it was checked recently
+    """
+    now = time.monotonic()
+    checked_at = _scoring_rules_state['checked_at']
+    if not force and checked_at is not None and now - checked_at < RECHECK_INTERVAL:
+        return
+
+    generation = CacheGeneration.objects.current(GENERATION_NAME)['generation']
+    if generation != _scoring_rules_state['generation']:
+        _scoring_rules_cache.clear()
+        _scoring_rules_state['generation'] = generation
+    _scoring_rules_state['checked_at'] = now
+
+def get_scoring_rules(league=DEFAULT_LEAGUE) -> dict:
+    """
+    Get the points awarded per achievement for a league
+
+    Args: league (str) -- league whose rules to use
+
+    Returns: dict -- points keyed by achievement, with defaults for achievements
+        the league has no rule for
+    """
+    check_scoring_rules()
+
+    if league not in _scoring_rules_cache:
+        rules = dict(DEFAULT_POINTS)
+        rules.update(
+            ScoringRule.objects.filter(league=league).values_list('achievement', 'points')
+        )
+        _scoring_rules_cache[league] = rules
+
+    return _scoring_rules_cache[league]
+
+class ScoringRule(models.Model):
+    """Points a league awards for one achievement type"""
+    league = models.CharField(max_length=100, default=DEFAULT_LEAGUE)
+    achievement = models.CharField(
+        max_length=50,
+        choices=[(achievement, achievement.replace('_', ' ')) for achievement in DEFAULT_POINTS]
+    )
+    points = models.IntegerField()
+
+    class Meta:
+        unique_together = ['league', 'achievement']
+
+@receiver(post_save, sender=ScoringRule)
+@receiver(post_delete, sender=ScoringRule)
+def invalidate_scoring_rules(sender, instance, **kwargs):
+    """Drop cached rules so the next score calculation reloads them, in every process"""
+    _scoring_rules_cache.clear()
+    CacheGeneration.objects.bump(GENERATION_NAME)
+
+    # Stored totals are kept in the default league's points
+    if instance.league == DEFAULT_LEAGUE:
+        from .survivor_score import SurvivorScore
+        SurvivorScore.objects.reprice()
@@ -1,4 +1,33 @@
 from django.db import models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+class SeasonQuerySet(models.QuerySet):
+    def with_total_episodes(self):
+        """
+        Annotate each season with its episode count so listing seasons is a single query
+
+        Returns: QuerySet -- seasons annotated with `total_episodes_count`
+        """
+        return self.annotate(total_episodes_count=Count('episodes'))
+
+    def refresh_episode_counts(self):
+        """
+        Recalculate the stored episode counter for every season in the queryset
+
+        Needed after writes that skip model signals, such as Episode bulk_create.
+
+        Returns: int -- number of seasons updated
+        """
+        from .episode import Episode
+
+        episode_counts = Episode.objects.filter(
+            season=OuterRef('pk')
+        ).order_by().values('season').annotate(count=Count('pk')).values('count')
+
+        return self.update(episode_count=Coalesce(Subquery(episode_counts), 0))
 
 class Season(models.Model):
     season_number = models.IntegerField()
@@ -7,7 +36,21 @@ class Season(models.Model):
     start_date = models.DateField()
     end_date = models.DateField(null=True, blank=True)
     location = models.CharField(max_length=100)
+    # Stored counter kept in sync by Episode signals, null until first counted
+    episode_count = models.IntegerField(null=True, blank=True, editable=False)
+
+    objects = SeasonQuerySet.as_manager()
 
     @property
     def total_episodes(self):
-        return self.episodes.count()
\ No newline at end of file
+        if hasattr(self, 'total_episodes_count'):
+            return self.total_episodes_count
+        if self.episode_count is not None:
+            return self.episode_count
+        return self.episodes.count()
+
+@receiver(post_save, sender="survivorapi.Episode")
+@receiver(post_delete, sender="survivorapi.Episode")
+def refresh_season_episode_count(sender, instance, **kwargs):
+    """Keep the season's stored episode counter in sync as episodes change"""
+    Season.objects.filter(pk=instance.season_id).refresh_episode_counts()
@@ -1,10 +1,94 @@
 from django.db import models
 from django.contrib.auth.models import User
+from django.db.models import Exists, F, OuterRef, Q, Sum, Value, Window
+from django.db.models.functions import Coalesce, Rank
 from django.utils import timezone
+from .scoring_rule import DEFAULT_LEAGUE, get_scoring_rules
+
+class SeasonLogQuerySet(models.QuerySet):
+    def with_standing(self, league=DEFAULT_LEAGUE):
+        """
+        Annotate each season log with what the season leaderboard ranks it on
+
+        Points come from the stored survivor scores, so this is one grouped
+        query and never loops over `achievement_stats`. Stored totals use the
+        default league's rules, other leagues weigh the stored counts with theirs.
+
+        Args: league (str) -- league whose scoring rules to apply
+
+        Returns: QuerySet -- season logs annotated with `total_points` and `winner_pick_correct`
+        """
+        from .survivor_log import SurvivorLog
+
+        correct_winner_pick = SurvivorLog.objects.filter(
+            season_log=OuterRef('pk'),
+            is_user_winner_pick=True,
+            is_season_winner=True
+        )
+
+        if league == DEFAULT_LEAGUE:
+            points = F('survivor_scores__total_points')
+        else:
+            points = sum(
+                F(f'survivor_scores__{achievement}_count') * Value(achievement_points)
+                for achievement, achievement_points in get_scoring_rules(league).items()
+            )
+
+        return self.annotate(
+            total_points=Coalesce(Sum(points), 0),
+            winner_pick_correct=Exists(correct_winner_pick)
+        )
+
+    def ranked(self, league=DEFAULT_LEAGUE):
+        """
+        Rank each season log among the other logs of its season
+
+        Logs whose winner pick is the season winner rank first, then by points.
+
+        Args: league (str) -- league whose scoring rules to apply
+
+        Returns: QuerySet -- season logs annotated like `with_standing` plus `rank`, best first
+        """
+        return self.with_standing(league).annotate(
+            rank=Window(
+                Rank(),
+                partition_by=F('season_id'),
+                order_by=[F('winner_pick_correct').desc(), F('total_points').desc()]
+            )
+        ).order_by('season_id', 'rank', 'id')
+
+    def rank_of(self, winner_pick_correct, total_points, league=DEFAULT_LEAGUE):
+        """
+        Rank a standing would have among the season logs in this queryset
+
+        Filtering `ranked()` would apply before the window function, so a single
+        log's rank is counted from the logs that beat it instead.
+
+        Returns: int -- 1 plus the number of logs ranked strictly ahead
+        """
+        ahead = Q(winner_pick_correct=True, total_points__gt=total_points)
+        if not winner_pick_correct:
+            ahead = Q(winner_pick_correct=True) | Q(total_points__gt=total_points)
+
+        return self.with_standing(league).filter(ahead).count() + 1
 
 class SeasonLog(models.Model):
     user = models.ForeignKey(User, models.CASCADE)
     season = models.ForeignKey("Season", models.CASCADE)
     status = models.CharField(max_length=50)
+    # League whose scoring rules the log is scored and ranked by
+    league = models.CharField(max_length=100, default=DEFAULT_LEAGUE)
     created_on = models.DateTimeField(default=timezone.now)
-    completed_on = models.DateTimeField(null=True, blank=True)
\ No newline at end of file
+    completed_on = models.DateTimeField(null=True, blank=True)
+    modified_on = models.DateTimeField(auto_now=True)
+
+    objects = SeasonLogQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'status', 'created_on'], name='seasonlog_user_status_crt_idx'),
+            models.Index(fields=['user', 'status', 'completed_on'], name='seasonlog_user_status_cmp_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'season'], name='unique_season_log_per_user'),
+        ]
@@ -1,5 +1,90 @@
 from django.db import models
+from django.db.models import Count, F, Q, Value
 from django.contrib.auth.models import User
+from .scoring_rule import DEFAULT_LEAGUE, DEFAULT_POINTS, get_scoring_rules
+
+class SurvivorLogQuerySet(models.QuerySet):
+    def with_achievement_stats(self, league=DEFAULT_LEAGUE):
+        """
+        Annotate each survivor log with a count per achievement type and its total points
+
+        All counts are computed in a single aggregated query, and the league's
+        scoring rules are applied in the database so results can be ordered by
+        `total_points`.
+
+        Args: league (str) -- league whose scoring rules to apply
+
+        Returns: QuerySet -- survivor logs annotated with `<achievement>_count`
+            and `total_points`
+        """
+        rules = get_scoring_rules(league)
+
+        return self.annotate(
+            found_advantages_count=Count('found_advantages', distinct=True),
+            found_idols_count=Count('found_idols', distinct=True),
+            played_idols_count=Count('played_idols', distinct=True),
+            won_team_immunities_count=Count(
+                'won_immunities',
+                filter=Q(won_immunities__is_individual=False),
+                distinct=True
+            ),
+            won_individual_immunities_count=Count(
+                'won_immunities',
+                filter=Q(won_immunities__is_individual=True),
+                distinct=True
+            ),
+            won_rewards_count=Count('won_rewards', distinct=True),
+        ).annotate(
+            total_points=sum(
+                F(f'{achievement}_count') * Value(points)
+                for achievement, points in rules.items()
+            )
+        )
+
+    def achievement_stats(self, league=DEFAULT_LEAGUE) -> dict:
+        """
+        Calculate achievement statistics for every survivor log in the queryset
+
+        Args: league (str) -- league whose scoring rules to apply
+
+        Returns: dict -- achievement stats keyed by survivor log id
+        """
+        counts = self.order_by().with_achievement_stats(league).values(
+            'id', *[f'{achievement}_count' for achievement in DEFAULT_POINTS]
+        )
+
+        return {row['id']: build_achievement_stats(row, league) for row in counts}
+
+def build_achievement_stats(counts, league=DEFAULT_LEAGUE) -> dict:
+    """
+    Build the achievement stats payload from annotated counts
+
+    Args:
+        counts (dict) -- mapping of `<achievement>_count` to its count
+        league (str) -- league whose scoring rules to apply
+
+    Returns: dict -- total points plus points and count per achievement type
+    """
+    stats = {'total_points': 0}
+
+    for achievement, points in get_scoring_rules(league).items():
+        count = counts[f'{achievement}_count']
+        stats[achievement] = {
+            'points': count * points,
+            'count': count
+        }
+        stats['total_points'] += count * points
+
+    return stats
+
+def survivor_log_league(survivor_log_id) -> str:
+    """
+    Get the league whose scoring rules apply to a survivor log
+
+    Returns: str -- league of the survivor log's season log
+    """
+    league = SurvivorLog.objects.filter(pk=survivor_log_id).values_list('season_log__league', flat=True).first()
+    return league or DEFAULT_LEAGUE
 
 class SurvivorLog(models.Model):
     survivor = models.ForeignKey("Survivor", on_delete=models.CASCADE)
@@ -11,10 +96,38 @@ class SurvivorLog(models.Model):
     is_user_winner_pick = models.BooleanField(default=False)
     is_season_winner = models.BooleanField(default=False)
 
+    objects = SurvivorLogQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['season_log', 'user'], name='survivorlog_season_user_idx'),
+            # Partial, since Django filters booleans on the bare column, which SQLite
+            # cannot match against an (season_log, is_active) index
+            models.Index(fields=['season_log'], condition=Q(is_active=True), name='survivorlog_season_active_idx'),
+        ]
+        constraints = [
+            # At most one winner pick per season log, also serving winner pick lookups
+            models.UniqueConstraint(
+                fields=['season_log'],
+                condition=Q(is_user_winner_pick=True),
+                name='unique_winner_pick_per_season_log'
+            ),
+        ]
+
+    @property
+    def league(self):
+        """League whose scoring rules apply, the season log's"""
+        if self.season_log_id is None:
+            return DEFAULT_LEAGUE
+        return self.season_log.league
+
     @property
     def achievement_stats(self):
         """
-        Calculate achievement statistics for this survivor
+        Calculate achievement statistics for this survivor under its league's rules
+
+        Uses the counts from `SurvivorLog.objects.with_achievement_stats()` when
+        this instance was loaded with them, otherwise runs one aggregated query.
 
         Returns:
             dict: Stats for each achievement type including:
@@ -26,51 +139,8 @@ class SurvivorLog(models.Model):
                 - won_individual_immunities: Points and count for individual immunity wins
                 - won_rewards: Points and count for reward wins
         """
-        from .found_advantage import FoundAdvantage
-        from .found_idol import FoundIdol
-        from .played_idol import PlayedIdol
-        from .won_immunity import WonImmunity
-        from .won_reward import WonReward
-        
-        advantage_stats = FoundAdvantage.get_stats_for_survivor(self.id)
-        idol_stats = FoundIdol.get_stats_for_survivor(self.id)
-        played_idol_stats = PlayedIdol.get_stats_for_survivor(self.id)
-        immunity_stats = WonImmunity.get_stats_for_survivor(self.id)
-        reward_stats = WonReward.get_stats_for_survivor(self.id)
-
-        total_points = (
-            advantage_stats['points'] +
-            idol_stats['points'] +
-            played_idol_stats['points'] +
-            immunity_stats['individual']['points'] +
-            immunity_stats['team']['points'] +
-            reward_stats['points']
-        )
+        league = self.league
+        if hasattr(self, 'found_advantages_count'):
+            return build_achievement_stats(self.__dict__, league)
 
-        return {
-            'total_points': total_points,
-            'found_advantages': {
-                'points': advantage_stats['points'],
-                'count': advantage_stats['count']
-            },
-            'found_idols': {
-                "points": idol_stats['points'],
-                "count": idol_stats['count']
-            },
-            'played_idols': {
-                "points": played_idol_stats['points'],
-                "count": played_idol_stats['count']
-            },
-            'won_team_immunities': {
-                "points": immunity_stats['team']['points'],
-                "count": immunity_stats['team']['count']
-            },
-            'won_individual_immunities': {
-                "points": immunity_stats['individual']['points'],
-                "count": immunity_stats['individual']['count']
-            },
-            'won_rewards': {
-                "points": reward_stats['points'],
-                "count": reward_stats['count']
-            }
-        }
\ No newline at end of file
+        return SurvivorLog.objects.filter(pk=self.pk).achievement_stats(league)[self.pk]
@@ -0,0 +1,167 @@
+from collections import defaultdict
+from django.db import models
+from django.db.models import F, Value
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from .scoring_rule import DEFAULT_POINTS, check_scoring_rules, get_scoring_rules
+from .survivor_log import SurvivorLog, build_achievement_stats
+
+COUNT_FIELDS = [f'{achievement}_count' for achievement in DEFAULT_POINTS]
+
+class SurvivorScoreQuerySet(models.QuerySet):
+    def increment(self, found_advantages=(), found_idols=(), played_idols=(), won_immunities=(), won_rewards=()):
+        """
+        Add newly created action rows to the scores of their survivor logs
+
+        Meant to run inside the transaction that bulk creates the action rows,
+        so the summary never drifts from the raw tables. Survivor logs that
+        have no score yet are scored from the raw tables instead.
+
+        Args: found_advantages, found_idols, played_idols, won_immunities,
+            won_rewards (list) -- action model instances that were just created
+        """
+        deltas = defaultdict(lambda: dict.fromkeys(COUNT_FIELDS, 0))
+        season_log_ids = {}
+
+        actions = [
+            ('found_advantages_count', found_advantages),
+            ('found_idols_count', found_idols),
+            ('played_idols_count', played_idols),
+            ('won_rewards_count', won_rewards),
+        ]
+        actions += [
+            ('won_individual_immunities_count', [wi for wi in won_immunities if wi.is_individual]),
+            ('won_team_immunities_count', [wi for wi in won_immunities if not wi.is_individual]),
+        ]
+
+        for field, rows in actions:
+            for row in rows:
+                deltas[row.survivor_log_id][field] += 1
+                season_log_ids[row.survivor_log_id] = row.survivor_log.season_log_id
+
+        if not deltas:
+            return
+
+        scores = {
+            score.survivor_log_id: score
+            for score in self.select_for_update().filter(survivor_log_id__in=deltas)
+        }
+        # Once the rows are locked, a rule change and its reprice are committed or still
+        # to come, so totals written with fresh rules are never left behind
+        check_scoring_rules(force=True)
+
+        for survivor_log_id, delta in deltas.items():
+            score = scores.get(survivor_log_id)
+            if score is None:
+                continue
+
+            for field, count in delta.items():
+                setattr(score, field, getattr(score, field) + count)
+            score.total_points = build_achievement_stats(score.__dict__)['total_points']
+
+        # A survivor log without a score may have actions from before it was scored,
+        # so count its raw rows, which already include the ones just created
+        missing = [survivor_log_id for survivor_log_id in deltas if survivor_log_id not in scores]
+        new_scores = []
+        if missing:
+            stats = SurvivorLog.objects.filter(id__in=missing).order_by().with_achievement_stats().values(
+                'id', *COUNT_FIELDS
+            )
+            for row in stats:
+                score = SurvivorScore(
+                    survivor_log_id=row['id'],
+                    season_log_id=season_log_ids[row['id']],
+                    **{field: row[field] for field in COUNT_FIELDS}
+                )
+                score.total_points = build_achievement_stats(row)['total_points']
+                new_scores.append(score)
+
+        if new_scores:
+            self.bulk_create(new_scores)
+        if scores:
+            self.bulk_update(scores.values(), COUNT_FIELDS + ['total_points'])
+
+    def refresh(self, survivor_logs):
+        """
+        Recalculate existing scores for the given survivor logs from the raw action tables
+
+        Args: survivor_logs (QuerySet) -- survivor logs whose scores should be corrected
+        """
+        stats = survivor_logs.order_by().with_achievement_stats().values('id', *COUNT_FIELDS)
+        counts = {row['id']: row for row in stats}
+
+        scores = list(self.filter(survivor_log_id__in=counts))
+        for score in scores:
+            for field in COUNT_FIELDS:
+                setattr(score, field, counts[score.survivor_log_id][field])
+            score.total_points = build_achievement_stats(score.__dict__)['total_points']
+
+        if scores:
+            self.bulk_update(scores, COUNT_FIELDS + ['total_points'])
+
+    def reprice(self):
+        """
+        Recalculate every stored total from its counts with the current default league rules
+
+        Returns: int -- number of scores updated
+        """
+        return self.update(
+            total_points=sum(
+                F(f'{achievement}_count') * Value(points)
+                for achievement, points in get_scoring_rules().items()
+            )
+        )
+
+    def rebuild(self):
+        """
+        Replace every score with one recalculated from the raw action tables
+
+        Returns: int -- number of scores written
+        """
+        stats = SurvivorLog.objects.order_by().with_achievement_stats().values(
+            'id', 'season_log_id', *COUNT_FIELDS
+        )
+        scores = []
+
+        for row in stats:
+            score = SurvivorScore(
+                survivor_log_id=row['id'],
+                season_log_id=row['season_log_id'],
+                **{field: row[field] for field in COUNT_FIELDS}
+            )
+            score.total_points = build_achievement_stats(row)['total_points']
+            scores.append(score)
+
+        self.all().delete()
+        self.bulk_create(scores, batch_size=500)
+        return len(scores)
+
+class SurvivorScore(models.Model):
+    """Denormalized achievement counts and points for a survivor log"""
+    survivor_log = models.OneToOneField("SurvivorLog", on_delete=models.CASCADE, related_name="score")
+    season_log = models.ForeignKey("SeasonLog", on_delete=models.CASCADE, null=True, related_name="survivor_scores")
+    found_advantages_count = models.IntegerField(default=0)
+    found_idols_count = models.IntegerField(default=0)
+    played_idols_count = models.IntegerField(default=0)
+    won_team_immunities_count = models.IntegerField(default=0)
+    won_individual_immunities_count = models.IntegerField(default=0)
+    won_rewards_count = models.IntegerField(default=0)
+    total_points = models.IntegerField(default=0)
+
+    objects = SurvivorScoreQuerySet.as_manager()
+
+    @property
+    def achievement_stats(self):
+        """
+        Achievement statistics for this survivor log, read from the summary row
+
+        Returns: dict -- same shape as SurvivorLog.achievement_stats
+        """
+        return build_achievement_stats(self.__dict__)
+
+@receiver(post_delete, sender="survivorapi.EpisodeLog")
+def refresh_scores_after_episode_log_delete(sender, instance, **kwargs):
+    """Correct the season log's scores once an episode log and its actions are deleted"""
+    SurvivorScore.objects.refresh(
+        SurvivorLog.objects.filter(season_log_id=instance.season_log_id)
+    )
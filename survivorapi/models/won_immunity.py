@@ -1,4 +1,6 @@
 from django.db import models
+from .scoring_rule import get_scoring_rules
+from .survivor_log import survivor_log_league
 
 class WonImmunity(models.Model):
     """Model for tracking immunity wins by survivors"""
@@ -12,9 +14,10 @@ class WonImmunity(models.Model):
         """
         Points value for winning immunity
         
-        Returns: int -- Number of points (3 for individual, 1 for team)
+        Returns: int -- Number of points for individual or team immunity under its season log's league rules
         """
-        return 3 if self.is_individual else 1
+        rules = get_scoring_rules(self.survivor_log.league)
+        return rules['won_individual_immunities'] if self.is_individual else rules['won_team_immunities']
     
     @classmethod
     def get_stats_for_survivor(cls, survivor_log_id: int) -> dict:
@@ -37,14 +40,16 @@ class WonImmunity(models.Model):
             is_individual=False
         ).count()
 
+        rules = get_scoring_rules(survivor_log_league(survivor_log_id))
+
         return {
             'individual': {
                 'count': individual_wins,
-                'points': individual_wins * 3
+                'points': individual_wins * rules['won_individual_immunities']
             },
             'team': {
                 'count': team_wins,
-                'points': team_wins * 1
+                'points': team_wins * rules['won_team_immunities']
             }
         }
 
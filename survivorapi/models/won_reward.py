@@ -1,4 +1,6 @@
 from django.db import models
+from .scoring_rule import get_scoring_rules
+from .survivor_log import survivor_log_league
 
 class WonReward(models.Model):
     episode_log = models.ForeignKey('EpisodeLog', on_delete=models.CASCADE, related_name='won_rewards')
@@ -8,9 +10,9 @@ class WonReward(models.Model):
     def points(self):
         """
         Points value for winning a reward
-        Returns: int -- Number of points (1) for winning a reward
+        Returns: int -- Number of points for winning a reward under its season log's league rules
         """
-        return 3
+        return get_scoring_rules(self.survivor_log.league)['won_rewards']
     
     @classmethod
     def get_stats_for_survivor(cls, survivor_log_id: int) -> dict:
@@ -24,7 +26,7 @@ class WonReward(models.Model):
         count = cls.objects.filter(survivor_log_id=survivor_log_id).count()
         return {
             'count': count,
-            'points': count * 1
+            'points': count * get_scoring_rules(survivor_log_league(survivor_log_id))['won_rewards']
         }
 
     class Meta:
@@ -0,0 +1,22 @@
+"""Keyset pagination for the list endpoints"""
+from rest_framework.pagination import CursorPagination
+
+class KeysetPagination(CursorPagination):
+    """
+    Opaque cursor pagination that seeks on `id` instead of using OFFSET
+
+    Pagination is opt-in so existing clients keep receiving plain lists:
+    a request is paginated only when it passes `cursor` or `page_size`.
+    """
+    ordering = 'id'
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if (
+            self.cursor_query_param not in request.query_params
+            and self.page_size_query_param not in request.query_params
+        ):
+            return None
+
+        return super().paginate_queryset(queryset, request, view)
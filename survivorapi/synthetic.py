@@ -0,0 +1,185 @@
+"""Synthetic multi-season, multi-user datasets for benchmarking"""
+import random
+from datetime import date, datetime, timedelta, timezone
+from django.contrib.auth.models import User
+from django.db.models import Max
+from rest_framework.authtoken.models import Token
+from survivorapi.models import (
+    Episode,
+    EpisodeLog,
+    FoundAdvantage,
+    FoundIdol,
+    PlayedIdol,
+    Season,
+    SeasonLog,
+    Survivor,
+    SurvivorLog,
+    SurvivorScore,
+    WonImmunity,
+    WonReward
+)
+from survivorapi.views.catalog_cache import bump_catalog_generation
+
+ACTION_MODELS = {
+    FoundAdvantage: 'found_advantages',
+    FoundIdol: 'found_idols',
+    PlayedIdol: 'played_idols',
+    WonImmunity: 'won_immunities',
+    WonReward: 'won_rewards',
+}
+
+def generate_dataset(
+    seasons=5,
+    survivors_per_season=18,
+    episodes_per_season=14,
+    users=20,
+    season_logs_per_user=3,
+    logged_episodes=10,
+    action_density=0.2,
+    seed=0,
+    batch_size=1000
+):
+    """
+    Bulk create seasons, casts, users and their logged episodes
+
+    Every user logs `season_logs_per_user` random seasons and, in each, the
+    first `logged_episodes` episodes. One survivor is voted out per logged
+    episode, and each survivor log gets an action in an episode with
+    probability `action_density`. Runs without model signals, so episode
+    counters, survivor scores and the catalog cache are refreshed at the end.
+
+    Returns: dict -- `counts` of rows created per model, the new `seasons` ids
+        and `sessions`, a list of (token key, season log ids) for every generated user
+    """
+    rng = random.Random(seed)
+    season_logs_per_user = min(season_logs_per_user, seasons)
+    logged_episodes = min(logged_episodes, episodes_per_season)
+    first_number = (Season.objects.aggregate(number=Max('season_number'))['number'] or 0) + 1
+    first_user = User.objects.count()
+
+    new_seasons = Season.objects.bulk_create([
+        Season(
+            season_number=first_number + index,
+            name=f"Synthetic {first_number + index}",
+            location="Benchmark Island",
+            start_date=date(2000, 1, 1) + timedelta(days=180 * index),
+            is_current=index == seasons - 1
+        )
+        for index in range(seasons)
+    ], batch_size=batch_size)
+
+    survivors = Survivor.objects.bulk_create([
+        Survivor(
+            season=season,
+            first_name=f"Survivor {number}",
+            last_name=f"S{season.season_number}",
+            age=rng.randint(20, 65),
+            img_url=f"media/synthetic-{season.season_number}-{number}.jpg"
+        )
+        for season in new_seasons
+        for number in range(1, survivors_per_season + 1)
+    ], batch_size=batch_size)
+
+    episodes = Episode.objects.bulk_create([
+        Episode(
+            season=season,
+            episode_number=number,
+            air_date_time=datetime(2000, 1, 1, tzinfo=timezone.utc) + timedelta(days=180 * index + 7 * number),
+            title=f"Episode {number}"
+        )
+        for index, season in enumerate(new_seasons)
+        for number in range(1, episodes_per_season + 1)
+    ], batch_size=batch_size)
+
+    survivors_by_season = {season.id: [] for season in new_seasons}
+    for survivor in survivors:
+        survivors_by_season[survivor.season_id].append(survivor)
+    episodes_by_season = {season.id: [] for season in new_seasons}
+    for episode in episodes:
+        episodes_by_season[episode.season_id].append(episode)
+
+    new_users = User.objects.bulk_create([
+        User(username=f"synthetic-{first_user + index}", first_name="Synthetic", last_name=str(index))
+        for index in range(users)
+    ], batch_size=batch_size)
+    tokens = Token.objects.bulk_create([
+        Token(key=Token.generate_key(), user=user) for user in new_users
+    ], batch_size=batch_size)
+
+    season_logs = SeasonLog.objects.bulk_create([
+        SeasonLog(user=user, season=season, status='active')
+        for user in new_users
+        for season in rng.sample(new_seasons, season_logs_per_user)
+    ], batch_size=batch_size)
+
+    survivor_logs = SurvivorLog.objects.bulk_create([
+        SurvivorLog(
+            survivor=survivor,
+            user_id=season_log.user_id,
+            season_log=season_log,
+            # Voted out in cast order, one per logged episode
+            is_active=index >= logged_episodes,
+            episode_voted_out=index + 1 if index < logged_episodes else None,
+            is_user_winner_pick=index == len(survivors_by_season[season_log.season_id]) - 1
+        )
+        for season_log in season_logs
+        for index, survivor in enumerate(survivors_by_season[season_log.season_id])
+    ], batch_size=batch_size)
+
+    survivor_logs_by_season_log = {season_log.id: [] for season_log in season_logs}
+    for survivor_log in survivor_logs:
+        survivor_logs_by_season_log[survivor_log.season_log_id].append(survivor_log)
+
+    episode_logs = EpisodeLog.objects.bulk_create([
+        EpisodeLog(episode=episode, season_log=season_log, user_id=season_log.user_id)
+        for season_log in season_logs
+        for episode in episodes_by_season[season_log.season_id][:logged_episodes]
+    ], batch_size=batch_size)
+
+    counts = {model._meta.label: 0 for model in ACTION_MODELS}
+    actions = {model: [] for model in ACTION_MODELS}
+    for episode_log in episode_logs:
+        for survivor_log in survivor_logs_by_season_log[episode_log.season_log_id]:
+            if rng.random() >= action_density:
+                continue
+
+            model = rng.choice(list(ACTION_MODELS))
+            action = model(episode_log=episode_log, survivor_log=survivor_log)
+            if model is WonImmunity:
+                action.is_individual = rng.random() < 0.5
+            actions[model].append(action)
+
+    for model, rows in actions.items():
+        model.objects.bulk_create(rows, batch_size=batch_size)
+        counts[model._meta.label] = len(rows)
+
+    # Score each season log separately to keep the IN lists short
+    by_season_log = {season_log.id: {name: [] for name in ACTION_MODELS.values()} for season_log in season_logs}
+    for model, rows in actions.items():
+        for action in rows:
+            by_season_log[action.survivor_log.season_log_id][ACTION_MODELS[model]].append(action)
+    for season_log_actions in by_season_log.values():
+        SurvivorScore.objects.increment(**season_log_actions)
+
+    Season.objects.filter(id__in=[season.id for season in new_seasons]).refresh_episode_counts()
+    bump_catalog_generation()
+
+    counts.update({
+        'survivorapi.Season': len(new_seasons),
+        'survivorapi.Survivor': len(survivors),
+        'survivorapi.Episode': len(episodes),
+        'auth.User': len(new_users),
+        'survivorapi.SeasonLog': len(season_logs),
+        'survivorapi.SurvivorLog': len(survivor_logs),
+        'survivorapi.EpisodeLog': len(episode_logs),
+    })
+
+    season_log_ids = {user.id: [] for user in new_users}
+    for season_log in season_logs:
+        season_log_ids[season_log.user_id].append(season_log.id)
+
+    return {
+        'counts': counts,
+        'seasons': [season.id for season in new_seasons],
+        'sessions': [(token.key, season_log_ids[token.user_id]) for token in tokens],
+    }
@@ -1,3 +1,1131 @@
-from django.test import TestCase
+import datetime
+import decimal
+import json
+import tempfile
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO, StringIO
+from pathlib import Path
+from unittest import mock, skipIf
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.management import call_command
+from django.db import IntegrityError, connection, transaction
+from django.contrib.auth.models import User
+from django.test import AsyncClient, TestCase, override_settings
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from survivorapi.authentication import token_cache
+from survivorapi.models import (
+    CacheGeneration, EpisodeLog, EpisodeLogSubmission, FoundIdol, ScoringRule, Season, SeasonLog, Survivor,
+    SurvivorLog, SurvivorScore
+)
+from survivorapi.export import aexport_user_history, export_user_history
+from survivorapi.ingestion import claim_submissions
+from survivorapi.media import Image, build_and_publish_variants, manifest, manifest_path, source_name
+from survivorapi.middleware import QueryBudgetExceeded, RouteMetrics, dump_route_metrics, route_metrics
+from survivorapi.models import scoring_rule
+from survivorapi.models.scoring_rule import DEFAULT_LEAGUE
+from survivorapi import parsers, renderers
+from survivorapi.parsers import FastJSONParser
+from survivorapi.renderers import FastJSONRenderer
+from survivorapi.synthetic import generate_dataset
+from survivorapi.views import fast_serializers
+from survivorapi.views.catalog_cache import catalog_generation
+from survivorapi.views.season_logs import (
+    EpisodeLogSerializer, SeasonLogSerializer, SeasonSerializer, SurvivorLogSerializer, SurvivorSerializer,
+    episode_logs_with_actions
+)
 
-# Create your tests here.
+class EpisodeLogsQueryCountTests(TestCase):
+    """GET /season-logs/{id}/episodes runs the same queries however long the season or large the cast"""
+
+    # Season log lookup, episode logs, episode and season, five action prefetches with their
+    # survivor logs and survivors, active survivors and the season's episode count
+    EXPECTED_QUERIES = 9
+
+    def get_episode_logs(self, survivors, logged_episodes):
+        dataset = generate_dataset(
+            seasons=1,
+            survivors_per_season=survivors,
+            episodes_per_season=max(logged_episodes, 1) + 1,
+            users=1,
+            season_logs_per_user=1,
+            logged_episodes=logged_episodes,
+            action_density=1.0,
+            seed=logged_episodes
+        )
+        token, (season_log_id,) = dataset['sessions'][0]
+
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Token {token}", HTTP_ACCEPT='application/json')
+        # Warm the token cache so only the endpoint's own queries are counted
+        client.get(f"/season-logs/{season_log_id}/episodes")
+
+        with self.assertNumQueries(self.EXPECTED_QUERIES):
+            response = client.get(f"/season-logs/{season_log_id}/episodes")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['episode_logs']), logged_episodes)
+        return response
+
+    def test_query_count_does_not_grow_with_episodes(self):
+        self.get_episode_logs(survivors=6, logged_episodes=1)
+        self.get_episode_logs(survivors=6, logged_episodes=5)
+
+    def test_query_count_does_not_grow_with_cast(self):
+        self.get_episode_logs(survivors=6, logged_episodes=3)
+        self.get_episode_logs(survivors=24, logged_episodes=3)
+
+    def test_query_count_for_a_late_season_with_a_large_cast(self):
+        self.get_episode_logs(survivors=24, logged_episodes=14)
+
+class HotPathIndexTests(TestCase):
+    """The planner uses the hot path indexes from migration 0006 for the per-user query shapes"""
+
+    @classmethod
+    def setUpTestData(cls):
+        generate_dataset(
+            seasons=3,
+            survivors_per_season=12,
+            episodes_per_season=6,
+            users=4,
+            season_logs_per_user=2,
+            logged_episodes=3,
+            action_density=0.2
+        )
+        cls.season_log = SeasonLog.objects.order_by('id').first()
+
+    def assertUsesIndex(self, queryset, index_name):
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                # Tiny test tables are cheaper to scan, so make the planner show what it would use
+                cursor.execute("SET LOCAL enable_seqscan = off")
+            plan = queryset.explain()
+        self.assertIn(index_name, plan)
+
+    def test_survivor_logs_by_season_log_and_user(self):
+        self.assertUsesIndex(
+            SurvivorLog.objects.filter(season_log=self.season_log, user_id=self.season_log.user_id),
+            'survivorlog_season_user_idx'
+        )
+
+    def test_active_survivor_logs_by_season_log(self):
+        self.assertUsesIndex(
+            SurvivorLog.objects.filter(season_log=self.season_log, is_active=True),
+            'survivorlog_season_active_idx'
+        )
+
+    def test_winner_pick_by_season_log(self):
+        self.assertUsesIndex(
+            SurvivorLog.objects.filter(season_log=self.season_log, is_user_winner_pick=True),
+            'unique_winner_pick_per_season_log'
+        )
+
+    def test_season_logs_by_user_and_status_ordered_by_created_on(self):
+        self.assertUsesIndex(
+            SeasonLog.objects.filter(user_id=self.season_log.user_id, status='active').order_by('created_on'),
+            'seasonlog_user_status_crt_idx'
+        )
+
+    def test_season_logs_by_user_and_status_ordered_by_completed_on(self):
+        self.assertUsesIndex(
+            SeasonLog.objects.filter(user_id=self.season_log.user_id, status='complete').order_by('completed_on'),
+            'seasonlog_user_status_cmp_idx'
+        )
+
+    def test_episode_logs_by_season_log_and_user(self):
+        self.assertUsesIndex(
+            EpisodeLog.objects.filter(season_log=self.season_log, user_id=self.season_log.user_id),
+            'episodelog_season_user_idx'
+        )
+
+class SurvivorScoreIncrementTests(TestCase):
+    """Scores match the raw action tables, even for survivor logs that had actions before they were scored"""
+
+    def test_increment_scores_a_missing_row_from_the_raw_tables(self):
+        generate_dataset(
+            seasons=1,
+            survivors_per_season=6,
+            episodes_per_season=4,
+            users=1,
+            season_logs_per_user=1,
+            logged_episodes=3,
+            action_density=1.0
+        )
+        survivor_log = SurvivorLog.objects.filter(found_idols__isnull=False).distinct().first()
+        expected_idols = survivor_log.found_idols.count() + 1
+        # A score lost or never written, like for actions logged before the scores table existed
+        SurvivorScore.objects.filter(survivor_log=survivor_log).delete()
+
+        found_idol = FoundIdol.objects.create(
+            episode_log=survivor_log.found_idols.first().episode_log,
+            survivor_log=survivor_log
+        )
+        SurvivorScore.objects.increment(found_idols=[found_idol])
+
+        score = SurvivorScore.objects.get(survivor_log=survivor_log)
+        stats = SurvivorLog.objects.filter(id=survivor_log.id).with_achievement_stats().get()
+        self.assertEqual(score.found_idols_count, expected_idols)
+        self.assertEqual(score.total_points, stats.total_points)
+
+class ScoringRuleTests(TestCase):
+    """Rule changes reach every process, and leagues rank their season logs by their own rules"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.dataset = generate_dataset(
+            seasons=1,
+            survivors_per_season=6,
+            episodes_per_season=4,
+            users=3,
+            season_logs_per_user=1,
+            logged_episodes=3,
+            action_density=1.0
+        )
+
+    def setUp(self):
+        # The rules cache is per process, so start each test from a cold one
+        scoring_rule._scoring_rules_cache.clear()
+        scoring_rule._scoring_rules_state.update(generation=None, checked_at=None)
+        self.addCleanup(scoring_rule._scoring_rules_cache.clear)
+
+    def test_rules_changed_by_another_process_are_reloaded(self):
+        self.assertEqual(scoring_rule.get_scoring_rules()['found_idols'], 3)
+
+        # A rule saved by another process leaves only its bump of the shared generation behind here
+        ScoringRule.objects.bulk_create([ScoringRule(achievement='found_idols', points=10)])
+        CacheGeneration.objects.bump(scoring_rule.GENERATION_NAME)
+
+        self.assertEqual(scoring_rule.get_scoring_rules()['found_idols'], 3)
+        scoring_rule.check_scoring_rules(force=True)
+        self.assertEqual(scoring_rule.get_scoring_rules()['found_idols'], 10)
+
+    def test_leaderboard_ranks_a_league_by_its_rules(self):
+        ScoringRule.objects.create(league='idols-only', achievement='found_idols', points=5)
+        for achievement in ['found_advantages', 'played_idols', 'won_team_immunities',
+                            'won_individual_immunities', 'won_rewards']:
+            ScoringRule.objects.create(league='idols-only', achievement=achievement, points=0)
+        SeasonLog.objects.update(league='idols-only')
+
+        token, (season_log_id,) = self.dataset['sessions'][0]
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Token {token}", HTTP_ACCEPT='application/json')
+        season_id = SeasonLog.objects.get(pk=season_log_id).season_id
+
+        response = client.get(f"/seasons/{season_id}/leaderboard", {'league': 'idols-only'})
+
+        self.assertEqual(response.status_code, 200)
+        expected = {
+            season_log.id: 5 * FoundIdol.objects.filter(survivor_log__season_log=season_log).count()
+            for season_log in SeasonLog.objects.all()
+        }
+        self.assertEqual(
+            {entry['season_log']: entry['total_points'] for entry in response.json()['leaderboard']},
+            expected
+        )
+        self.assertEqual(client.get(f"/seasons/{season_id}/leaderboard").json()['leaderboard'], [])
+
+    def test_survivor_log_stats_use_their_season_logs_league(self):
+        ScoringRule.objects.create(league='idols-only', achievement='found_idols', points=5)
+        for achievement in ['found_advantages', 'played_idols', 'won_team_immunities',
+                            'won_individual_immunities', 'won_rewards']:
+            ScoringRule.objects.create(league='idols-only', achievement=achievement, points=0)
+        SeasonLog.objects.update(league='idols-only')
+
+        found_idol = FoundIdol.objects.select_related('survivor_log__season_log').first()
+        survivor_log = SurvivorLog.objects.get(pk=found_idol.survivor_log_id)
+        found_idols = FoundIdol.objects.filter(survivor_log=survivor_log).count()
+
+        self.assertEqual(found_idol.points, 5)
+        self.assertEqual(FoundIdol.get_stats_for_survivor(survivor_log.id)['points'], 5 * found_idols)
+        self.assertEqual(survivor_log.achievement_stats['total_points'], 5 * found_idols)
+        annotated = SurvivorLog.objects.with_achievement_stats('idols-only').get(pk=survivor_log.pk)
+        self.assertEqual(annotated.achievement_stats, survivor_log.achievement_stats)
+
+class ExportTests(TestCase):
+    """The export streams the same NDJSON under WSGI and ASGI, with async pages under ASGI"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.dataset = generate_dataset(
+            seasons=2,
+            survivors_per_season=6,
+            episodes_per_season=4,
+            users=1,
+            season_logs_per_user=2,
+            logged_episodes=3,
+            action_density=0.5
+        )
+        cls.token = cls.dataset['sessions'][0][0]
+
+    async def test_async_pages_match_the_sync_export(self):
+        user = await User.objects.aget(auth_token__key=self.token)
+        expected = "".join(await sync_to_async(list)(export_user_history(user)))
+
+        pages = [page async for page in aexport_user_history(user, chunk_size=2)]
+
+        self.assertGreater(len(pages), 1)
+        self.assertEqual("".join(pages), expected)
+
+    async def test_asgi_export_streams_asynchronously(self):
+        client = AsyncClient()
+        response = await client.get(
+            "/season-logs/export",
+            headers={'Authorization': f"Token {self.token}", 'Accept': 'application/json'}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.is_async)
+        body = b"".join([chunk async for chunk in response.streaming_content])
+        self.assertTrue(body.startswith(b'{"type": "season_log"'))
+
+class ClaimSubmissionsTests(TestCase):
+    """Workers never claim a season log another worker is processing"""
+
+    @classmethod
+    def setUpTestData(cls):
+        generate_dataset(
+            seasons=1,
+            survivors_per_season=6,
+            episodes_per_season=4,
+            users=2,
+            season_logs_per_user=1,
+            logged_episodes=0
+        )
+        cls.busy, cls.idle = SeasonLog.objects.order_by('id')
+
+    def submit(self, season_log, episode_number, **kwargs):
+        return EpisodeLogSubmission.objects.create(
+            season_log=season_log,
+            user_id=season_log.user_id,
+            episode_number=episode_number,
+            payload={'survivor_logs': []},
+            **kwargs
+        )
+
+    def test_skips_season_logs_claimed_by_another_worker(self):
+        self.submit(self.busy, 1, status=EpisodeLogSubmission.PROCESSING, claimed_by='other')
+        self.submit(self.busy, 2)
+        idle_submission = self.submit(self.idle, 1)
+
+        claimed = claim_submissions('worker', batch_size=10)
+
+        self.assertEqual(claimed, [idle_submission])
+        self.assertEqual(
+            EpisodeLogSubmission.objects.filter(season_log=self.busy, status=EpisodeLogSubmission.PENDING).count(),
+            1
+        )
+
+class EpisodeLogsSparseFieldsTests(TestCase):
+    """?fields= and ?expand= shape the episode logs of GET /season-logs/{id}/episodes"""
+
+    @classmethod
+    def setUpTestData(cls):
+        dataset = generate_dataset(
+            seasons=1,
+            survivors_per_season=6,
+            episodes_per_season=4,
+            users=1,
+            season_logs_per_user=1,
+            logged_episodes=3,
+            action_density=1.0
+        )
+        cls.token, (cls.season_log_id,) = dataset['sessions'][0]
+
+    def get_episode_logs(self, **params):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Token {self.token}", HTTP_ACCEPT='application/json')
+        response = client.get(f"/season-logs/{self.season_log_id}/episodes", params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_fields_keep_only_the_requested_fields_with_actions_as_ids(self):
+        full = self.get_episode_logs()
+        sparse = self.get_episode_logs(fields='id,found_idols,next_episode')
+
+        for full_log, sparse_log in zip(full['episode_logs'], sparse['episode_logs']):
+            self.assertEqual(set(sparse_log), {'id', 'found_idols', 'next_episode'})
+            self.assertEqual(sparse_log['found_idols'], [idol['id'] for idol in full_log['found_idols']])
+            self.assertEqual(sparse_log['next_episode'], full_log['next_episode'])
+        self.assertEqual(sparse['active_survivors'], full['active_survivors'])
+
+    def test_expand_keeps_nested_objects_inline(self):
+        full = self.get_episode_logs()
+        expanded = self.get_episode_logs(fields='id,episode,found_idols', expand='found_idols')
+
+        for full_log, expanded_log in zip(full['episode_logs'], expanded['episode_logs']):
+            self.assertEqual(expanded_log['found_idols'], full_log['found_idols'])
+            self.assertEqual(expanded_log['episode'], full_log['episode']['id'])
+
+class TokenCacheTests(TestCase):
+    """Tokens are served from the cache until they are deleted or rotated, and its counters are reported"""
+
+    @classmethod
+    def setUpTestData(cls):
+        dataset = generate_dataset(
+            seasons=1,
+            survivors_per_season=4,
+            episodes_per_season=2,
+            users=1,
+            season_logs_per_user=1,
+            logged_episodes=1,
+            action_density=0.0
+        )
+        cls.token, _ = dataset['sessions'][0]
+
+    def setUp(self):
+        token_cache.clear()
+        self.addCleanup(token_cache.clear)
+
+    def get_seasons(self, key):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Token {key}", HTTP_ACCEPT='application/json')
+        return client.get("/seasons")
+
+    def test_counts_a_miss_then_hits(self):
+        for _ in range(3):
+            self.assertEqual(self.get_seasons(self.token).status_code, 200)
+
+        stats = token_cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['size']), (2, 1, 1))
+        self.assertAlmostEqual(stats['hit_rate'], 2 / 3)
+
+    def test_deleted_token_is_evicted(self):
+        self.get_seasons(self.token)
+        Token.objects.get(key=self.token).delete()
+
+        self.assertEqual(token_cache.stats()['size'], 0)
+        self.assertEqual(self.get_seasons(self.token).status_code, 401)
+
+    def test_rotated_token_is_evicted(self):
+        self.get_seasons(self.token)
+        token = Token.objects.get(key=self.token)
+        token.delete()
+        rotated = Token.objects.create(user=token.user)
+
+        self.assertEqual(self.get_seasons(self.token).status_code, 401)
+        self.assertEqual(self.get_seasons(rotated.key).status_code, 200)
+
+    def test_dump_request_metrics_reports_the_counters(self):
+        self.get_seasons(self.token)
+        self.get_seasons(self.token)
+
+        with tempfile.TemporaryDirectory() as dump_dir:
+            RouteMetrics().dump(dump_dir)
+            stdout = StringIO()
+            with override_settings(REQUEST_METRICS={'DUMP_DIR': dump_dir}):
+                call_command('dump_request_metrics', '--json', stdout=stdout)
+
+        stats = json.loads(stdout.getvalue())['token_cache']
+        self.assertEqual((stats['processes'], stats['hits'], stats['misses']), (1, 1, 1))
+
+def use_temporary_media_root(test_case):
+    """Point MEDIA_ROOT at an empty directory, with a cold manifest, for the rest of a test"""
+    media_root = tempfile.TemporaryDirectory()
+    test_case.addCleanup(media_root.cleanup)
+    settings_override = override_settings(MEDIA_ROOT=media_root.name)
+    settings_override.enable()
+    test_case.addCleanup(settings_override.disable)
+    test_case.addCleanup(reset_manifest)
+    reset_manifest()
+    return Path(media_root.name)
+
+def reset_manifest():
+    manifest.entries = {}
+    manifest.loaded_mtime = None
+    manifest.checked_at = 0.0
+
+class FastSerializerParityTests(TestCase):
+    """The fast path renders the same bytes as the DRF serializers it mirrors"""
+
+    @classmethod
+    def setUpTestData(cls):
+        dataset = generate_dataset(
+            seasons=2,
+            survivors_per_season=6,
+            episodes_per_season=4,
+            users=1,
+            season_logs_per_user=1,
+            logged_episodes=3,
+            action_density=1.0
+        )
+        _, (cls.season_log_id,) = dataset['sessions'][0]
+
+    def setUp(self):
+        use_temporary_media_root(self)
+
+        # Give some survivors variants so img_srcset is rendered both with and without them
+        manifest.update({
+            source_name(survivor.img_url): {
+                'hash': 'abc123',
+                'widths': {'list': 96, 'card': 320},
+                'formats': {'webp': {'list': f"media/variants/{survivor.id}.list.webp",
+                                     'card': f"media/variants/{survivor.id}.card.webp"}},
+            }
+            for survivor in Survivor.objects.order_by('id')[::2]
+        })
+
+    def assertRendersSame(self, fast, serialized):
+        renderer = FastJSONRenderer()
+        self.assertEqual(renderer.render(fast), renderer.render(serialized))
+
+    def test_episode_logs(self):
+        season_log = SeasonLog.objects.select_related('season').get(pk=self.season_log_id)
+        total_episodes = season_log.season.total_episodes
+
+        for normalize in (False, True):
+            with self.subTest(normalize=normalize):
+                episode_logs = list(episode_logs_with_actions(
+                    EpisodeLog.objects.filter(season_log=season_log).order_by('episode__episode_number')
+                ))
+                fast_survivors = {} if normalize else None
+                context = {'total_episodes': total_episodes}
+                if normalize:
+                    context['side_loaded_survivors'] = {}
+
+                fast = fast_serializers.episode_logs_data(episode_logs, total_episodes, fast_survivors)
+                serialized = EpisodeLogSerializer(episode_logs, many=True, context=context).data
+
+                self.assertTrue(any(log['found_idols'] for log in serialized))
+                self.assertRendersSame(
+                    {'episode_logs': fast, 'survivors': fast_survivors},
+                    {'episode_logs': serialized, 'survivors': context.get('side_loaded_survivors')}
+                )
+
+    def test_survivor_logs(self):
+        for normalize in (False, True):
+            with self.subTest(normalize=normalize):
+                survivor_logs = SurvivorLog.objects.filter(
+                    season_log_id=self.season_log_id
+                ).select_related('survivor').order_by('id')
+                fast_survivors = {} if normalize else None
+                context = {'side_loaded_survivors': {}} if normalize else {}
+
+                fast = fast_serializers.survivor_logs_data(survivor_logs, fast_survivors)
+                serialized = SurvivorLogSerializer(survivor_logs, many=True, context=context).data
+
+                self.assertTrue(any(log['survivor'] for log in serialized))
+                self.assertRendersSame(
+                    {'results': fast, 'survivors': fast_survivors},
+                    {'results': serialized, 'survivors': context.get('side_loaded_survivors')}
+                )
+
+    def test_survivors_with_and_without_variants(self):
+        survivors = list(Survivor.objects.order_by('id')[:2])
+
+        fast = [fast_serializers.survivor_data(survivor) for survivor in survivors]
+        serialized = SurvivorSerializer(survivors, many=True).data
+
+        self.assertIsNotNone(serialized[0]['img_srcset'])
+        self.assertIsNone(serialized[1]['img_srcset'])
+        self.assertRendersSame(fast, serialized)
+
+    def test_dashboard(self):
+        season_logs = list(SeasonLog.objects.select_related('season').order_by('id'))
+        seasons = list(Season.objects.with_total_episodes().order_by('season_number'))
+
+        self.assertRendersSame(
+            [fast_serializers.season_log_data(season_log) for season_log in season_logs],
+            SeasonLogSerializer(season_logs, many=True).data
+        )
+        self.assertRendersSame(
+            [fast_serializers.season_data(season) for season in seasons],
+            SeasonSerializer(seasons, many=True).data
+        )
+
+class WinnerPickTests(TestCase):
+    """PUT /season-logs/{id}/survivors/winner-pick swaps the one pick a season log may have"""
+
+    @classmethod
+    def setUpTestData(cls):
+        dataset = generate_dataset(
+            seasons=2,
+            survivors_per_season=4,
+            episodes_per_season=2,
+            users=1,
+            season_logs_per_user=2,
+            logged_episodes=0,
+            action_density=0.0
+        )
+        cls.token, (cls.season_log_id, cls.other_season_log_id) = dataset['sessions'][0]
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token}", HTTP_ACCEPT='application/json')
+        self.old_pick = SurvivorLog.objects.get(season_log_id=self.season_log_id, is_user_winner_pick=True)
+
+    def put_pick(self, survivor_log_id):
+        return self.client.put(
+            f"/season-logs/{self.season_log_id}/survivors/winner-pick",
+            {'survivor_log_id': survivor_log_id},
+            format='json'
+        )
+
+    def picks(self):
+        return list(SurvivorLog.objects.filter(
+            season_log_id=self.season_log_id,
+            is_user_winner_pick=True
+        ).values_list('id', flat=True))
+
+    def test_swaps_the_pick(self):
+        new_pick = SurvivorLog.objects.filter(season_log_id=self.season_log_id, is_user_winner_pick=False).first()
+
+        response = self.put_pick(new_pick.id)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['id'], new_pick.id)
+        self.assertTrue(response.json()['is_user_winner_pick'])
+        self.assertEqual(response.json()['survivor']['id'], new_pick.survivor_id)
+        self.assertEqual(self.picks(), [new_pick.id])
+
+    def test_picking_the_current_pick_again_keeps_it(self):
+        response = self.put_pick(self.old_pick.id)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()['is_user_winner_pick'])
+        self.assertEqual(self.picks(), [self.old_pick.id])
+
+    def test_unknown_survivor_log_leaves_the_old_pick(self):
+        other_season_survivor_log = SurvivorLog.objects.filter(season_log_id=self.other_season_log_id).first()
+
+        for survivor_log_id in (999999, other_season_survivor_log.id, 'abc'):
+            with self.subTest(survivor_log_id=survivor_log_id):
+                response = self.put_pick(survivor_log_id)
+
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(self.picks(), [self.old_pick.id])
+
+    def test_a_season_log_has_at_most_one_pick(self):
+        second_pick = SurvivorLog.objects.filter(season_log_id=self.season_log_id, is_user_winner_pick=False).first()
+
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            SurvivorLog.objects.filter(pk=second_pick.pk).update(is_user_winner_pick=True)
+        self.assertEqual(self.picks(), [self.old_pick.id])
+
+def add_manifest_entry(name):
+    """Record a fake manifest entry, run in pool worker processes"""
+    manifest.update({name: {'hash': name, 'widths': {}, 'formats': {}}})
+
+class ImageVariantTests(TestCase):
+    """Variants are built after the survivor's save commits, and concurrent manifest writers keep every entry"""
+
+    def setUp(self):
+        self.media_root = use_temporary_media_root(self)
+
+    @skipIf(Image is None, "Pillow is not installed")
+    def test_survivor_save_queues_the_build_until_commit(self):
+        Image.new('RGB', (400, 300), 'orange').save(self.media_root / 'new-survivor.jpg')
+        season = Season.objects.create(season_number=1, name="Borneo", location="Borneo", start_date="2000-05-31")
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            Survivor.objects.create(
+                season=season, first_name="Rich", last_name="Hatch", age=39, img_url="media/new-survivor.jpg"
+            )
+            self.assertIsNone(manifest.get('new-survivor.jpg'))
+        self.assertEqual(len(callbacks), 1)
+
+        generation = catalog_generation()['generation']
+        build_and_publish_variants('new-survivor.jpg')
+
+        self.assertEqual(manifest.get('new-survivor.jpg')['widths']['list'], 96)
+        self.assertNotEqual(catalog_generation()['generation'], generation)
+
+    def test_concurrent_manifest_updates_keep_every_entry(self):
+        names = [f"survivor-{number}.jpg" for number in range(40)]
+
+        with ProcessPoolExecutor(max_workers=4) as pool:
+            list(pool.map(add_manifest_entry, names))
+
+        self.assertEqual(sorted(json.loads(manifest_path().read_text())), sorted(names))
+
+class RequestMetricsTests(TestCase):
+    """Budgets fail tests, dumps are opt-in, and a reset clears live histograms as well as dumped ones"""
+
+    @classmethod
+    def setUpTestData(cls):
+        dataset = generate_dataset(
+            seasons=1,
+            survivors_per_season=4,
+            episodes_per_season=2,
+            users=1,
+            season_logs_per_user=1,
+            logged_episodes=0,
+            action_density=0.0
+        )
+        cls.token, _ = dataset['sessions'][0]
+
+    def setUp(self):
+        dump_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(dump_dir.cleanup)
+        self.dump_dir = Path(dump_dir.name)
+        self.addCleanup(route_metrics.clear)
+        route_metrics.clear()
+
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token}", HTTP_ACCEPT='application/json')
+
+    def metrics_settings(self, **overrides):
+        return override_settings(
+            REQUEST_METRICS={**settings.REQUEST_METRICS, 'DUMP_DIR': str(self.dump_dir), **overrides}
+        )
+
+    def test_query_budgets_raise_under_tests(self):
+        with self.metrics_settings(QUERY_BUDGETS={'GET season-list': 0}):
+            with self.assertRaises(QueryBudgetExceeded):
+                self.client.get("/seasons")
+
+    def test_histograms_are_not_dumped_by_default(self):
+        with self.metrics_settings(DUMP_EVERY=1):
+            self.client.get("/seasons")
+            dump_route_metrics()
+
+        self.assertTrue(route_metrics.recorded)
+        self.assertEqual(list(self.dump_dir.iterdir()), [])
+
+    def test_reset_clears_live_histograms(self):
+        other_process = RouteMetrics()
+        other_process.record('GET season-list', 1.0, 1, 0.5, 0.0, 0.0, 10)
+        other_process.dump(self.dump_dir)
+        other_process.dumped_at -= 60
+
+        with self.metrics_settings(DUMP=True):
+            self.client.get("/seasons")
+            call_command('dump_request_metrics', '--reset', stdout=StringIO())
+
+        self.assertEqual(route_metrics.snapshot(), {})
+        self.assertEqual(list(self.dump_dir.glob('*.json')), [])
+
+        # Another server process drops what it recorded before the reset instead of dumping it again
+        other_process.dump(self.dump_dir)
+        self.assertEqual(json.loads(next(self.dump_dir.glob('*.json')).read_text())['routes'], {})
+
+class SeasonLogsETagTests(TestCase):
+    """GET /season-logs answers a matching If-None-Match with a 304 until the dashboard changes"""
+
+    @classmethod
+    def setUpTestData(cls):
+        dataset = generate_dataset(
+            seasons=2,
+            survivors_per_season=4,
+            episodes_per_season=3,
+            users=1,
+            season_logs_per_user=1,
+            logged_episodes=1,
+            action_density=0.0
+        )
+        cls.token, (cls.season_log_id,) = dataset['sessions'][0]
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token}", HTTP_ACCEPT='application/json')
+
+    def get_dashboard(self, etag=None):
+        headers = {'HTTP_IF_NONE_MATCH': etag} if etag else {}
+        return self.client.get("/season-logs", **headers)
+
+    def test_matching_etag_gets_a_304_without_a_body(self):
+        etag = self.get_dashboard()['ETag']
+
+        response = self.get_dashboard(etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(response.content, b'')
+
+    def test_etag_changes_when_the_dashboard_changes(self):
+        season_log = SeasonLog.objects.select_related('season').get(pk=self.season_log_id)
+        episode = season_log.season.episodes.first()
+
+        def edit_season():
+            season_log.season.name = "Renamed"
+            season_log.season.save()
+
+        def edit_episode():
+            episode.title = "Retitled"
+            episode.save()
+
+        def edit_season_log():
+            season_log.status = 'complete'
+            season_log.save()
+
+        for edit in (edit_season, edit_episode, edit_season_log):
+            with self.subTest(edit=edit.__name__):
+                etag = self.get_dashboard()['ETag']
+                edit()
+
+                response = self.get_dashboard(etag)
+
+                self.assertEqual(response.status_code, 200)
+                self.assertNotEqual(response['ETag'], etag)
+                self.assertEqual(self.get_dashboard(response['ETag']).status_code, 304)
+
+class BatchEpisodeLogsTests(TestCase):
+    """POST /season-logs/{id}/episodes/batch checks every episode against the cast before writing any"""
+
+    @classmethod
+    def setUpTestData(cls):
+        dataset = generate_dataset(
+            seasons=1,
+            survivors_per_season=6,
+            episodes_per_season=4,
+            users=1,
+            season_logs_per_user=1,
+            logged_episodes=0,
+            action_density=0.0
+        )
+        cls.token, (cls.season_log_id,) = dataset['sessions'][0]
+        cls.survivor_log_ids = list(
+            SurvivorLog.objects.filter(season_log_id=cls.season_log_id).order_by('id').values_list('id', flat=True)
+        )
+
+    def post_batch(self, episodes):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Token {self.token}", HTTP_ACCEPT='application/json')
+        return client.post(
+            f"/season-logs/{self.season_log_id}/episodes/batch",
+            {'episodes': episodes},
+            format='json'
+        )
+
+    def episode(self, episode_number, voted_out=None, found_idol=()):
+        return {
+            'episode_number': episode_number,
+            'survivor_logs': [
+                {'id': survivor_log_id, 'episode_actions': {
+                    'voted_out': survivor_log_id == voted_out,
+                    'found_idol': survivor_log_id in found_idol,
+                }}
+                for survivor_log_id in {voted_out, *found_idol} - {None}
+            ]
+        }
+
+    def test_logs_every_episode(self):
+        voted_out, idol_finder = self.survivor_log_ids[:2]
+
+        response = self.post_batch([
+            self.episode(1, voted_out=voted_out),
+            self.episode(2, found_idol=[idol_finder]),
+        ])
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([log['episode_number'] for log in response.json()['episode_logs']], [1, 2])
+        self.assertEqual(response.json()['voted_out'], [voted_out])
+        self.assertEqual(response.json()['actions']['found_idols'], 1)
+        self.assertFalse(SurvivorLog.objects.get(pk=voted_out).is_active)
+
+    def test_rejects_a_survivor_voted_out_earlier_in_the_batch_and_writes_nothing(self):
+        voted_out, idol_finder = self.survivor_log_ids[:2]
+
+        response = self.post_batch([
+            self.episode(1, voted_out=voted_out),
+            self.episode(2, found_idol=[idol_finder]),
+            self.episode(3, found_idol=[voted_out]),
+        ])
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("episode 3", response.json()['message'])
+        self.assertFalse(EpisodeLog.objects.filter(season_log_id=self.season_log_id).exists())
+        self.assertFalse(FoundIdol.objects.filter(survivor_log__season_log_id=self.season_log_id).exists())
+        self.assertTrue(SurvivorLog.objects.get(pk=voted_out).is_active)
+
+class EpisodeLogCreateTests(TestCase):
+    """POST /season-logs/{id}/episodes records each action against the survivor log it was sent for"""
+
+    @classmethod
+    def setUpTestData(cls):
+        dataset = generate_dataset(
+            seasons=1,
+            survivors_per_season=6,
+            episodes_per_season=4,
+            users=1,
+            season_logs_per_user=1,
+            logged_episodes=0,
+            action_density=0.0
+        )
+        cls.token, (cls.season_log_id,) = dataset['sessions'][0]
+        cls.survivor_log_ids = list(
+            SurvivorLog.objects.filter(season_log_id=cls.season_log_id).order_by('id').values_list('id', flat=True)
+        )
+        # A deployed database started the rules generation long ago, keep its insert out of the query budget
+        CacheGeneration.objects.current(scoring_rule.GENERATION_NAME)
+
+    def post_episode_log(self, survivor_logs, episode_number=1):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Token {self.token}", HTTP_ACCEPT='application/json')
+        return client.post(
+            f"/season-logs/{self.season_log_id}/episodes",
+            {'episode_number': episode_number, 'survivor_logs': survivor_logs},
+            format='json'
+        )
+
+    def test_rejects_duplicate_survivor_log_ids(self):
+        survivor_log_id = self.survivor_log_ids[0]
+
+        response = self.post_episode_log([
+            {'id': survivor_log_id, 'episode_actions': {'found_idol': True}},
+            {'id': survivor_log_id, 'episode_actions': {'voted_out': True}},
+        ])
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['message'], "Duplicate survivor log IDs")
+        self.assertFalse(EpisodeLog.objects.filter(season_log_id=self.season_log_id).exists())
+
+    def test_actions_go_to_the_survivor_logs_they_were_sent_for(self):
+        first, second, third, fourth = self.survivor_log_ids[:4]
+
+        # Out of id order, so a lookup that relied on the query's order would mix them up
+        response = self.post_episode_log([
+            {'id': fourth, 'episode_actions': {'won_immunity': True, 'is_individual_immunity': True}},
+            {'id': second, 'episode_actions': {'found_idol': True, 'played_idol': True}},
+            {'id': third, 'episode_actions': {'voted_out': True}},
+            {'id': first, 'episode_actions': {'found_advantage': True, 'won_reward': True}},
+        ])
+
+        self.assertEqual(response.status_code, 201)
+        episode_log = response.json()['episode_log']
+        self.assertEqual(
+            {name: [action['survivor_log']['id'] for action in episode_log[name]] for name in (
+                'found_idols', 'found_advantages', 'played_idols', 'won_immunities', 'won_rewards'
+            )},
+            {
+                'found_idols': [second],
+                'found_advantages': [first],
+                'played_idols': [second],
+                'won_immunities': [fourth],
+                'won_rewards': [first],
+            }
+        )
+        self.assertTrue(episode_log['won_immunities'][0]['is_individual'])
+        self.assertNotIn(third, [survivor_log['id'] for survivor_log in response.json()['active_survivors']])
+        self.assertEqual(SurvivorLog.objects.get(pk=third).episode_voted_out, 1)
+        self.assertEqual(
+            set(FoundIdol.objects.filter(episode_log_id=episode_log['id']).values_list('survivor_log_id', flat=True)),
+            {second}
+        )
+
+    def test_rejects_a_survivor_log_voted_out_in_an_earlier_episode(self):
+        voted_out = self.survivor_log_ids[0]
+        self.post_episode_log([{'id': voted_out, 'episode_actions': {'voted_out': True}}])
+
+        response = self.post_episode_log([{'id': voted_out, 'episode_actions': {'found_idol': True}}], 2)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(EpisodeLog.objects.filter(season_log_id=self.season_log_id).count(), 1)
+
+class KeysetPaginationTests(TestCase):
+    """GET /season-logs/{id}/survivors/ pages on request only, with cursors that survive inserts"""
+
+    @classmethod
+    def setUpTestData(cls):
+        dataset = generate_dataset(
+            seasons=1,
+            survivors_per_season=7,
+            episodes_per_season=2,
+            users=1,
+            season_logs_per_user=1,
+            logged_episodes=0,
+            action_density=0.0
+        )
+        cls.token, (cls.season_log_id,) = dataset['sessions'][0]
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token}", HTTP_ACCEPT='application/json')
+
+    def get_survivor_logs(self, url=None, **params):
+        response = self.client.get(url or f"/season-logs/{self.season_log_id}/survivors/", params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def add_survivor_log(self, number):
+        season_log = SeasonLog.objects.get(pk=self.season_log_id)
+        survivor = Survivor.objects.create(
+            season_id=season_log.season_id, first_name=f"Late {number}", last_name="Arrival", age=30
+        )
+        return SurvivorLog.objects.create(survivor=survivor, user_id=season_log.user_id, season_log=season_log).id
+
+    def test_unpaginated_requests_keep_the_plain_list(self):
+        survivor_logs = self.get_survivor_logs()
+
+        self.assertIsInstance(survivor_logs, list)
+        self.assertEqual(
+            sorted(survivor_log['id'] for survivor_log in survivor_logs),
+            sorted(SurvivorLog.objects.filter(season_log_id=self.season_log_id).values_list('id', flat=True))
+        )
+        self.assertIn('survivor', survivor_logs[0])
+
+    def test_page_size_opts_in(self):
+        page = self.get_survivor_logs(page_size=3)
+
+        self.assertEqual(set(page), {'next', 'previous', 'results'})
+        self.assertEqual(len(page['results']), 3)
+        self.assertIsNone(page['previous'])
+        self.assertIsNotNone(page['next'])
+
+    def test_cursor_is_stable_across_inserts(self):
+        original_ids = list(
+            SurvivorLog.objects.filter(season_log_id=self.season_log_id).order_by('id').values_list('id', flat=True)
+        )
+        seen = []
+        added = []
+
+        page = self.get_survivor_logs(page_size=3)
+        while True:
+            seen += [survivor_log['id'] for survivor_log in page['results']]
+            if page['next'] is None:
+                break
+            # Rows inserted between page requests neither shift nor repeat the rows already paged through
+            added.append(self.add_survivor_log(len(added)))
+            page = self.get_survivor_logs(page['next'])
+
+        self.assertEqual(seen, sorted(set(seen)))
+        self.assertEqual(seen[:len(original_ids)], original_ids)
+        self.assertEqual(seen[len(original_ids):], added[:len(seen) - len(original_ids)])
+
+class FastJSONTests(TestCase):
+    """FastJSONRenderer and FastJSONParser match DRF's JSON classes, with or without orjson"""
+
+    payload = {
+        'utc': datetime.datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=datetime.timezone.utc),
+        'whole_second': datetime.datetime(2024, 5, 1, 12, 30, 15, tzinfo=datetime.timezone.utc),
+        'offset': datetime.datetime(
+            2024, 5, 1, 12, 30, 15, 987654, tzinfo=datetime.timezone(datetime.timedelta(hours=-5))
+        ),
+        'naive': datetime.datetime(2024, 5, 1, 12, 30, 15, 500),
+        'date': datetime.date(2024, 5, 1),
+        'time': datetime.time(8, 15, 1, 250000),
+        'duration': datetime.timedelta(hours=1, seconds=3),
+        'decimal': decimal.Decimal('12.50'),
+        'uuid': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+        'lazy': gettext_lazy("Survivor"),
+        'separators': "line\u2028paragraph\u2029",
+        'unicode': "Tocantins Brasil – São Paulo",
+        1: "integer key",
+        'nested': [{'score': decimal.Decimal('0.1')}, None, True],
+    }
+
+    def without_orjson(self):
+        for module in (renderers, parsers):
+            patcher = mock.patch.object(module, 'orjson', None)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def parse(self, body):
+        return FastJSONParser().parse(BytesIO(body), parser_context={})
+
+    def test_renders_like_drf(self):
+        self.assertIsNotNone(renderers.orjson)
+        self.assertEqual(FastJSONRenderer().render(self.payload), JSONRenderer().render(self.payload))
+
+    def test_renders_like_drf_without_orjson(self):
+        self.without_orjson()
+        self.assertEqual(FastJSONRenderer().render(self.payload), JSONRenderer().render(self.payload))
+
+    def test_parses_like_drf(self):
+        for fallback in (False, True):
+            with self.subTest(without_orjson=fallback):
+                if fallback:
+                    self.without_orjson()
+                body = FastJSONRenderer().render(self.payload)
+
+                self.assertEqual(self.parse(body), JSONParser().parse(BytesIO(body), parser_context={}))
+                for invalid in (b'{"points": NaN}', b'{"points":'):
+                    with self.assertRaises(ParseError):
+                        self.parse(invalid)
+
+class StandingTests(TestCase):
+    """Season logs rank by a correct winner pick, then points, with ties sharing a rank"""
+
+    # Found idols and whether the winner pick is right for each season log, in dataset order
+    STANDINGS = [(2, True), (5, False), (5, False), (1, True), (0, False)]
+    EXPECTED_RANKS = [1, 3, 3, 2, 5]
+
+    @classmethod
+    def setUpTestData(cls):
+        dataset = generate_dataset(
+            seasons=1,
+            survivors_per_season=4,
+            episodes_per_season=2,
+            users=len(cls.STANDINGS),
+            season_logs_per_user=1,
+            logged_episodes=0,
+            action_density=0.0
+        )
+        cls.sessions = [(token, season_log_id) for token, (season_log_id,) in dataset['sessions']]
+        cls.season_id = SeasonLog.objects.get(pk=cls.sessions[0][1]).season_id
+
+        SurvivorScore.objects.all().delete()
+        for (_, season_log_id), (found_idols, winner_pick_correct) in zip(cls.sessions, cls.STANDINGS):
+            winner_pick = SurvivorLog.objects.get(season_log_id=season_log_id, is_user_winner_pick=True)
+            winner_pick.is_season_winner = winner_pick_correct
+            winner_pick.save()
+            SurvivorScore.objects.create(
+                survivor_log=winner_pick,
+                season_log_id=season_log_id,
+                found_idols_count=found_idols,
+                total_points=3 * found_idols
+            )
+
+    def setUp(self):
+        scoring_rule._scoring_rules_cache.clear()
+        scoring_rule._scoring_rules_state.update(generation=None, checked_at=None)
+        self.addCleanup(scoring_rule._scoring_rules_cache.clear)
+
+    def ranks(self, league=DEFAULT_LEAGUE):
+        ranked = {
+            season_log.id: season_log.rank
+            for season_log in SeasonLog.objects.filter(season_id=self.season_id, league=league).ranked(league)
+        }
+        return [ranked.get(season_log_id) for _, season_log_id in self.sessions]
+
+    def get_leaderboard(self, token, **params):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Token {token}", HTTP_ACCEPT='application/json')
+        response = client.get(f"/seasons/{self.season_id}/leaderboard", params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_ties_share_a_rank_and_skip_the_next(self):
+        self.assertEqual(self.ranks(), self.EXPECTED_RANKS)
+
+        standings = {
+            season_log.id: (season_log.winner_pick_correct, season_log.total_points)
+            for season_log in SeasonLog.objects.filter(season_id=self.season_id).with_standing()
+        }
+        self.assertEqual(
+            [standings[season_log_id] for _, season_log_id in self.sessions],
+            [(winner_pick_correct, 3 * found_idols) for found_idols, winner_pick_correct in self.STANDINGS]
+        )
+
+    def test_default_league_ranks_only_its_logs_by_stored_totals(self):
+        # Rules of another league change nothing for the default league
+        ScoringRule.objects.create(league='idols-only', achievement='found_idols', points=100)
+        moved_token, moved_id = self.sessions[4]
+        SeasonLog.objects.filter(pk=moved_id).update(league='idols-only')
+
+        self.assertEqual(self.ranks(), self.EXPECTED_RANKS[:4] + [None])
+
+        leaderboard = self.get_leaderboard(self.sessions[0][0])
+        self.assertEqual(leaderboard['league'], DEFAULT_LEAGUE)
+        self.assertNotIn(moved_id, [entry['season_log'] for entry in leaderboard['leaderboard']])
+        self.assertIsNone(self.get_leaderboard(moved_token)['me'])
+
+    def test_rank_of_agrees_with_the_leaderboard(self):
+        leaderboard = self.get_leaderboard(self.sessions[0][0])['leaderboard']
+        leaderboard_ranks = {entry['season_log']: entry['rank'] for entry in leaderboard}
+        league_logs = SeasonLog.objects.filter(season_id=self.season_id, league=DEFAULT_LEAGUE)
+
+        for (token, season_log_id), (found_idols, winner_pick_correct) in zip(self.sessions, self.STANDINGS):
+            with self.subTest(season_log_id=season_log_id):
+                self.assertEqual(
+                    league_logs.rank_of(winner_pick_correct, 3 * found_idols),
+                    leaderboard_ranks[season_log_id]
+                )
+                # Outside the top entries the requester's rank comes from rank_of
+                me = self.get_leaderboard(token, limit=0)['me']
+                self.assertEqual(me['rank'], leaderboard_ranks[season_log_id])
@@ -3,4 +3,5 @@ from .season_logs import SeasonLogs
 from .seasons import Seasons
 from .tribes import Tribes
 from .survivors import Survivors
-from .survivor_tribes import SurvivorTribes
\ No newline at end of file
+from .survivor_tribes import SurvivorTribes
+from .media import media_file
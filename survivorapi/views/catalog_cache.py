@@ -0,0 +1,95 @@
+"""Versioned response cache for the near-static catalog endpoints"""
+import hashlib
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from survivorapi.models import CacheGeneration, Episode, Season, Survivor, SurvivorTribe, Tribe
+
+GENERATION_NAME = 'catalog'
+
+def catalog_cache_timeout() -> int:
+    return getattr(settings, 'CATALOG_CACHE', {}).get('TIMEOUT', 3600)
+
+def catalog_generation() -> dict:
+    """
+    Get the current catalog generation
+
+    The counter lives in the database, not in the cache, since the default
+    cache is local to each process and a write in one server process has to
+    invalidate the responses every process cached.
+
+    Returns: dict -- `generation` id and the `last_modified` timestamp it was started at
+    """
+    state = CacheGeneration.objects.current(GENERATION_NAME)
+    return {'generation': state['generation'], 'last_modified': state['modified_on'].timestamp()}
+
+def bump_catalog_generation(**kwargs):
+    """Start a new catalog generation, so every process's cached catalog responses are stale"""
+    CacheGeneration.objects.bump(GENERATION_NAME)
+
+# Any write to catalog data, from the API, the admin or the shell, invalidates the cache
+for catalog_model in [Season, Episode, Survivor, Tribe, SurvivorTribe]:
+    post_save.connect(bump_catalog_generation, sender=catalog_model, dispatch_uid=f'catalog-save-{catalog_model.__name__}')
+    post_delete.connect(bump_catalog_generation, sender=catalog_model, dispatch_uid=f'catalog-delete-{catalog_model.__name__}')
+
+class CatalogCacheMixin:
+    """
+    Serve list and retrieve from pre-rendered bytes cached per catalog generation
+
+    Responses are keyed by path and query params and carry an ETag and
+    Last-Modified header, so clients can revalidate with a 304.
+    """
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(request, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(request, super().retrieve, *args, **kwargs)
+
+    def cached_response(self, request, handler, *args, **kwargs):
+        # Only JSON is cached, the browsable API renders as usual
+        if request.accepted_renderer.format != 'json':
+            return handler(request, *args, **kwargs)
+
+        state = catalog_generation()
+        query = sorted(request.query_params.lists())
+        # Paginated responses embed absolute next/previous links, so the host is part of the key
+        request_key = hashlib.md5(
+            f"{request.get_host()}{request.path}?{query}".encode(),
+            usedforsecurity=False
+        ).hexdigest()
+        cache_key = f"catalog:{state['generation']}:{self.basename}:{request_key}"
+
+        entry = cache.get(cache_key)
+        if entry is None:
+            response = handler(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+
+            body = request.accepted_renderer.render(
+                response.data,
+                request.accepted_media_type,
+                self.get_renderer_context()
+            )
+            entry = {
+                'body': body,
+                'etag': quote_etag(hashlib.md5(body, usedforsecurity=False).hexdigest())
+            }
+            cache.set(cache_key, entry, catalog_cache_timeout())
+
+        last_modified = int(state['last_modified'])
+        not_modified = get_conditional_response(
+            request,
+            etag=entry['etag'],
+            last_modified=last_modified
+        )
+        if not_modified is not None:
+            return not_modified
+
+        response = HttpResponse(entry['body'], content_type=request.accepted_media_type)
+        response['ETag'] = entry['etag']
+        response['Last-Modified'] = http_date(last_modified)
+        return response
@@ -0,0 +1,131 @@
+"""
+Read-only fast path for the hot season log endpoints
+
+These functions build the same dicts as the DRF serializers in season_logs.py
+straight from prefetched instances, skipping serializer instantiation and
+per-field dispatch. Output must stay identical to the matching serializer, so
+any field change there has to be mirrored here.
+"""
+from rest_framework import serializers
+from survivorapi.media import img_srcset
+
+# Shared field instances so dates render exactly like the serializers render them
+datetime_field = serializers.DateTimeField()
+date_field = serializers.DateField()
+
+def render_datetime(value):
+    return None if value is None else datetime_field.to_representation(value)
+
+def render_date(value):
+    return None if value is None else date_field.to_representation(value)
+
+def survivor_data(survivor, side_loaded_survivors=None):
+    """Mirror SurvivorSerializer, including side-loading in normalized responses"""
+    if side_loaded_survivors is not None and survivor.id in side_loaded_survivors:
+        return survivor.id
+
+    data = {
+        'id': survivor.id,
+        'first_name': survivor.first_name,
+        'last_name': survivor.last_name,
+        'age': survivor.age,
+        'img_url': survivor.img_url,
+        'img_srcset': img_srcset(survivor.img_url),
+    }
+
+    if side_loaded_survivors is None:
+        return data
+
+    side_loaded_survivors[survivor.id] = data
+    return survivor.id
+
+def survivor_log_data(survivor_log, side_loaded_survivors=None):
+    """Mirror SurvivorLogSerializer for a survivor log with its survivor selected"""
+    return {
+        'id': survivor_log.id,
+        'survivor': survivor_data(survivor_log.survivor, side_loaded_survivors),
+        'is_active': survivor_log.is_active,
+        'is_juror': survivor_log.is_juror,
+        'episode_voted_out': survivor_log.episode_voted_out,
+        'is_user_winner_pick': survivor_log.is_user_winner_pick,
+        'is_season_winner': survivor_log.is_season_winner,
+    }
+
+def survivor_logs_data(survivor_logs, side_loaded_survivors=None):
+    return [survivor_log_data(survivor_log, side_loaded_survivors) for survivor_log in survivor_logs]
+
+def action_data(action, side_loaded_survivors=None):
+    """Mirror the action serializers, which share a shape apart from WonImmunity"""
+    data = {
+        'id': action.id,
+        'survivor_log': survivor_log_data(action.survivor_log, side_loaded_survivors),
+    }
+    if hasattr(action, 'is_individual'):
+        data['is_individual'] = action.is_individual
+    return data
+
+def episode_data(episode):
+    """Mirror EpisodeSerializer"""
+    return {
+        'id': episode.id,
+        'episode_number': episode.episode_number,
+        'air_date_time': render_datetime(episode.air_date_time),
+        'title': episode.title,
+    }
+
+def episode_log_data(episode_log, total_episodes, side_loaded_survivors=None):
+    """
+    Mirror EpisodeLogSerializer for an episode log loaded through episode_logs_with_actions
+
+    Args:
+        episode_log (EpisodeLog) -- log with its episode and actions prefetched
+        total_episodes (int) -- number of episodes in the season
+        side_loaded_survivors (dict) -- survivor map for normalized responses, if any
+    """
+    episode_number = episode_log.episode.episode_number
+
+    def actions(related_name):
+        return [
+            action_data(action, side_loaded_survivors)
+            for action in getattr(episode_log, related_name).all()
+        ]
+
+    return {
+        'id': episode_log.id,
+        'episode': episode_data(episode_log.episode),
+        'created_at': render_datetime(episode_log.created_at),
+        'found_idols': actions('found_idols'),
+        'found_advantages': actions('found_advantages'),
+        'played_idols': actions('played_idols'),
+        'won_immunities': actions('won_immunities'),
+        'won_rewards': actions('won_rewards'),
+        'next_episode': episode_number + 1 if episode_number < total_episodes else None,
+    }
+
+def episode_logs_data(episode_logs, total_episodes, side_loaded_survivors=None):
+    return [
+        episode_log_data(episode_log, total_episodes, side_loaded_survivors)
+        for episode_log in episode_logs
+    ]
+
+def season_data(season):
+    """Mirror SeasonSerializer"""
+    return {
+        'id': season.id,
+        'season_number': season.season_number,
+        'name': season.name,
+        'location': season.location,
+        'start_date': render_date(season.start_date),
+        'end_date': render_date(season.end_date),
+        'is_current': season.is_current,
+        'total_episodes': season.total_episodes,
+    }
+
+def season_log_data(season_log):
+    """Mirror SeasonLogSerializer for a season log with its season selected"""
+    return {
+        'id': season_log.id,
+        'status': season_log.status,
+        'league': season_log.league,
+        'season': season_data(season_log.season),
+    }
@@ -0,0 +1,22 @@
+"""View for serving uploaded media with long-lived caching"""
+from django.conf import settings
+from django.views.decorators.http import require_safe
+from django.views.static import serve
+from survivorapi.media import VARIANT_DIR
+
+# Variant names contain a hash of their content, so a URL never changes meaning
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+# Originals can be replaced in place under the same name
+ORIGINAL_CACHE_CONTROL = 'public, max-age=86400'
+
+@require_safe
+def media_file(request, path):
+    """Serve a file from MEDIA_ROOT with cache headers suited to whether it is a variant"""
+    response = serve(request, path, document_root=settings.MEDIA_ROOT)
+
+    if path.startswith(f"{VARIANT_DIR}/") and not path.endswith('.json'):
+        response['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+    else:
+        response['Cache-Control'] = ORIGINAL_CACHE_CONTROL
+
+    return response
@@ -1,10 +1,22 @@
 """View module for handling requests about Season Logs"""
+import hashlib
 from rest_framework import viewsets, permissions
 from rest_framework.response import Response
 from rest_framework.decorators import action
 from rest_framework import serializers
 from rest_framework import status
-from django.db import transaction
+from django.db import IntegrityError, connection, transaction
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from django.db.models import Count, Exists, Max, OuterRef, Prefetch, Q
+from django.utils.http import parse_etags, quote_etag
+from survivorapi.export import aexport_user_history, export_user_history
+from survivorapi.ingestion import episode_log_ingestion_settings
+from survivorapi.media import img_srcset
+from survivorapi.middleware import serialization_timer
+from survivorapi.views import fast_serializers
+from survivorapi.views.catalog_cache import catalog_generation
+from survivorapi.models.scoring_rule import DEFAULT_LEAGUE
 from survivorapi.models import (
     SeasonLog, 
     Season, 
@@ -12,7 +24,9 @@ from survivorapi.models import (
     SurvivorLog, 
     FavoriteSurvivor, 
     SurvivorNote, 
+    SurvivorScore,
     EpisodeLog, 
+    EpisodeLogSubmission,
     Episode,
     FoundAdvantage,
     FoundIdol,
@@ -21,6 +35,31 @@ from survivorapi.models import (
     PlayedIdol
 )
 
+class SparseFieldsMixin:
+    """
+    Serializer mixin for sparse fieldsets
+
+    Pass `fields` to keep only those top level fields. Nested objects that
+    survive are rendered as their ids unless their name is also in `expand`.
+    """
+
+    def __init__(self, *args, fields=None, expand=None, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        if fields is None:
+            return
+
+        for name in set(self.fields) - set(fields):
+            self.fields.pop(name)
+
+        for name, field in list(self.fields.items()):
+            if name in (expand or []):
+                continue
+            if isinstance(field, serializers.ListSerializer):
+                self.fields[name] = serializers.PrimaryKeyRelatedField(many=True, read_only=True)
+            elif isinstance(field, serializers.BaseSerializer):
+                self.fields[name] = serializers.PrimaryKeyRelatedField(read_only=True)
+
 class SeasonSerializer(serializers.ModelSerializer):
     total_episodes = serializers.IntegerField(read_only=True)
     
@@ -37,14 +76,29 @@ class SeasonLogSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = SeasonLog
-        fields = ['id', 'status', 'season']
+        fields = ['id', 'status', 'league', 'season']
 
 class SurvivorSerializer(serializers.ModelSerializer):
+    img_srcset = serializers.SerializerMethodField()
+
     class Meta:
         model = Survivor
-        fields = ['id', 'first_name', 'last_name', 'age', 'img_url']
+        fields = ['id', 'first_name', 'last_name', 'age', 'img_url', 'img_srcset']
+
+    def get_img_srcset(self, obj):
+        return img_srcset(obj.img_url)
 
-class SurvivorLogSerializer(serializers.ModelSerializer):
+    def to_representation(self, instance):
+        # In normalized responses each survivor is rendered once into a side-loaded map
+        side_loaded_survivors = self.context.get('side_loaded_survivors')
+        if side_loaded_survivors is None:
+            return super().to_representation(instance)
+
+        if instance.id not in side_loaded_survivors:
+            side_loaded_survivors[instance.id] = super().to_representation(instance)
+        return instance.id
+
+class SurvivorLogSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     survivor = SurvivorSerializer(many=False)
 
     class Meta:
@@ -55,7 +109,7 @@ class SurvivorLogSerializer(serializers.ModelSerializer):
             'is_user_winner_pick', 'is_season_winner'
         ]
 
-class FavoriteSurvivorSerializer(serializers.ModelSerializer):
+class FavoriteSurvivorSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     survivor_log = SurvivorLogSerializer(many=False)
     
     class Meta:
@@ -107,7 +161,7 @@ class WonRewardSerializer(serializers.ModelSerializer):
         model = WonReward
         fields = ['id', 'survivor_log']
 
-class EpisodeLogSerializer(serializers.ModelSerializer):
+class EpisodeLogSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     episode = EpisodeSerializer(many=False)
     found_idols = FoundIdolSerializer(many=True, read_only=True)
     found_advantages = FoundAdvantageSerializer(many=True, read_only=True)
@@ -125,7 +179,10 @@ class EpisodeLogSerializer(serializers.ModelSerializer):
     def get_next_episode(self, obj):
         """Calculate the next episode number, considering season total"""
         current_episode = obj.episode.episode_number
-        total_episodes = obj.episode.season.total_episodes
+        # Views pass the season total in context so it is counted once per request
+        total_episodes = self.context.get('total_episodes')
+        if total_episodes is None:
+            total_episodes = obj.episode.season.total_episodes
 
         if current_episode < total_episodes:
             return current_episode + 1
@@ -155,6 +212,129 @@ class EpisodeLogCreateSerializer(serializers.Serializer):
         allow_empty=True
     )
 
+class EpisodeLogSubmissionSerializer(serializers.ModelSerializer):
+    """Serializer for the status of a queued episode log"""
+    episode_log = serializers.PrimaryKeyRelatedField(read_only=True)
+    error = serializers.SerializerMethodField()
+
+    class Meta:
+        model = EpisodeLogSubmission
+        fields = ['id', 'status', 'episode_number', 'episode_log', 'error', 'created_at', 'processed_at']
+
+    def get_error(self, obj):
+        return obj.error or None
+
+class EpisodeLogBatchCreateSerializer(serializers.Serializer):
+    """Serializer for logging several episodes at once, in the order they aired"""
+    episodes = serializers.ListField(
+        child=EpisodeLogCreateSerializer(),
+        allow_empty=False
+    )
+
+# Action models recorded per episode, with the name each is reported under
+ACTION_NAMES = {
+    FoundIdol: 'found_idols',
+    FoundAdvantage: 'found_advantages',
+    PlayedIdol: 'played_idols',
+    WonImmunity: 'won_immunities',
+    WonReward: 'won_rewards',
+}
+
+def build_episode_actions(episode_log, episode_number, survivor_entries, survivor_logs_by_id, actions):
+    """
+    Build the action records for one episode log without saving them
+
+    Args:
+        episode_log (EpisodeLog) -- the episode log the actions belong to
+        episode_number (int) -- episode number recorded for voted out survivors
+        survivor_entries (list) -- validated survivor_logs entries from EpisodeLogCreateSerializer
+        survivor_logs_by_id (dict) -- survivor logs for the entries, keyed by id
+        actions (dict) -- lists of unsaved action records keyed by action model, appended to in place
+
+    Returns: list -- survivor logs marked as voted out in this episode
+    """
+    voted_out_logs = []
+
+    for survivor_data in survivor_entries:
+        survivor_log = survivor_logs_by_id[survivor_data['id']]
+        episode_actions = survivor_data['episode_actions']
+
+        if episode_actions.get("found_idol"):
+            actions[FoundIdol].append(
+                FoundIdol(episode_log=episode_log, survivor_log=survivor_log)
+            )
+
+        if episode_actions.get("found_advantage"):
+            actions[FoundAdvantage].append(
+                FoundAdvantage(episode_log=episode_log, survivor_log=survivor_log)
+            )
+
+        if episode_actions.get("played_idol"):
+            actions[PlayedIdol].append(
+                PlayedIdol(episode_log=episode_log, survivor_log=survivor_log)
+            )
+
+        if episode_actions.get("won_immunity"):
+            actions[WonImmunity].append(
+                WonImmunity(
+                    episode_log=episode_log,
+                    survivor_log=survivor_log,
+                    is_individual=episode_actions.get("is_individual_immunity", False)
+                )
+            )
+
+        if episode_actions.get("won_reward"):
+            actions[WonReward].append(
+                WonReward(episode_log=episode_log, survivor_log=survivor_log)
+            )
+
+        if episode_actions.get("voted_out"):
+            survivor_log.is_active = False
+            survivor_log.episode_voted_out = episode_number
+            voted_out_logs.append(survivor_log)
+
+    return voted_out_logs
+
+def save_episode_actions(actions):
+    """
+    Bulk create action records with one query per action model and update the score summary
+
+    Args: actions (dict) -- lists of unsaved action records keyed by action model
+    """
+    for model, records in actions.items():
+        if records:
+            model.objects.bulk_create(records)
+
+    SurvivorScore.objects.increment(
+        found_advantages=actions[FoundAdvantage],
+        found_idols=actions[FoundIdol],
+        played_idols=actions[PlayedIdol],
+        won_immunities=actions[WonImmunity],
+        won_rewards=actions[WonReward]
+    )
+
+def episode_logs_with_actions(episode_logs):
+    """
+    Load episode logs together with every nested object EpisodeLogSerializer renders
+
+    Args: episode_logs (QuerySet) -- episode logs to serialize
+
+    Returns: QuerySet -- episode logs with episodes joined and actions prefetched,
+        so serializing any number of logs costs a fixed number of queries
+    """
+    action_prefetches = [
+        Prefetch(related_name, queryset=model.objects.select_related('survivor_log__survivor'))
+        for related_name, model in [
+            ('found_idols', FoundIdol),
+            ('found_advantages', FoundAdvantage),
+            ('played_idols', PlayedIdol),
+            ('won_immunities', WonImmunity),
+            ('won_rewards', WonReward),
+        ]
+    ]
+
+    return episode_logs.select_related('episode').prefetch_related(*action_prefetches)
+
 class SeasonLogs(viewsets.ModelViewSet):
     """
     ViewSet for handling season-related operations for users
@@ -163,6 +343,64 @@ class SeasonLogs(viewsets.ModelViewSet):
     serializer_class = SeasonLogSerializer
     permission_classes = [permissions.IsAuthenticated]
 
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+
+        if self.request.query_params.get('normalize') in ('true', '1'):
+            context['side_loaded_survivors'] = {}
+
+        return context
+
+    def shaped_data(self, serializer_class, instance, many=False, **kwargs):
+        """
+        Serialize with the response shape requested through query params
+
+        - `?fields=a,b` keeps only those fields of the top level objects
+        - `?expand=c` keeps nested object `c` inline instead of as an id when `fields` is used
+        - `?normalize=true` renders each survivor once in a side-loaded `survivors` map
+
+        Returns: dict or list -- serialized data
+        """
+        params = self.request.query_params
+        context = {**self.serializer_context, **kwargs.pop('context', {})}
+
+        if 'fields' in params:
+            kwargs['fields'] = [name for name in params['fields'].split(',') if name]
+            kwargs['expand'] = [name for name in params.get('expand', '').split(',') if name]
+
+        with serialization_timer():
+            return serializer_class(instance, many=many, context=context, **kwargs).data
+
+    def survivor_logs_data(self, survivor_logs):
+        """Serialize survivor logs, taking the fast path unless a sparse fieldset was requested"""
+        if 'fields' in self.request.query_params:
+            return self.shaped_data(SurvivorLogSerializer, survivor_logs, many=True)
+
+        with serialization_timer():
+            return fast_serializers.survivor_logs_data(
+                survivor_logs,
+                self.serializer_context.get('side_loaded_survivors')
+            )
+
+    @property
+    def serializer_context(self):
+        """Serializer context shared by every serializer in the current request"""
+        if not hasattr(self, '_serializer_context'):
+            self._serializer_context = self.get_serializer_context()
+        return self._serializer_context
+
+    def shaped_response(self, data, status_code=status.HTTP_200_OK):
+        """Add the side-loaded survivors map to normalized responses"""
+        side_loaded_survivors = self.serializer_context.get('side_loaded_survivors')
+
+        if side_loaded_survivors is not None:
+            if isinstance(data, dict):
+                data = {**data, 'survivors': side_loaded_survivors}
+            else:
+                data = {'results': data, 'survivors': side_loaded_survivors}
+
+        return Response(data, status=status_code)
+
     def get_queryset(self):
         """
         This method is used by retrieve, update, and destroy actions
@@ -172,24 +410,40 @@ class SeasonLogs(viewsets.ModelViewSet):
     def list(self, request):
         user = request.auth.user
 
-        # Filter season logs by status directly from the database
-        active_seasons = SeasonLog.objects.filter(
-            user=user, status="active"
+        # Let polling clients revalidate without loading or serializing anything
+        etag = self.season_logs_etag(user)
+        if etag in parse_etags(request.headers.get('If-None-Match', '')):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+
+        # Fetch all of the user's season logs, with their season and its episode count, in one query
+        season_logs = SeasonLog.objects.filter(user=user).select_related('season').annotate(
+            season_total_episodes=Count('season__episodes')
         ).order_by('created_on')
 
-        completed_seasons = SeasonLog.objects.filter(
-            user=user, status="complete"
-        ).order_by('completed_on')
-        
-        # Get all seasons and exclude the ones that already have a season log for the user
-        logged_seasons = SeasonLog.objects.filter(user=user).values_list('season_id', flat=True)
-        inactive_seasons = Season.objects.exclude(
-            id__in=logged_seasons
-        ).order_by('season_number')
+        active_seasons = []
+        completed_seasons = []
+        for season_log in season_logs:
+            season_log.season.total_episodes_count = season_log.season_total_episodes
+
+            if season_log.status == "active":
+                active_seasons.append(season_log)
+            elif season_log.status == "complete":
+                completed_seasons.append(season_log)
 
-        serialized_active_seasons = SeasonLogSerializer(active_seasons, many=True).data
-        serialized_completed_seasons = SeasonLogSerializer(completed_seasons, many=True).data
-        serialized_inactive_seasons = SeasonSerializer(inactive_seasons, many=True).data
+        # Match the database's ascending order, which puts logs without a completion date first
+        completed_seasons.sort(
+            key=lambda season_log: (season_log.completed_on is not None, season_log.completed_on)
+        )
+
+        # Get all seasons that do not have a season log for the user
+        inactive_seasons = list(Season.objects.with_total_episodes().filter(
+            ~Exists(SeasonLog.objects.filter(user=user, season=OuterRef('pk')))
+        ).order_by('season_number'))
+
+        with serialization_timer():
+            serialized_active_seasons = [fast_serializers.season_log_data(log) for log in active_seasons]
+            serialized_completed_seasons = [fast_serializers.season_log_data(log) for log in completed_seasons]
+            serialized_inactive_seasons = [fast_serializers.season_data(season) for season in inactive_seasons]
 
         response_data = {
             "active": serialized_active_seasons,
@@ -197,7 +451,51 @@ class SeasonLogs(viewsets.ModelViewSet):
             "inactive": serialized_inactive_seasons
         }
 
-        return Response(response_data, status=status.HTTP_200_OK)
+        return Response(response_data, status=status.HTTP_200_OK, headers={'ETag': etag})
+
+    def season_logs_etag(self, user):
+        """
+        Build an ETag for the season log dashboard of a user
+
+        Changes whenever one of the user's season logs is created, modified or
+        deleted, a season or episode is added or removed, or any season field
+        changes. Edits to seasons are caught through the catalog generation,
+        which every season and episode write bumps.
+
+        Returns: str -- quoted ETag
+        """
+        season_log_state = SeasonLog.objects.filter(user=user).aggregate(
+            count=Count('id'),
+            last_modified=Max('modified_on')
+        )
+        season_state = Season.objects.aggregate(
+            count=Count('id', distinct=True),
+            last_id=Max('id'),
+            episode_count=Count('episodes'),
+            last_episode_id=Max('episodes__id')
+        )
+
+        state = f"{user.id}:{season_log_state}:{season_state}:{catalog_generation()['generation']}"
+        return quote_etag(hashlib.md5(state.encode(), usedforsecurity=False).hexdigest())
+
+    @action(detail=False, methods=['get'], url_path='export')
+    def export(self, request):
+        """
+        Stream everything the user has logged as newline delimited JSON
+
+        Rows are read in keyset pages and written as they are fetched, so
+        memory stays flat no matter how many seasons the user has logged.
+        Under ASGI the rows come from an async generator, since Django would
+        read a sync iterator whole before sending it.
+        """
+        if isinstance(request._request, ASGIRequest):
+            rows = aexport_user_history(request.auth.user)
+        else:
+            rows = export_user_history(request.auth.user)
+
+        response = StreamingHttpResponse(rows, content_type='application/x-ndjson')
+        response['Content-Disposition'] = 'attachment; filename="season-logs.ndjson"'
+        return response
 
     def create(self, request):
         """Handle POST operations for creating a new season log"""
@@ -207,21 +505,14 @@ class SeasonLogs(viewsets.ModelViewSet):
         try:
             season = Season.objects.get(pk=season_id)
 
-            # Check to see if season log already exists in the database for user
-            existing_log = SeasonLog.objects.filter(user=user, season=season).first()
-            if existing_log:
-                return Response(
-                    {"message": "A season log for this season already exists."},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-
             # Use transaction to ensure all-or-nothing creation of logs
             with transaction.atomic():
                 # Create season log
                 season_log = SeasonLog.objects.create(
                     user=user,
                     season=season,
-                    status="active"
+                    status="active",
+                    league=request.data.get("league") or DEFAULT_LEAGUE
                 )
 
                 # Get all survivors for this season
@@ -246,6 +537,13 @@ class SeasonLogs(viewsets.ModelViewSet):
                 
             serializer = SeasonLogSerializer(season_log)
             return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+        # The unique (user, season) constraint rejects duplicates, even from concurrent requests
+        except IntegrityError:
+            return Response(
+                {"message": "A season log for this season already exists."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
          
         except Exception as ex:
             return Response({"reason": ex.args[0]}, status=status.HTTP_400_BAD_REQUEST)
@@ -278,21 +576,25 @@ class SeasonLogs(viewsets.ModelViewSet):
         if request.method == 'GET':
             if survivor_log_pk:
                 try:
-                    survivor_log = SurvivorLog.objects.get(
+                    survivor_log = SurvivorLog.objects.select_related('survivor').get(
                         pk=survivor_log_pk,
                         season_log=season_log
                     )
-                    serializer = SurvivorLogSerializer(survivor_log)
-                    return Response(serializer.data)
+                    return self.shaped_response(self.shaped_data(SurvivorLogSerializer, survivor_log))
                 except SurvivorLog.DoesNotExist:
                     return Response(
                         {"message": "Survivor log not found"},
                         status=status.HTTP_404_NOT_FOUND
                     )
             else:
-                survivor_logs = SurvivorLog.objects.filter(season_log=season_log)
-                serializer = SurvivorLogSerializer(survivor_logs, many=True)
-                return Response(serializer.data)
+                survivor_logs = SurvivorLog.objects.filter(season_log=season_log).select_related('survivor')
+
+                page = self.paginate_queryset(survivor_logs)
+                if page is not None:
+                    paginated = self.get_paginated_response(self.survivor_logs_data(page))
+                    return self.shaped_response(paginated.data)
+
+                return self.shaped_response(self.survivor_logs_data(survivor_logs))
         
         # Need to add logic for updating survivor-logs
         # But also this logic might exist in other methods, like the episode_log method
@@ -306,13 +608,12 @@ class SeasonLogs(viewsets.ModelViewSet):
 
         if request.method == 'GET':
             try:
-                winner_pick = SurvivorLog.objects.get(
+                winner_pick = SurvivorLog.objects.select_related('survivor').get(
                     season_log=season_log,
                     user=request.auth.user,
                     is_user_winner_pick=True
                 )
-                serializer = SurvivorLogSerializer(winner_pick, many=False)
-                return Response(serializer.data, status=status.HTTP_200_OK)
+                return self.shaped_response(self.shaped_data(SurvivorLogSerializer, winner_pick))
             except SurvivorLog.DoesNotExist:
                 # Return null when no winner is picked yet
                 return Response("", status=status.HTTP_200_OK)
@@ -326,30 +627,42 @@ class SeasonLogs(viewsets.ModelViewSet):
                 )
             
             try:
-                # Verify the survivor_log exists and belongs to this season_log
-                survivor_log = SurvivorLog.objects.get(
-                    pk=survivor_log_id,
-                    season_log=season_log,
-                    user=request.auth.user
-                )
-
-                # Check to see if there is already a winner pick for the season log
-                existing_winner_pick = SurvivorLog.objects.filter(
-                    season_log=season_log,
-                    is_user_winner_pick=True
-                ).first()
-
-                if existing_winner_pick:
-                    existing_winner_pick.is_user_winner_pick = False
-                    existing_winner_pick.save()
-                
-                survivor_log.is_user_winner_pick = True
-                survivor_log.save()
+                with transaction.atomic():
+                    if connection.features.has_select_for_update:
+                        # Queue concurrent pick changes for this season log behind each other
+                        SeasonLog.objects.select_for_update().filter(pk=season_log.pk).exists()
+
+                    # Lock the new pick and the current one together, the response is built from them
+                    survivor_logs = SurvivorLog.objects.select_for_update(of=('self',)).select_related(
+                        'survivor'
+                    ).filter(
+                        Q(pk=survivor_log_id, user=request.auth.user) | Q(is_user_winner_pick=True),
+                        season_log=season_log
+                    )
+                    survivor_log = None
+                    old_picks = []
+                    for candidate in survivor_logs:
+                        is_new_pick = str(candidate.pk) == str(survivor_log_id)
+                        if is_new_pick and candidate.user_id == request.auth.user_id:
+                            survivor_log = candidate
+                        else:
+                            old_picks.append(candidate.pk)
+
+                    if survivor_log is None:
+                        raise SurvivorLog.DoesNotExist
+
+                    # The partial unique index is checked row by row, so clear the old pick first
+                    if old_picks:
+                        SurvivorLog.objects.filter(pk__in=old_picks).update(is_user_winner_pick=False)
+
+                    if not survivor_log.is_user_winner_pick:
+                        SurvivorLog.objects.filter(pk=survivor_log.pk).update(is_user_winner_pick=True)
+                        survivor_log.is_user_winner_pick = True
 
                 serializer = SurvivorLogSerializer(survivor_log, many=False)
-                return Response(serializer.data, status=status.HTTP_200_OK)   
-                       
-            except SurvivorLog.DoesNotExist:
+                return Response(serializer.data, status=status.HTTP_200_OK)
+
+            except (SurvivorLog.DoesNotExist, ValueError):
                 return Response(
                     {"message": "Invalid survivor_log_id"},
                     status=status.HTTP_400_BAD_REQUEST
@@ -372,9 +685,8 @@ class SeasonLogs(viewsets.ModelViewSet):
             favorites = FavoriteSurvivor.objects.filter(
                 survivor_log__season_log=season_log,
                 survivor_log__user=request.auth.user
-            )
-            serializer = FavoriteSurvivorSerializer(favorites, many=True)
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            ).select_related('survivor_log__survivor')
+            return self.shaped_response(self.shaped_data(FavoriteSurvivorSerializer, favorites, many=True))
         
         elif request.method == 'POST':
             survivor_log_id = request.data.get("survivor_log_id")
@@ -453,6 +765,11 @@ class SeasonLogs(viewsets.ModelViewSet):
                     user=request.auth.user
                 )
                 notes = SurvivorNote.objects.filter(survivor_log=survivor_log)
+
+                page = self.paginate_queryset(notes)
+                if page is not None:
+                    return self.get_paginated_response(SurvivorNoteSerializer(page, many=True).data)
+
                 serializer = SurvivorNoteSerializer(notes, many=True)
                 return Response(serializer.data, status=status.HTTP_200_OK)
             except SurvivorLog.DoesNotExist:
@@ -507,7 +824,7 @@ class SeasonLogs(viewsets.ModelViewSet):
                     )
                 
                 note.text = text
-                note.save()
+                note.save(update_fields=['text'])
                 serializer = SurvivorNoteSerializer(note)
                 return Response(serializer.data, status=status.HTTP_200_OK)
             
@@ -544,30 +861,57 @@ class SeasonLogs(viewsets.ModelViewSet):
     
     @action(detail=True, methods=['get', 'post'], url_path="episodes")
     def episode_logs(self, request, pk=None):
+        """
+        GET the season log's episode logs, POST a new one
+
+        On GET, `?fields=` and `?expand=` shape the episode logs, so unexpanded
+        actions are rendered as ids. Active survivors keep their full shape.
+        """
         season_log = self.get_object()
 
         if request.method == 'GET':
             # Get all episode logs for the season
-            episode_logs = EpisodeLog.objects.filter(
-                season_log=season_log,
-                user=request.auth.user
-            ).order_by('episode__episode_number')
+            episode_logs = list(episode_logs_with_actions(
+                EpisodeLog.objects.filter(
+                    season_log=season_log,
+                    user=request.auth.user
+                ).order_by('episode__episode_number')
+            ))
 
             # Get active survivors for the season
             active_survivors = SurvivorLog.objects.filter(
                 season_log=season_log,
                 is_active=True,
                 episode_voted_out__isnull=True
-            )
+            ).select_related('survivor')
 
             # Calculate next episode number
             total_episodes = season_log.season.total_episodes
-            current_episode_count = episode_logs.count()
+            current_episode_count = len(episode_logs)
             next_episode = None if current_episode_count >= total_episodes else current_episode_count + 1
 
-            # Serialize the data
-            serialized_episode_logs = EpisodeLogSerializer(episode_logs, many=True).data
-            serialized_active_survivors = SurvivorLogSerializer(active_survivors, many=True).data
+            # Serialize through the fast path unless a sparse fieldset was requested,
+            # it matches EpisodeLogSerializer and SurvivorLogSerializer
+            side_loaded_survivors = self.serializer_context.get('side_loaded_survivors')
+            if 'fields' in request.query_params:
+                serialized_episode_logs = self.shaped_data(
+                    EpisodeLogSerializer,
+                    episode_logs,
+                    many=True,
+                    context={'total_episodes': total_episodes}
+                )
+            else:
+                with serialization_timer():
+                    serialized_episode_logs = fast_serializers.episode_logs_data(
+                        episode_logs,
+                        total_episodes,
+                        side_loaded_survivors
+                    )
+            with serialization_timer():
+                serialized_active_survivors = fast_serializers.survivor_logs_data(
+                    active_survivors,
+                    side_loaded_survivors
+                )
 
             response_data = {
                 'episode_logs': serialized_episode_logs,
@@ -576,7 +920,7 @@ class SeasonLogs(viewsets.ModelViewSet):
                 'total_episodes': total_episodes
             }
 
-            return Response(response_data, status=status.HTTP_200_OK)
+            return self.shaped_response(response_data)
         
         if request.method == 'POST':
             # Validate the request data
@@ -591,11 +935,15 @@ class SeasonLogs(viewsets.ModelViewSet):
                 episode_number = validated_data['episode_number']
 
                 # Add validation for episode number
-                if episode_number > season_log.season.total_episodes:
+                total_episodes = season_log.season.total_episodes
+                if episode_number > total_episodes:
                     return Response(
-                        {"message": f"Episode number cannot exceed season total of {season_log.season.total_episodes}"},
+                        {"message": f"Episode number cannot exceed season total of {total_episodes}"},
                         status=status.HTTP_400_BAD_REQUEST
                     )
+
+                if episode_log_ingestion_settings()['QUEUED']:
+                    return self.enqueue_episode_log(request, season_log, validated_data)
                 
                 episode = Episode.objects.get(
                     season=season_log.season,
@@ -618,14 +966,23 @@ class SeasonLogs(viewsets.ModelViewSet):
                 # Validate survivor_log ids and collect them
                 survivor_logs = validated_data['survivor_logs']
                 survivor_log_ids = [sl['id'] for sl in survivor_logs]
-                
-                valid_survivor_logs = SurvivorLog.objects.filter(
-                    id__in=survivor_log_ids,
-                    season_log=season_log,
-                    is_active=True
-                )
 
-                if len(valid_survivor_logs) != len(survivor_log_ids):
+                if len(set(survivor_log_ids)) != len(survivor_log_ids):
+                    return Response(
+                        {"message": "Duplicate survivor log IDs"},
+                        status=status.HTTP_400_BAD_REQUEST
+                    )
+
+                survivor_logs_by_id = {
+                    survivor_log.id: survivor_log
+                    for survivor_log in SurvivorLog.objects.filter(
+                        id__in=survivor_log_ids,
+                        season_log=season_log,
+                        is_active=True
+                    )
+                }
+
+                if len(survivor_logs_by_id) != len(survivor_log_ids):
                     return Response(
                         {"message": "One or more invalid or inactive survivor log IDs"},
                         status=status.HTTP_400_BAD_REQUEST
@@ -639,77 +996,16 @@ class SeasonLogs(viewsets.ModelViewSet):
                         season_log=season_log
                     )
 
-                    # Create lists for bulk operations
-                    found_idols = []
-                    found_advantages = []
-                    played_idols = []
-                    won_immunities = []
-                    won_rewards = []
-                    voted_out_logs = []
-
-                    for survivor_data in survivor_logs:
-                        survivor_log = next(
-                            sl for sl in valid_survivor_logs if sl.id == survivor_data['id']
-                        )
-                        actions = survivor_data['episode_actions']
-
-                        if actions.get("found_idol"):
-                            found_idols.append(
-                                FoundIdol(
-                                    episode_log=episode_log,
-                                    survivor_log=survivor_log
-                                )
-                            )
-                        
-                        if actions.get("found_advantage"):
-                            found_advantages.append(
-                                FoundAdvantage(
-                                    episode_log=episode_log,
-                                    survivor_log=survivor_log
-                                )
-                            )
-                        
-                        if actions.get("played_idol"):
-                            played_idols.append(
-                                PlayedIdol(
-                                    episode_log=episode_log,
-                                    survivor_log=survivor_log
-                                )
-                            )
-                        
-                        if actions.get("won_immunity"):
-                            won_immunities.append(
-                                WonImmunity(
-                                    episode_log=episode_log,
-                                    survivor_log=survivor_log,
-                                    is_individual=actions.get("is_individual_immunity", False)
-                                )
-                            )
-                        
-                        if actions.get("won_reward"):
-                            won_rewards.append(
-                                WonReward(
-                                    episode_log=episode_log,
-                                    survivor_log=survivor_log,
-                                )
-                            )
-                        
-                        if actions.get("voted_out"):
-                            survivor_log.is_active = False
-                            survivor_log.episode_voted_out = episode.episode_number
-                            voted_out_logs.append(survivor_log)
-
-                    # Bulk create all action records
-                    if found_idols:
-                        FoundIdol.objects.bulk_create(found_idols)
-                    if found_advantages:
-                        FoundAdvantage.objects.bulk_create(found_advantages)
-                    if played_idols:
-                        PlayedIdol.objects.bulk_create(played_idols)
-                    if won_immunities:
-                        WonImmunity.objects.bulk_create(won_immunities)
-                    if won_rewards:
-                        WonReward.objects.bulk_create(won_rewards)
+                    # Build and bulk create all action records
+                    actions = {model: [] for model in ACTION_NAMES}
+                    voted_out_logs = build_episode_actions(
+                        episode_log,
+                        episode.episode_number,
+                        survivor_logs,
+                        survivor_logs_by_id,
+                        actions
+                    )
+                    save_episode_actions(actions)
 
                     # Bulk update voted out survivors
                     if voted_out_logs:
@@ -719,16 +1015,22 @@ class SeasonLogs(viewsets.ModelViewSet):
                         )
 
                     # Refresh episode log and get updated data
-                    episode_log.refresh_from_db()
-                    active_survivors = SurvivorLog.objects.filter(
+                    episode_log = episode_logs_with_actions(
+                        EpisodeLog.objects.filter(pk=episode_log.pk)
+                    ).get()
+                    active_survivors = list(SurvivorLog.objects.filter(
                         season_log=season_log,
                         is_active=True
-                    )
+                    ).select_related('survivor'))
 
-                    response_data = {
-                        'episode_log': EpisodeLogSerializer(episode_log).data,
-                        'active_survivors': SurvivorLogSerializer(active_survivors, many=True).data
-                    }
+                    with serialization_timer():
+                        response_data = {
+                            'episode_log': EpisodeLogSerializer(
+                                episode_log,
+                                context={'total_episodes': total_episodes}
+                            ).data,
+                            'active_survivors': SurvivorLogSerializer(active_survivors, many=True).data
+                        }
 
                     return Response(response_data, status=status.HTTP_201_CREATED)
 
@@ -741,4 +1043,182 @@ class SeasonLogs(viewsets.ModelViewSet):
                 return Response(
                     {"message": str(ex)},
                     status=status.HTTP_400_BAD_REQUEST
-                )
\ No newline at end of file
+                )
+
+    def enqueue_episode_log(self, request, season_log, validated_data):
+        """
+        Store a validated episode log for the ingestion workers and answer 202
+
+        Only checks that need no other queued submission run here, the workers
+        check the episode and cast when they write it, see survivorapi/ingestion.py.
+        """
+        survivor_log_ids = [sl['id'] for sl in validated_data['survivor_logs']]
+        if len(set(survivor_log_ids)) != len(survivor_log_ids):
+            return Response(
+                {"message": "Duplicate survivor log IDs"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        submission = EpisodeLogSubmission.objects.create(
+            season_log=season_log,
+            user=request.auth.user,
+            episode_number=validated_data['episode_number'],
+            payload=validated_data
+        )
+
+        return Response(
+            {'submission': EpisodeLogSubmissionSerializer(submission).data},
+            status=status.HTTP_202_ACCEPTED,
+            headers={
+                'Location': f"/season-logs/{season_log.id}/episodes/submissions/{submission.id}",
+                'Retry-After': str(episode_log_ingestion_settings()['RETRY_AFTER']),
+            }
+        )
+
+    @action(detail=True, methods=['get'], url_path="episodes/submissions/(?P<submission_pk>[^/.]+)")
+    def episode_log_submission(self, request, pk=None, submission_pk=None):
+        """Handle GET operations for polling the status of a queued episode log"""
+        try:
+            submission = EpisodeLogSubmission.objects.get(
+                pk=submission_pk,
+                season_log_id=pk,
+                user=request.auth.user
+            )
+        except (EpisodeLogSubmission.DoesNotExist, ValueError):
+            return Response(
+                {"message": "Submission not found"},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        headers = {}
+        if submission.status in (EpisodeLogSubmission.PENDING, EpisodeLogSubmission.PROCESSING):
+            headers['Retry-After'] = str(episode_log_ingestion_settings()['RETRY_AFTER'])
+
+        return Response(
+            {'submission': EpisodeLogSubmissionSerializer(submission).data},
+            status=status.HTTP_200_OK,
+            headers=headers
+        )
+
+    @action(detail=True, methods=['post'], url_path="episodes/batch")
+    def batch_episode_logs(self, request, pk=None):
+        """
+        Handle POST operations for logging several episodes in one transaction
+
+        Episodes are validated in order against an in-memory copy of the cast,
+        so a survivor voted out in one episode cannot act in a later one.
+        """
+        season_log = self.get_object()
+        user = request.auth.user
+
+        serializer = EpisodeLogBatchCreateSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        episode_payloads = serializer.validated_data['episodes']
+
+        episodes_by_number = {
+            episode.episode_number: episode
+            for episode in Episode.objects.filter(season_id=season_log.season_id)
+        }
+        logged_episode_ids = set(
+            EpisodeLog.objects.filter(
+                user=user,
+                season_log=season_log
+            ).values_list('episode_id', flat=True)
+        )
+        survivor_logs_by_id = {
+            survivor_log.id: survivor_log
+            for survivor_log in SurvivorLog.objects.filter(season_log=season_log, is_active=True)
+        }
+        active_survivor_logs = dict(survivor_logs_by_id)
+
+        # Simulate the batch against the active cast before writing anything
+        episode_logs = []
+        for episode_data in episode_payloads:
+            episode_number = episode_data['episode_number']
+            episode = episodes_by_number.get(episode_number)
+
+            if episode is None:
+                return Response(
+                    {"message": f"Episode {episode_number} not found"},
+                    status=status.HTTP_404_NOT_FOUND
+                )
+
+            if episode.id in logged_episode_ids:
+                return Response(
+                    {"message": f"Episode log already exists for episode {episode_number}"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+            survivor_log_ids = [sl['id'] for sl in episode_data['survivor_logs']]
+            if len(set(survivor_log_ids)) != len(survivor_log_ids):
+                return Response(
+                    {"message": f"Duplicate survivor log IDs in episode {episode_number}"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+            if any(survivor_log_id not in active_survivor_logs for survivor_log_id in survivor_log_ids):
+                return Response(
+                    {"message": f"One or more invalid or inactive survivor log IDs in episode {episode_number}"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+            logged_episode_ids.add(episode.id)
+            for survivor_data in episode_data['survivor_logs']:
+                if survivor_data['episode_actions'].get("voted_out"):
+                    del active_survivor_logs[survivor_data['id']]
+
+            episode_logs.append(
+                EpisodeLog(user=user, episode=episode, season_log=season_log)
+            )
+
+        actions = {model: [] for model in ACTION_NAMES}
+        voted_out_logs = []
+
+        try:
+            with transaction.atomic():
+                EpisodeLog.objects.bulk_create(episode_logs)
+
+                for episode_log, episode_data in zip(episode_logs, episode_payloads):
+                    voted_out_logs += build_episode_actions(
+                        episode_log,
+                        episode_data['episode_number'],
+                        episode_data['survivor_logs'],
+                        survivor_logs_by_id,
+                        actions
+                    )
+
+                save_episode_actions(actions)
+
+                if voted_out_logs:
+                    SurvivorLog.objects.bulk_update(
+                        voted_out_logs,
+                        ['is_active', 'episode_voted_out']
+                    )
+
+        except Exception as ex:
+            return Response(
+                {"message": str(ex)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        total_episodes = season_log.season.total_episodes
+        logged_count = len(logged_episode_ids)
+
+        response_data = {
+            'episode_logs': [
+                {'id': episode_log.id, 'episode_number': episode_log.episode.episode_number}
+                for episode_log in episode_logs
+            ],
+            'actions': {
+                ACTION_NAMES[model]: len(records)
+                for model, records in actions.items()
+            },
+            'voted_out': [survivor_log.id for survivor_log in voted_out_logs],
+            'active_survivor_count': len(active_survivor_logs),
+            'next_episode': None if logged_count >= total_episodes else logged_count + 1,
+            'total_episodes': total_episodes
+        }
+
+        return Response(response_data, status=status.HTTP_201_CREATED)
@@ -3,8 +3,10 @@ from rest_framework import viewsets, permissions
 from rest_framework.response import Response
 from rest_framework import serializers
 from rest_framework import status
-# from rest_framework.decorators import action
-from survivorapi.models import Season
+from rest_framework.decorators import action
+from survivorapi.models import Season, SeasonLog
+from survivorapi.models.scoring_rule import DEFAULT_LEAGUE
+from survivorapi.views.catalog_cache import CatalogCacheMixin
 
 class SeasonSerializer(serializers.ModelSerializer):
     class Meta:
@@ -14,7 +16,7 @@ class SeasonSerializer(serializers.ModelSerializer):
             'start_date', 'end_date', 'is_current', 'total_episodes'
         ]
 
-class Seasons(viewsets.ModelViewSet):
+class Seasons(CatalogCacheMixin, viewsets.ModelViewSet):
     """
     A ViewSet for viewing, creating, deleting, and updating Season instances.
 
@@ -33,11 +35,11 @@ class Seasons(viewsets.ModelViewSet):
             token: ec7ddcc665035a3adeaa80ed8f812bfe3ef5b5f4
 
     """
-    queryset = Season.objects.all()
+    queryset = Season.objects.with_total_episodes()
     serializer_class = SeasonSerializer
 
     def get_permissions(self):
-        if self.action in ['list', 'retrieve']:
+        if self.action in ['list', 'retrieve', 'leaderboard']:
             permission_classes = [permissions.IsAuthenticated]
         else:
             permission_classes = [permissions.IsAdminUser]
@@ -58,4 +60,57 @@ class Seasons(viewsets.ModelViewSet):
             serializer = SeasonSerializer(season)
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         except Exception as ex:
-            return Response({"reason": ex.args[0]}, status=status.HTTP_400_BAD_REQUEST)
\ No newline at end of file
+            return Response({"reason": ex.args[0]}, status=status.HTTP_400_BAD_REQUEST)
+
+    @action(detail=True, methods=['get'])
+    def leaderboard(self, request, pk=None):
+        """
+        Rank every user's season log for the season within one league
+
+        Query params:
+            limit (int) -- number of top entries returned, 100 by default and at most 1000
+            league (str) -- league whose season logs are ranked, by its scoring rules, the default league by default
+
+        Returns: the top entries plus the requesting user's own entry under `me`
+        """
+        try:
+            limit = min(int(request.query_params.get('limit', 100)), 1000)
+        except ValueError:
+            return Response({"message": "limit must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+
+        league = request.query_params.get('league', DEFAULT_LEAGUE)
+        season = self.get_object()
+        league_logs = SeasonLog.objects.filter(season=season, league=league)
+        standings = league_logs.ranked(league).values(
+            'id', 'rank', 'user_id', 'user__username', 'winner_pick_correct', 'total_points'
+        )
+
+        def entry(row):
+            return {
+                'rank': row['rank'],
+                'season_log': row['id'],
+                'user': {'id': row['user_id'], 'username': row['user__username']},
+                'winner_pick_correct': row['winner_pick_correct'],
+                'total_points': row['total_points'],
+            }
+
+        leaderboard = [entry(row) for row in standings[:max(limit, 0)]]
+        me = next((row for row in leaderboard if row['user']['id'] == request.auth.user.id), None)
+        if me is None:
+            own_row = league_logs.filter(user=request.auth.user).with_standing(league).values(
+                'id', 'user_id', 'user__username', 'winner_pick_correct', 'total_points'
+            ).first()
+            if own_row is not None:
+                own_row['rank'] = league_logs.rank_of(
+                    own_row['winner_pick_correct'],
+                    own_row['total_points'],
+                    league
+                )
+                me = entry(own_row)
+
+        return Response({
+            'season': season.id,
+            'league': league,
+            'leaderboard': leaderboard,
+            'me': me,
+        }, status=status.HTTP_200_OK)
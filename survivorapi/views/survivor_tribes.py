@@ -3,6 +3,7 @@ from rest_framework.response import Response
 from rest_framework import serializers
 from rest_framework import status
 from survivorapi.models import SurvivorTribe, Survivor, Tribe, Season
+from survivorapi.views.catalog_cache import CatalogCacheMixin
 
 class SeasonSerializer(serializers.ModelSerializer):
     class Meta:
@@ -40,7 +41,7 @@ class SurvivorTribeSerializer(serializers.ModelSerializer):
         model = SurvivorTribe
         fields = ['id', 'survivor', 'tribe', 'survivor_id', 'tribe_id']
 
-class SurvivorTribes(viewsets.ModelViewSet):
+class SurvivorTribes(CatalogCacheMixin, viewsets.ModelViewSet):
     """
     A ViewSet for viewing and managing survivor-tribe relationships
     """
@@ -62,7 +63,7 @@ class SurvivorTribes(viewsets.ModelViewSet):
         Optionally filter survivor-tribe relationships by survivor_id,
         tribe_id, or season_id query params
         """
-        queryset = SurvivorTribe.objects.all()
+        queryset = SurvivorTribe.objects.select_related('survivor__season', 'tribe')
 
         survivor_id = self.request.query_params.get('survivor', None)
         tribe_id = self.request.query_params.get('tribe', None)
@@ -3,6 +3,8 @@ from rest_framework.response import Response
 from rest_framework import serializers
 from rest_framework import status
 from survivorapi.models import Survivor, Season
+from survivorapi.media import img_srcset
+from survivorapi.views.catalog_cache import CatalogCacheMixin
 
 class SeasonSerializer(serializers.ModelSerializer):
     class Meta:
@@ -15,12 +17,16 @@ class SeasonSerializer(serializers.ModelSerializer):
 class SurvivorSerializer(serializers.ModelSerializer):
     season = SeasonSerializer(read_only=True) # For GET requests
     season_id = serializers.IntegerField(write_only=True) # For POST/PUT requests
+    img_srcset = serializers.SerializerMethodField()
     
     class Meta:
         model = Survivor
-        fields = ['id', 'season', 'season_id', 'first_name', 'last_name', 'age', 'img_url']
+        fields = ['id', 'season', 'season_id', 'first_name', 'last_name', 'age', 'img_url', 'img_srcset']
 
-class Survivors(viewsets.ModelViewSet):
+    def get_img_srcset(self, obj):
+        return img_srcset(obj.img_url)
+
+class Survivors(CatalogCacheMixin, viewsets.ModelViewSet):
     """
     A ViewSet for viewing, creating, deleting, and updating Survivor instances.
     
@@ -48,7 +54,7 @@ class Survivors(viewsets.ModelViewSet):
         Optionally restricts the returned survivors to a given season,
         by filtering against a 'season' query param in the URL
         """
-        queryset = Survivor.objects.all()
+        queryset = Survivor.objects.select_related('season')
         season = self.request.query_params.get('season_number', None)
 
         if season is not None:
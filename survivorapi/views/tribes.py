@@ -3,6 +3,7 @@ from rest_framework.response import Response
 from rest_framework import serializers
 from rest_framework import status
 from survivorapi.models import Tribe, Season
+from survivorapi.views.catalog_cache import CatalogCacheMixin
 
 class SeasonSerializer(serializers.ModelSerializer):
     class Meta:
@@ -20,7 +21,7 @@ class TribeSerializer(serializers.ModelSerializer):
         model = Tribe
         fields = ['id', 'season', 'season_id', 'name', 'color', 'is_merge_tribe']
 
-class Tribes(viewsets.ModelViewSet):
+class Tribes(CatalogCacheMixin, viewsets.ModelViewSet):
     """
     A ViewSet for viewing, creating, deleting, and updating Tribe instances.
     """
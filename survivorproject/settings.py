@@ -1,4 +1,6 @@
 
+import os
+import sys
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -14,6 +16,9 @@ SECRET_KEY = 'django-insecure-x9yg09-pv69(#mz@!n(1&c_rxvks#3*v&#vx!%t39p(n(f0gbb
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = True
 
+# Running under `manage.py test`
+TESTING = len(sys.argv) > 1 and sys.argv[1] == 'test'
+
 ALLOWED_HOSTS = []
 
 
@@ -34,11 +39,60 @@ INSTALLED_APPS = [
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework.authentication.TokenAuthentication',
+        'survivorapi.authentication.CachedTokenAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'survivorapi.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'survivorapi.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+    'DEFAULT_PAGINATION_CLASS': 'survivorapi.pagination.KeysetPagination',
+    'PAGE_SIZE': 100,
+}
+
+# In-process cache of auth tokens, see survivorapi/authentication.py
+TOKEN_AUTH_CACHE = {
+    'MAX_SIZE': 1024,
+    'TTL': 300,
+    'USE_DJANGO_CACHE': False,
+}
+
+# Cached responses for the seasons, survivors, tribes and survivor-tribes endpoints
+CATALOG_CACHE = {
+    'TIMEOUT': 3600,
+}
+
+# Per-route query, latency and size instrumentation, see survivorapi/middleware.py
+REQUEST_METRICS = {
+    'SERVER_TIMING': True,
+    # Keyed by method and route, a cold token cache adds one query
+    'QUERY_BUDGETS': {
+        'GET season-log-list': 6,
+        'GET season-log-episode-logs': 10,
+        # Plus the scoring rule check, and scoring survivor logs that have no score yet
+        'POST season-log-episode-logs': 28,
+        'GET season-log-episode-log-submission': 2,
+        'GET season-log-survivor-logs': 3,
+        'GET season-list': 3,
+        'GET survivor-list': 3,
+    },
+    # Fail tests on a route over its budget, only log it when serving
+    'RAISE_ON_BUDGET': TESTING,
+    # Write per-process histograms for `manage.py dump_request_metrics`
+    'DUMP': os.environ.get('REQUEST_METRICS_DUMP', '').lower() in ('1', 'true', 'yes'),
+}
+
+# Queue episode log POSTs for `manage.py process_episode_log_queue`, see survivorapi/ingestion.py
+EPISODE_LOG_INGESTION = {
+    'QUEUED': os.environ.get('EPISODE_LOG_QUEUED', '').lower() in ('1', 'true', 'yes'),
+    'BATCH_SIZE': 500,
 }
 
 CORS_ORIGIN_WHITELIST = (
@@ -50,6 +104,7 @@ CORS_ORIGIN_WHITELIST = (
 
 
 MIDDLEWARE = [
+    'survivorapi.middleware.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
@@ -84,12 +139,49 @@ WSGI_APPLICATION = 'survivorproject.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/4.0/ref/settings/#databases
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+# DB_ENGINE picks the backend: "sqlite" (default) or "postgres", which needs psycopg 3
+# and, for DB_POOL, its pool extra, both from psycopg[binary,pool] in the Pipfile
+DB_ENGINE = os.environ.get('DB_ENGINE', 'sqlite')
+
+if DB_ENGINE == 'postgres':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get('DB_NAME', 'survivor'),
+            'USER': os.environ.get('DB_USER', 'survivor'),
+            'PASSWORD': os.environ.get('DB_PASSWORD', ''),
+            'HOST': os.environ.get('DB_HOST', 'localhost'),
+            'PORT': os.environ.get('DB_PORT', '5432'),
+            # Reuse connections across requests and check them before reuse
+            'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 60)),
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {},
+        }
+    }
+
+    # DB_POOL=true uses psycopg's connection pool instead of persistent connections
+    if os.environ.get('DB_POOL', '').lower() in ('1', 'true', 'yes'):
+        DATABASES['default']['CONN_MAX_AGE'] = 0
+        DATABASES['default']['OPTIONS']['pool'] = {
+            'min_size': int(os.environ.get('DB_POOL_MIN_SIZE', 2)),
+            'max_size': int(os.environ.get('DB_POOL_MAX_SIZE', 10)),
+            'timeout': int(os.environ.get('DB_POOL_TIMEOUT', 10)),
+        }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.environ.get('DB_NAME', BASE_DIR / 'db.sqlite3'),
+            'OPTIONS': {
+                # Seconds a writer waits for the lock before failing with "database is locked"
+                'timeout': int(os.environ.get('DB_SQLITE_TIMEOUT', 20)),
+                # Take the write lock when a transaction starts so the timeout applies to it
+                'transaction_mode': 'IMMEDIATE',
+                # WAL lets readers carry on while a writer commits
+                'init_command': 'PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL;',
+            },
+        }
     }
-}
 
 
 # Password validation
@@ -1,7 +1,8 @@
 from django.contrib import admin
-from django.urls import include, path
+from django.urls import include, path, re_path
 from rest_framework import routers
 from survivorapi.views import login_user, register_user, SeasonLogs, Seasons, Tribes, Survivors, SurvivorTribes
+from survivorapi.views import media_file
 
 router = routers.DefaultRouter(trailing_slash=False)
 router.register(r"season-logs", SeasonLogs, "season-log")
@@ -14,5 +15,7 @@ urlpatterns = [
     path('register', register_user),
     path('login', login_user),
     path('admin/', admin.site.urls),
+    # Survivor images and their variants, see survivorapi/media.py
+    re_path(r'^media/(?P<path>.+)$', media_file),
 ]
 